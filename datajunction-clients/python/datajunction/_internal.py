@@ -1,6 +1,7 @@
 """DataJunction base client setup."""
 
 # pylint: disable=redefined-outer-name, import-outside-toplevel, too-many-lines
+import json
 import logging
 import os
 import platform
@@ -19,6 +20,10 @@ except ImportError:  # pragma: no cover
         ),
         ImportWarning,
     )
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
 import requests
 from requests.adapters import CaseInsensitiveDict, HTTPAdapter
 
@@ -37,6 +42,12 @@ if TYPE_CHECKING:  # pragma: no cover
     from datajunction.tags import Tag
 
 DEFAULT_NAMESPACE = "default"
+
+# Query results can be fetched as an Arrow IPC stream if pyarrow is installed, in which
+# case the query is in the schema metadata and the column metadata in a header
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_QUERY_METADATA_KEY = b"dj.query"
+COLUMNS_HEADER = "X-DJ-Columns"
 _logger = logging.getLogger(__name__)
 
 
@@ -232,6 +243,52 @@ class DJClient:
             )
         ]
 
+    @staticmethod
+    def semantic_column_names(columns) -> List[str]:
+        """
+        The semantic names of columns, i.e., the metric node names for metrics and the
+        dimension attributes for the other columns.
+        """
+        return [
+            col.get("semantic_entity")
+            if col["semantic_type"] != "metric"
+            else col.get("node") or col["name"]
+            for col in columns
+        ]
+
+    @staticmethod
+    def read_arrow_results(response) -> Tuple[dict, "pa.Table", List[dict]]:
+        """
+        Read query results returned as an Arrow stream, returning the query, its rows as
+        an Arrow table and the metadata of its columns.
+        """
+        table = pa.ipc.open_stream(response.content).read_all()
+        query = json.loads(table.schema.metadata[ARROW_QUERY_METADATA_KEY])
+        columns = json.loads(response.headers.get(COLUMNS_HEADER) or "[]")
+        return query, table, columns
+
+    @staticmethod
+    def process_arrow_results(table: "pa.Table", columns: List[dict]) -> "pd.DataFrame":
+        """
+        Return a pandas dataframe of results read as Arrow if pandas is installed. The
+        dataframe reuses the Arrow buffers where the column types allow it.
+        """
+        if not table.num_columns:
+            raise DJClientException("No data for query!")
+        renamed_columns = (
+            DJClient.semantic_column_names(columns)
+            if len(columns) == table.num_columns
+            else table.column_names
+        )
+        table = table.rename_columns(renamed_columns)
+        try:
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        except ImportError:  # pragma: no cover
+            return Results(
+                data=tuple(zip(*(column.to_pylist() for column in table.columns))),
+                columns=tuple(renamed_columns),  # type: ignore
+            )
+
     @staticmethod
     def process_results(results) -> "pd.DataFrame":
         """
@@ -242,12 +299,7 @@ class DJClient:
             rows = results["results"][0]["rows"]
 
             # Rename columns from the physical names to their semantic names
-            renamed_columns = [
-                col.get("semantic_entity")
-                if col["semantic_type"] != "metric"
-                else col.get("node") or col["name"]
-                for col in columns
-            ]
+            renamed_columns = DJClient.semantic_column_names(columns)
             try:
                 return pd.DataFrame(
                     rows,
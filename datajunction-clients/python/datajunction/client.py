@@ -286,6 +286,7 @@ class DJClient(_internal.DJClient):
             poll_interval = 1  # Initial polling interval in seconds
             job_state = models.QueryState.UNKNOWN
             results = None
+            table, columns = None, []
             path = "/data/"
             params = {
                 "dimensions": dimensions or [],
@@ -307,13 +308,25 @@ class DJClient(_internal.DJClient):
 
             print(f"Fetching data for '{node_name}' or '{metrics}'")  # pragma: no cover
 
+            # Prefer results as an Arrow stream, which become dataframes without
+            # decoding every row
+            headers = (
+                {"Accept": f"{_internal.ARROW_STREAM}, application/json;q=0.9"}
+                if _internal.pa
+                else {}
+            )
+
             while job_state not in models.END_JOB_STATES:
                 progress_bar()  # pylint: disable=not-callable
                 response = self._session.get(
                     path,
                     params=params,
+                    headers=headers,
                 )
-                results = response.json()
+                if response.headers.get("content-type") == _internal.ARROW_STREAM:
+                    results, table, columns = self.read_arrow_results(response)
+                else:
+                    results, table = response.json(), None
 
                 # Raise errors if any
                 if not response.status_code < 400:
@@ -329,7 +342,7 @@ class DJClient(_internal.DJClient):
 
                 # Update the query state and print links if any
                 job_state = models.QueryState(results["state"])
-                if not printed_links and results["links"]:  # pragma: no cover
+                if not printed_links and results.get("links"):  # pragma: no cover
                     print(
                         "Links:\n"
                         + "\n".join([f"\t* {link}" for link in results["links"]]),
@@ -343,6 +356,8 @@ class DJClient(_internal.DJClient):
 
             # Return results if the job has finished
             if job_state == models.QueryState.FINISHED:
+                if table is not None:
+                    return self.process_arrow_results(table, columns)
                 return self.process_results(results)
             if job_state == models.QueryState.CANCELED:  # pragma: no cover
                 raise DJClientException("Query execution was canceled!")
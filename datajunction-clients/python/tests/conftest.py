@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import AsyncGenerator, Awaitable, Dict, Iterator, List, Optional
 from unittest.mock import MagicMock, patch
 
+import pyarrow as pa
 import pytest
 import pytest_asyncio
 from cachelib import SimpleCache
@@ -231,6 +232,34 @@ def module__query_service_client(
         mock_submit_query,
     )
 
+    def mock_submit_query_arrow(
+        query_create: QueryCreate,
+        request_headers: Optional[Dict[str, str]] = None,
+    ) -> Iterator[bytes]:
+        results = mock_submit_query(query_create, request_headers)
+        table = pa.table({})
+        if results.results.root:
+            statement = results.results.root[0]
+            names = [column.name for column in statement.columns]
+            values = list(zip(*statement.rows)) or [[] for _ in names]
+            table = pa.Table.from_arrays(
+                [pa.array(list(column_values)) for column_values in values],
+                names=names,
+            )
+        schema = table.schema.with_metadata(
+            {"dj.query": results.model_dump_json(exclude={"results"})},
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            writer.write_table(table)
+        return iter([sink.getvalue().to_pybytes()])
+
+    module_mocker.patch.object(
+        qs_client,
+        "submit_query_arrow",
+        mock_submit_query_arrow,
+    )
+
     def mock_create_view(
         view_name: str,
         query_create: QueryCreate,  # pylint: disable=unused-argument
@@ -0,0 +1,38 @@
+"""Add query queue metrics
+
+Revision ID: 5e1a7c3b9d20
+Revises: b8f22b3549c7
+Create Date: 2026-10-18 18:00:00.000000+00:00
+
+"""
+# pylint: disable=no-member, invalid-name, missing-function-docstring, unused-import, no-name-in-module
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e1a7c3b9d20"
+down_revision = "b8f22b3549c7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+    ALTER TABLE query
+        ADD COLUMN queue_depth INTEGER,
+        ADD COLUMN wait_time FLOAT,
+        ADD COLUMN run_time FLOAT
+    """,
+    )
+
+
+def downgrade():
+    op.execute(
+        """
+    ALTER TABLE query
+        DROP COLUMN queue_depth,
+        DROP COLUMN wait_time,
+        DROP COLUMN run_time
+    """,
+    )
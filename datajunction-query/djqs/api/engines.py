@@ -0,0 +1,19 @@
+"""
+Engine related APIs.
+"""
+
+from typing import Dict
+
+from fastapi import APIRouter
+
+from djqs.pools import get_engine_pools
+
+router = APIRouter(tags=["Engines"])
+
+
+@router.get("/engines/pools/", response_model=Dict[str, Dict[str, int]])
+def engine_pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Get the connection counts of the connection pool of every engine
+    """
+    return get_engine_pools().stats()
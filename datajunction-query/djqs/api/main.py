@@ -16,9 +16,11 @@ from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
 from djqs import __version__
-from djqs.api import queries, tables
+from djqs.api import engines, queries, tables
 from djqs.exceptions import DJException
+from djqs.pools import get_engine_pools
 from djqs.utils import get_settings
+from djqs.workers import get_query_workers
 
 _logger = logging.getLogger(__name__)
 
@@ -28,7 +30,8 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI):
     """
-    Create a postgres connection pool and store it in the app state
+    Create a postgres connection pool and store it in the app state, and create the
+    connection pools of the query engines and the query worker pool
     """
     _logger.info("Starting PostgreSQL connection pool...")
     pool = AsyncConnectionPool(
@@ -40,6 +43,9 @@ async def lifespan(fastapi_app: FastAPI):
         timeout=15,
     )
     fastapi_app.state.pool = pool
+    engine_pools = get_engine_pools()
+    engine_pools.start()
+    query_workers = get_query_workers()
     try:
         _logger.info("PostgreSQL connection pool started with DSN: %s", settings.index)
         yield
@@ -47,6 +53,9 @@ async def lifespan(fastapi_app: FastAPI):
         _logger.info("Closing PostgreSQL connection pool")
         await pool.close()
         _logger.info("PostgreSQL connection pool closed")
+        query_workers.shutdown()
+        get_query_workers.cache_clear()
+        engine_pools.dispose()
 
 
 app = FastAPI(
@@ -59,6 +68,7 @@ app = FastAPI(
     },
     lifespan=lifespan,
 )
+app.include_router(engines.router)
 app.include_router(queries.router)
 app.include_router(tables.router)
 
@@ -7,23 +7,18 @@ import logging
 import uuid
 from dataclasses import asdict
 from http import HTTPStatus
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import msgpack
 from accept_types import get_best_match
-from fastapi import (
-    APIRouter,
-    BackgroundTasks,
-    Body,
-    Depends,
-    Header,
-    HTTPException,
-    Request,
-    Response,
-)
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Header, HTTPException
+from fastapi import Query as QueryParam
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
 from psycopg_pool import AsyncConnectionPool
 
 from djqs.config import Settings
+from djqs.constants import ARROW_QUERY_METADATA_KEY, ARROW_STREAM
 from djqs.db.postgres import DBQuery, get_postgres_pool
 from djqs.engine import process_query
 from djqs.models.query import (
@@ -35,6 +30,13 @@ from djqs.models.query import (
     decode_results,
     encode_results,
 )
+from djqs.results import (
+    iter_arrow_stream,
+    iter_chunks,
+    load_page,
+    load_results,
+    load_statements,
+)
 from djqs.utils import get_settings
 
 _logger = logging.getLogger(__name__)
@@ -47,8 +49,14 @@ router = APIRouter(tags=["SQL Queries"])
     status_code=HTTPStatus.OK,
     responses={
         200: {
-            "content": {"application/msgpack": {}},
-            "description": "Return results as JSON or msgpack",
+            "content": {
+                "application/msgpack": {},
+                "application/x-ndjson": {},
+                ARROW_STREAM: {},
+            },
+            "description": (
+                "Return results as JSON, msgpack, streamed NDJSON or an Arrow stream"
+            ),
         },
     },
 )
@@ -75,6 +83,14 @@ async def submit_query(  # pylint: disable=too-many-arguments
 
     This endpoint is different from others in that it accepts both JSON and msgpack, and
     can also return JSON or msgpack, depending on HTTP headers.
+
+    Results can also be streamed as NDJSON, in which case the first line has the query
+    with the columns and row counts of its statements, and each following line has a
+    chunk of rows of a statement, i.e., ``{"statement": 0, "rows": [...]}``. Rows are
+    read from the results backend one chunk at a time.
+
+    Results can also be returned as an Arrow IPC stream, with the rows of the first
+    statement as record batches and the query as JSON in the schema metadata.
     """
     content_type = request.headers.get("content-type")
     if content_type == "application/json":
@@ -112,13 +128,47 @@ async def submit_query(  # pylint: disable=too-many-arguments
         headers=request.headers,
     )
 
-    return_type = get_best_match(accept, ["application/json", "application/msgpack"])
+    return_types = [
+        "application/json",
+        "application/msgpack",
+        "application/x-ndjson",
+        ARROW_STREAM,
+    ]
+    return_type = get_best_match(accept, return_types)
     if not return_type:
         raise HTTPException(
             status_code=HTTPStatus.NOT_ACCEPTABLE,
-            detail="Client MUST accept: application/json, application/msgpack",
+            detail=f"Client MUST accept: {', '.join(return_types)}",
+        )
+
+    if return_type == ARROW_STREAM:
+        return StreamingResponse(
+            iter_arrow_stream(
+                settings.results_backend,
+                str(query_with_results.id),
+                {
+                    ARROW_QUERY_METADATA_KEY: json.dumps(
+                        asdict(query_with_results),
+                        default=str,
+                    ),
+                },
+            ),
+            media_type=return_type,
+            status_code=response.status_code or HTTPStatus.OK,
+        )
+
+    if return_type == "application/x-ndjson":
+        return StreamingResponse(
+            stream_query_results(settings, query_with_results),
+            media_type=return_type,
+            status_code=response.status_code or HTTPStatus.OK,
         )
 
+    if query_with_results.results:
+        query_with_results.results = load_results(
+            settings.results_backend,
+            str(query_with_results.id),
+        )
     if return_type == "application/msgpack":
         content = msgpack.packb(
             asdict(query_with_results),
@@ -206,39 +256,57 @@ async def save_query_and_run(  # pylint: disable=R0913
     return query_results
 
 
+def stream_query_results(settings: Settings, query: QueryResults) -> Iterator[str]:
+    """
+    Stream a query as NDJSON, followed by the rows of its statements one chunk at a time.
+    """
+    yield json.dumps(asdict(query), default=str) + "\n"
+    key = str(query.id)
+    for index, statement in enumerate(
+        load_statements(settings.results_backend, key) or [],
+    ):
+        for chunk in iter_chunks(settings.results_backend, key, index, statement):
+            # Chunks are stored as JSON, so they're sent without decoding them
+            yield f'{{"statement": {index}, "rows": {chunk}}}\n'
+
+
 def load_query_results(
     settings: Settings,
     key: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
 ) -> List[StatementResults]:
     """
-    Load results from backend, if available.
-
-    If ``paginate`` is true we also load the results into the cache, anticipating more
-    paginated queries.
+    Load results from backend, if available, or only a page of them if a limit is given.
     """
-    if settings.results_backend.has(key):
-        _logger.info("Reading results from results backend")
-        cached = settings.results_backend.get(key)
-        query_results = json.loads(cached)
-    else:  # pragma: no cover
-        _logger.warning("No results found")
-        query_results = []
-
-    return query_results
+    if limit is None:
+        return load_results(settings.results_backend, key)
+    return load_page(
+        settings.results_backend,
+        settings.paginating_cache,
+        key,
+        offset,
+        limit,
+    )
 
 
 @router.get("/queries/{query_id}/", response_model=QueryResults)
-async def read_query(
+async def read_query(  # pylint: disable=too-many-arguments
     query_id: uuid.UUID,
+    offset: int = QueryParam(0, ge=0),
+    limit: Optional[int] = QueryParam(None, ge=1),
     *,
+    request: Request,
     settings: Settings = Depends(get_settings),
     postgres_pool: AsyncConnectionPool = Depends(get_postgres_pool),
 ) -> QueryResults:
     """
     Fetch information about a query.
 
-    For paginated queries we move the data from the results backend to the cache for a
-    short period, anticipating additional requests.
+    With a ``limit``, only that many rows starting at ``offset`` are returned for each
+    statement, with links to the next and previous pages. Only the chunks of results
+    holding those rows are read, and they're kept in memory for a short period,
+    anticipating requests for the following pages.
     """
     async with postgres_pool.connection() as conn:
         dbquery_results = (
@@ -252,9 +320,16 @@ async def read_query(
             )
         query = queries[0]
 
-    query_results = load_query_results(settings, str(query_id))
+    query_results = load_query_results(settings, str(query_id), offset, limit)
 
     prev = next_ = None
+    if limit is not None:
+        if any(results.row_count > offset + limit for results in query_results):
+            next_ = str(request.url.include_query_params(offset=offset + limit))
+        if offset > 0:
+            prev = str(
+                request.url.include_query_params(offset=max(offset - limit, 0)),
+            )
 
     return QueryResults(
         results=query_results,
@@ -13,6 +13,7 @@ import toml
 import yaml
 from cachelib.base import BaseCache
 from cachelib.file import FileSystemCache
+from cachelib.simple import SimpleCache
 
 from djqs.exceptions import DJUnknownCatalog, DJUnknownEngine
 
@@ -76,9 +77,19 @@ class Settings:  # pylint: disable=too-many-instance-attributes
         default_engine_version: Optional[str] = "",
         results_backend: Optional[BaseCache] = None,
         results_backend_path: Optional[str] = "/tmp/djqs",
-        results_backend_timeout: Optional[str] = "0",
+        results_backend_timeout: Optional[str] = "86400",
+        results_backend_threshold: Optional[str] = "0",
+        results_batch_size: Optional[str] = "10000",
         paginating_timeout_minutes: Optional[str] = "5",
         do_ping_timeout_seconds: Optional[str] = "5",
+        engine_pool_size: Optional[str] = "5",
+        engine_pool_max_overflow: Optional[str] = "10",
+        engine_pool_idle_timeout_seconds: Optional[str] = "300",
+        engine_pool_health_check: Optional[str] = "true",
+        header_engines_max: Optional[str] = "16",
+        query_workers: Optional[str] = "16",
+        engine_max_concurrency: Optional[str] = "4",
+        engine_max_queue: Optional[str] = "100",
         configuration_file: Optional[str] = None,
         engines: Optional[List[EngineInfo]] = None,
         catalogs: Optional[List[CatalogInfo]] = None,
@@ -102,14 +113,33 @@ class Settings:  # pylint: disable=too-many-instance-attributes
             default_engine_version or "",
         )
 
-        # Where to store the results from queries.
+        # Where to store the results from queries. Each chunk of rows is stored as its
+        # own file, so the number of files isn't limited by default: once over the
+        # threshold, files are deleted regardless of the queries they belong to.
+        # Instead, results expire after a day by default, the chunks of a query along
+        # with its statements, since they're written with the same timeout.
         self.results_backend: BaseCache = results_backend or FileSystemCache(
             os.getenv("RESULTS_BACKEND_PATH", results_backend_path or ""),
+            threshold=int(
+                os.getenv(
+                    "RESULTS_BACKEND_THRESHOLD",
+                    results_backend_threshold or "0",
+                ),
+            ),
             default_timeout=int(
-                os.getenv("RESULTS_BACKEND_TIMEOUT", results_backend_timeout or "0"),
+                os.getenv(
+                    "RESULTS_BACKEND_TIMEOUT",
+                    results_backend_timeout or "86400",
+                ),
             ),
         )
 
+        # How many rows are fetched from engines, stored in the results backend and
+        # streamed to clients at a time
+        self.results_batch_size: int = int(
+            os.getenv("RESULTS_BATCH_SIZE", results_batch_size or "10000"),
+        )
+
         self.paginating_timeout: timedelta = timedelta(
             minutes=int(
                 os.getenv(
@@ -119,6 +149,13 @@ class Settings:  # pylint: disable=too-many-instance-attributes
             ),
         )
 
+        # Chunks of results read for a page of a query are kept in memory for this long,
+        # anticipating requests for the following pages
+        self.paginating_cache: BaseCache = SimpleCache(
+            threshold=64,
+            default_timeout=int(self.paginating_timeout.total_seconds()),
+        )
+
         # How long to wait when pinging databases to find out the fastest online database.
         self.do_ping_timeout: timedelta = timedelta(
             seconds=int(
@@ -126,6 +163,47 @@ class Settings:  # pylint: disable=too-many-instance-attributes
             ),
         )
 
+        # The number of connections kept open per engine, and how many more can be opened
+        # under load
+        self.engine_pool_size: int = int(
+            os.getenv("ENGINE_POOL_SIZE", engine_pool_size or "5"),
+        )
+        self.engine_pool_max_overflow: int = int(
+            os.getenv("ENGINE_POOL_MAX_OVERFLOW", engine_pool_max_overflow or "10"),
+        )
+
+        # Pooled connections left idle for longer than this are closed instead of reused
+        self.engine_pool_idle_timeout: timedelta = timedelta(
+            seconds=int(
+                os.getenv(
+                    "ENGINE_POOL_IDLE_TIMEOUT_SECONDS",
+                    engine_pool_idle_timeout_seconds or "300",
+                ),
+            ),
+        )
+
+        # Whether pooled connections are checked to be alive before they are reused
+        self.engine_pool_health_check: bool = os.getenv(
+            "ENGINE_POOL_HEALTH_CHECK", engine_pool_health_check or "true"
+        ).lower().strip() in ("true", "1", "yes")
+
+        # How many engines for SQLAlchemy URIs passed in request headers are kept
+        self.header_engines_max: int = int(
+            os.getenv("HEADER_ENGINES_MAX", header_engines_max or "16"),
+        )
+
+        # How many queries run at once across all engines, and on each engine, and how
+        # many queries can wait to run on each engine before new ones are rejected
+        self.query_workers: int = int(
+            os.getenv("QUERY_WORKERS", query_workers or "16"),
+        )
+        self.engine_max_concurrency: int = int(
+            os.getenv("ENGINE_MAX_CONCURRENCY", engine_max_concurrency or "4"),
+        )
+        self.engine_max_queue: int = int(
+            os.getenv("ENGINE_MAX_QUEUE", engine_max_queue or "100"),
+        )
+
         # Configuration file for catalogs and engines
         self.configuration_file: Optional[str] = (
             os.getenv("CONFIGURATION_FILE") or configuration_file
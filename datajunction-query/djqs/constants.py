@@ -18,3 +18,9 @@ GET_COLUMNS_TIMEOUT = timedelta(seconds=60)
 
 # Request header configuration params
 SQLALCHEMY_URI = "SQLALCHEMY_URI"
+
+# Content type of results returned as an Apache Arrow IPC stream
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Key of the Arrow schema metadata holding the query the results are for
+ARROW_QUERY_METADATA_KEY = "dj.query"
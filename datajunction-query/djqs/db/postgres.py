@@ -42,7 +42,8 @@ class DBQuery:
             sql.SQL(
                 """
                 SELECT id, catalog_name, engine_name, engine_version, submitted_query,
-                       async_, executed_query, scheduled, started, finished, state, progress
+                       async_, executed_query, scheduled, started, finished, state, progress,
+                       queue_depth, wait_time, run_time
                 FROM query
                 WHERE id = {query_id}
                 """,
@@ -64,6 +65,9 @@ class DBQuery:
         scheduled: datetime = None,
         started: datetime = None,
         finished: datetime = None,
+        queue_depth: int = None,
+        wait_time: float = None,
+        run_time: float = None,
     ):
         """
         Save metadata about a query
@@ -73,10 +77,12 @@ class DBQuery:
                 """
                 INSERT INTO query (id, catalog_name, engine_name, engine_version,
                                    submitted_query, async_, executed_query, scheduled,
-                                   started, finished, state, progress)
+                                   started, finished, state, progress, queue_depth,
+                                   wait_time, run_time)
                 VALUES ({query_id}, {catalog_name}, {engine_name}, {engine_version},
                         {submitted_query}, {async_}, {executed_query}, {scheduled},
-                        {started}, {finished}, {state}, {progress})
+                        {started}, {finished}, {state}, {progress}, {queue_depth},
+                        {wait_time}, {run_time})
                 ON CONFLICT (id) DO UPDATE SET
                     catalog_name = EXCLUDED.catalog_name,
                     engine_name = EXCLUDED.engine_name,
@@ -88,7 +94,10 @@ class DBQuery:
                     started = EXCLUDED.started,
                     finished = EXCLUDED.finished,
                     state = EXCLUDED.state,
-                    progress = EXCLUDED.progress
+                    progress = EXCLUDED.progress,
+                    queue_depth = EXCLUDED.queue_depth,
+                    wait_time = EXCLUDED.wait_time,
+                    run_time = EXCLUDED.run_time
                 RETURNING *
                 """,
             ).format(
@@ -104,6 +113,9 @@ class DBQuery:
                 finished=sql.Literal(finished),
                 state=sql.Literal(state),
                 progress=sql.Literal(progress),
+                queue_depth=sql.Literal(queue_depth),
+                wait_time=sql.Literal(wait_time),
+                run_time=sql.Literal(run_time),
             ),
         )
         return self
@@ -2,22 +2,24 @@
 Query related functions.
 """
 
-import json
+import hashlib
 import logging
-import os
-from dataclasses import asdict
-from datetime import date, datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from functools import partial
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import duckdb
+import pyarrow as pa
 import snowflake.connector
 from psycopg_pool import AsyncConnectionPool
-from sqlalchemy import create_engine, text
+from sqlalchemy import make_url, text
+from sqlalchemy.exc import ArgumentError
 
 from djqs.config import EngineType, Settings
 from djqs.constants import SQLALCHEMY_URI
 from djqs.db.postgres import DBQuery
-from djqs.exceptions import DJDatabaseError
+from djqs.exceptions import DJDatabaseError, DJQueryQueueFull
 from djqs.models.query import (
     ColumnMetadata,
     Query,
@@ -25,8 +27,15 @@ from djqs.models.query import (
     QueryState,
     StatementResults,
 )
-from djqs.typing import ColumnType, Description, SQLADialect, Stream, TypeEnum
+from djqs.pools import get_engine_pools
+from djqs.results import (
+    save_results,
+    write_arrow_statement_results,
+    write_statement_results,
+)
+from djqs.typing import ColumnType, Description, Row, SQLADialect, Stream, TypeEnum
 from djqs.utils import get_settings
+from djqs.workers import get_query_workers
 
 _logger = logging.getLogger(__name__)
 
@@ -90,52 +99,123 @@ def run_query(  # pylint: disable=R0914
         engine_version=engine_version,
     )
     query_server = headers.get(SQLALCHEMY_URI) if headers else None
+    pools = get_engine_pools()
 
     if query_server:
         _logger.info(
-            "Creating sqlalchemy engine using request header param %s",
+            "Using sqlalchemy engine from request header param %s",
             SQLALCHEMY_URI,
         )
-        sqla_engine = create_engine(query_server)
-    elif engine.type == EngineType.DUCKDB:
-        _logger.info("Creating duckdb connection")
-        conn = (
-            duckdb.connect()
-            if engine.uri == "duckdb:///:memory:"
-            else duckdb.connect(
-                database=engine.extra_params["location"],
-                read_only=True,
+        sqla_engine = pools.get_header_engine(query_server)
+    elif engine.type in (EngineType.DUCKDB, EngineType.SNOWFLAKE):
+        _logger.info("Using pooled %s connection", engine.type.value)
+        conn = pools.get(engine).connect()  # type: ignore
+        try:
+            output = (
+                run_duckdb_query(query, conn)
+                if engine.type == EngineType.DUCKDB
+                else run_snowflake_query(query, conn.cursor())
             )
+        except Exception:
+            conn.close()
+            raise
+        return [
+            (
+                sql,
+                columns,
+                _RecordBatchStream(conn, stream)
+                if isinstance(stream, pa.RecordBatchReader)
+                else _RowStream(conn, stream),
+            )
+            for sql, columns, stream in output
+        ]
+    else:
+        _logger.info(
+            "Using sqlalchemy engine for the engine name and version defined on query",
         )
-        return run_duckdb_query(query, conn)
-    elif engine.type == EngineType.SNOWFLAKE:
-        _logger.info("Creating snowflake connection")
-        conn = snowflake.connector.connect(
-            **engine.extra_params,
-            password=os.getenv("SNOWSQL_PWD"),
-        )
-        cur = conn.cursor()
-
-        return run_snowflake_query(query, cur)
+        sqla_engine = pools.get(engine)  # type: ignore
 
-    _logger.info(
-        "Creating sqlalchemy engine using engine name and version defined on query",
+    # Fetch rows in batches, with server side cursors where the dialect supports them
+    connection = sqla_engine.connect().execution_options(
+        stream_results=True,
+        yield_per=settings.results_batch_size,
     )
-    sqla_engine = create_engine(engine.uri, connect_args=engine.extra_params)
-    connection = sqla_engine.connect()
+    try:
+        results = connection.execute(text(query.executed_query))
+        columns = get_columns_from_description(
+            results.cursor.description,
+            sqla_engine.dialect,
+        )
+    except Exception:
+        connection.close()
+        raise
 
     output: List[Tuple[str, List[ColumnMetadata], Stream]] = []
-    results = connection.execute(text(query.executed_query))
-    stream = (tuple(row) for row in results)
-    columns = get_columns_from_description(
-        results.cursor.description,
-        sqla_engine.dialect,
-    )
+    stream = _RowStream(connection, results)
     output.append((query.executed_query, columns, stream))  # type: ignore
 
     return output
 
 
+class _RowStream:
+    """
+    A stream of the rows of a result, which returns the connection to its pool once the
+    rows have been consumed or the stream is closed.
+    """
+
+    def __init__(self, connection: Any, rows: Iterable[Row]):
+        self._connection = connection
+        self._rows = iter(rows)
+        self._closed = False
+
+    def __iter__(self) -> "_RowStream":
+        return self
+
+    def __next__(self) -> Row:
+        try:
+            return tuple(next(self._rows))
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """
+        Return the connection to its pool.
+        """
+        if not self._closed:
+            self._closed = True
+            self._connection.close()
+
+
+class _RecordBatchStream(_RowStream):
+    """
+    A stream of the Arrow record batches of a result, for engines that fetch results as
+    Arrow natively.
+    """
+
+    def __init__(self, connection: Any, reader: pa.RecordBatchReader):
+        super().__init__(connection, reader)
+        self.schema = reader.schema
+
+    def __next__(self) -> pa.RecordBatch:  # type: ignore
+        try:
+            return next(self._rows)
+        except StopIteration:
+            self.close()
+            raise
+
+
+def fetch_rows(cursor: Any, batch_size: int) -> Stream:
+    """
+    Fetch the rows of a DBAPI cursor in batches of ``batch_size``.
+    """
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
 def run_duckdb_query(
     query: Query,
     conn: duckdb.DuckDBPyConnection,
@@ -144,9 +224,11 @@ def run_duckdb_query(
     Run a duckdb query against the local duckdb database
     """
     output: List[Tuple[str, List[ColumnMetadata], Stream]] = []
-    rows = conn.execute(query.submitted_query).fetchall()
+    rows = conn.execute(query.submitted_query).fetch_record_batch(
+        get_settings().results_batch_size,
+    )
     columns: List[ColumnMetadata] = []
-    output.append((query.submitted_query, columns, rows))
+    output.append((query.submitted_query, columns, rows))  # type: ignore
     return output
 
 
@@ -158,73 +240,105 @@ def run_snowflake_query(
     Run a query against a snowflake warehouse
     """
     output: List[Tuple[str, List[ColumnMetadata], Stream]] = []
-    rows = cur.execute(query.submitted_query).fetchall()
+    cursor = cur.execute(query.submitted_query)
+    rows: Union[Stream, pa.RecordBatchReader, None] = _fetch_snowflake_arrow(cursor)
+    if rows is None:
+        rows = fetch_rows(cursor, get_settings().results_batch_size)
     columns: List[ColumnMetadata] = []
-    output.append((query.submitted_query, columns, rows))
+    output.append((query.submitted_query, columns, rows))  # type: ignore
     return output
 
 
-def serialize_for_json(obj):
+def _fetch_snowflake_arrow(cursor: Any) -> Optional[pa.RecordBatchReader]:
     """
-    Handle serialization of date/datetimes for JSON output.
+    Fetch the results of a Snowflake query as Arrow record batches, if the connector
+    supports it for this result. Empty results are fetched as rows, since their schema
+    isn't known.
     """
-    if isinstance(obj, list):
-        return [serialize_for_json(x) for x in obj]
-    if isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    if isinstance(obj, (date, datetime)):
-        return obj.isoformat()
-    return obj
+    try:
+        tables = iter(cursor.fetch_arrow_batches())
+    except Exception:  # pylint: disable=broad-except
+        _logger.info("Arrow results are not available, fetching rows instead")
+        return None
+    first = next(tables, None)
+    if first is None:
+        return None
+    return pa.RecordBatchReader.from_batches(
+        first.schema,
+        (batch for table in chain([first], tables) for batch in table.to_batches()),
+    )
 
 
-async def process_query(
+def run_statements(
     settings: Settings,
-    postgres_pool: AsyncConnectionPool,
     query: Query,
     headers: Optional[Dict[str, str]] = None,
-) -> QueryResults:
+) -> List[StatementResults]:
     """
-    Process a query.
+    Run a query and write the rows of all of its statements to the results backend as
+    they are fetched, returning the results of the statements without their rows. This
+    blocks, so it's run on the query worker pool.
     """
-    query.scheduled = datetime.now(timezone.utc)
-    query.state = QueryState.SCHEDULED
-    query.executed_query = query.submitted_query
-
-    errors = []
     query.started = datetime.now(timezone.utc)
+    results = []
+    statements = run_query(query=query, headers=headers)
     try:
-        results = []
-        for sql, columns, stream in run_query(
-            query=query,
-            headers=headers,
-        ):
-            rows = list(stream)
+        for index, (sql, columns, stream) in enumerate(statements):
+            if isinstance(stream, _RecordBatchStream):
+                results.append(
+                    write_arrow_statement_results(
+                        settings.results_backend,
+                        str(query.id),
+                        index,
+                        sql,
+                        columns,
+                        stream,
+                        stream.schema,
+                        settings.results_batch_size,
+                    ),
+                )
+                continue
             results.append(
-                StatementResults(
-                    sql=sql,
-                    columns=columns,
-                    rows=rows,
-                    row_count=len(rows),
+                write_statement_results(
+                    settings.results_backend,
+                    str(query.id),
+                    index,
+                    sql,
+                    columns,
+                    stream,
+                    settings.results_batch_size,
                 ),
             )
+    finally:
+        # Return the connections even if writing the rows failed
+        for _, _, stream in statements:
+            stream.close()  # type: ignore
+    return results
 
-        query.state = QueryState.FINISHED
-        query.progress = 1.0
-    except Exception as ex:  # pylint: disable=broad-except
-        results = []
-        query.state = QueryState.FAILED
-        errors = [str(ex)]
-
-    query.finished = datetime.now(timezone.utc)
 
+async def save_query_state(postgres_pool: AsyncConnectionPool, query: Query):
+    """
+    Save the current state of a query to the metadata database.
+    """
     async with postgres_pool.connection() as conn:
         dbquery_results = (
             await DBQuery()
             .save_query(
                 query_id=query.id,
+                catalog_name=query.catalog_name,
+                engine_name=query.engine_name,
+                engine_version=query.engine_version,
                 submitted_query=query.submitted_query,
-                state=QueryState.FINISHED.value,
                 async_=query.async_,
+                state=query.state.value,
+                progress=query.progress,
+                executed_query=query.executed_query,
+                scheduled=query.scheduled,
+                started=query.started,
+                finished=query.finished,
+                queue_depth=query.queue_depth,
+                wait_time=query.wait_time,
+                run_time=query.run_time,
             )
             .execute(conn=conn)
         )
@@ -232,13 +346,75 @@ async def process_query(
         if not query_save_result:  # pragma: no cover
             raise DJDatabaseError("Query failed to save")
 
-    settings.results_backend.add(
+
+def get_engine_key(query: Query, headers: Optional[Dict[str, str]] = None) -> str:
+    """
+    Return the key of the engine that the query runs on. URIs passed in the request
+    headers are keyed without their password, or by their hash if they can't be parsed,
+    since the key is logged and returned in errors.
+    """
+    uri = (headers or {}).get(SQLALCHEMY_URI)
+    if not uri:
+        return f"{query.engine_name}:{query.engine_version}"
+    try:
+        return make_url(uri).render_as_string(hide_password=True)
+    except ArgumentError:
+        return f"{SQLALCHEMY_URI}:{hashlib.sha256(uri.encode()).hexdigest()[:16]}"
+
+
+async def process_query(
+    settings: Settings,
+    postgres_pool: AsyncConnectionPool,
+    query: Query,
+    headers: Optional[Dict[str, str]] = None,
+) -> QueryResults:
+    """
+    Process a query.
+
+    The query waits for a free slot on its engine, and then runs on the query worker
+    pool, so that other requests are served in the meantime.
+    """
+    query.scheduled = datetime.now(timezone.utc)
+    query.state = QueryState.SCHEDULED
+    query.executed_query = query.submitted_query
+    engine_key = get_engine_key(query, headers)
+
+    async def mark_running():
+        query.state = QueryState.RUNNING
+        await save_query_state(postgres_pool, query)
+
+    errors = []
+    try:
+        results = await get_query_workers().run(
+            engine_key,
+            query,
+            partial(run_statements, settings, query, headers),
+            on_start=mark_running,
+        )
+        query.state = QueryState.FINISHED
+        query.progress = 1.0
+    except DJQueryQueueFull as ex:
+        query.state = QueryState.FAILED
+        if not query.async_:
+            # Synchronous clients are told to retry later with a 503
+            query.finished = datetime.now(timezone.utc)
+            await save_query_state(postgres_pool, query)
+            raise
+        results = []
+        errors = [ex.message]
+    except Exception as ex:  # pylint: disable=broad-except
+        results = []
+        query.state = QueryState.FAILED
+        errors = [str(ex)]
+
+    query.finished = datetime.now(timezone.utc)
+    await save_query_state(postgres_pool, query)
+
+    save_results(
+        settings.results_backend,
         str(query.id),
-        json.dumps(
-            serialize_for_json(
-                [asdict(statement_result) for statement_result in results],
-            ),
-        ),
+        results,
+        settings.results_batch_size,
     )
 
     return QueryResults(
@@ -253,6 +429,9 @@ async def process_query(
         finished=query.finished,
         state=query.state,
         progress=query.progress,
+        queue_depth=query.queue_depth,
+        wait_time=query.wait_time,
+        run_time=query.run_time,
         results=results,
         errors=errors,
     )
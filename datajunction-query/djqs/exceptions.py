@@ -268,3 +268,15 @@ class DJUnknownEngine(DJException):
     """
     Raised when an engine or engine version cannot be found
     """
+
+
+class DJQueryQueueFull(DJException):
+    """
+    Raised when too many queries are already waiting to run on an engine
+    """
+
+
+class DJResultsExpired(DJException):
+    """
+    Raised when chunks of the results of a query are missing from the results backend
+    """
@@ -44,6 +44,12 @@ class Query(BaseQuery):  # pylint: disable=too-many-instance-attributes
     state: QueryState = QueryState.UNKNOWN
     progress: float = 0.0
 
+    # How many queries were waiting to run on the engine when this one was submitted,
+    # and how long this one waited and ran for, in seconds
+    queue_depth: Optional[int] = None
+    wait_time: Optional[float] = None
+    run_time: Optional[float] = None
+
 
 @dataclass
 class QueryCreate(BaseQuery):
@@ -96,6 +102,9 @@ class QueryResults(BaseQuery):  # pylint: disable=too-many-instance-attributes
     state: QueryState = QueryState.UNKNOWN
     async_: bool = False
     progress: float = 0.0
+    queue_depth: Optional[int] = None
+    wait_time: Optional[float] = None
+    run_time: Optional[float] = None
     results: List[StatementResults] = field(default_factory=list)
     next: Optional[str] = None  # Changed to str, as AnyHttpUrl was from pydantic
     previous: Optional[str] = None  # Changed to str, as AnyHttpUrl was from pydantic
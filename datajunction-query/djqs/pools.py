@@ -0,0 +1,227 @@
+"""
+Connection pools for query engines.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+
+import duckdb
+import snowflake.connector
+from sqlalchemy import create_engine, event, exc, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+from djqs.config import EngineInfo, EngineType, Settings
+from djqs.utils import get_settings
+
+_logger = logging.getLogger(__name__)
+
+EnginePool = Union[Engine, Pool]
+
+
+class EnginePools:
+    """
+    A registry of connection pools, one per configured engine, plus SQLAlchemy engines
+    for the URIs passed in request headers, of which only the most recently used
+    ``header_engines_max`` are kept.
+
+    SQLAlchemy based engines pool connections through their own engine, while DuckDB
+    and Snowflake connections are pooled directly.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._pools: Dict[Tuple[str, str], EnginePool] = {}
+        self._header_engines: "OrderedDict[str, Engine]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Create the pools of all configured engines.
+        """
+        for engine in self.settings.engines:
+            try:
+                self.get(engine)
+            except Exception:  # pylint: disable=broad-except
+                _logger.warning(
+                    "Failed to create a connection pool for engine %s (%s)",
+                    engine.name,
+                    engine.version,
+                    exc_info=True,
+                )
+
+    def get(self, engine: EngineInfo) -> EnginePool:
+        """
+        Return the pool of a configured engine, creating it on first use.
+        """
+        key = (engine.name, engine.version)
+        with self._lock:
+            if key not in self._pools:
+                _logger.info(
+                    "Creating connection pool for engine %s (%s)",
+                    engine.name,
+                    engine.version,
+                )
+                self._pools[key] = self._create_pool(engine)
+            return self._pools[key]
+
+    def get_header_engine(self, uri: str) -> Engine:
+        """
+        Return the SQLAlchemy engine for a URI passed in a request header. The least
+        recently used engine is disposed of when there are too many.
+        """
+        with self._lock:
+            if uri in self._header_engines:
+                self._header_engines.move_to_end(uri)
+                return self._header_engines[uri]
+            sqla_engine = self._create_sqlalchemy_engine(uri)
+            self._header_engines[uri] = sqla_engine
+            while len(self._header_engines) > self.settings.header_engines_max:
+                _, evicted = self._header_engines.popitem(last=False)
+                evicted.dispose()
+            return sqla_engine
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return the connection counts of every pool.
+        """
+        with self._lock:
+            pools = {
+                f"{name}:{version}": pool
+                for (name, version), pool in self._pools.items()
+            }
+            pools.update(
+                {
+                    make_url(uri).render_as_string(hide_password=True): sqla_engine
+                    for uri, sqla_engine in self._header_engines.items()
+                },
+            )
+        return {name: _pool_stats(pool) for name, pool in pools.items()}
+
+    def dispose(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        with self._lock:
+            for pool in [*self._pools.values(), *self._header_engines.values()]:
+                pool.dispose()
+            self._pools.clear()
+            self._header_engines.clear()
+
+    def _create_pool(self, engine: EngineInfo) -> EnginePool:
+        if engine.type == EngineType.DUCKDB:
+            creator = (
+                duckdb.connect
+                if engine.uri == "duckdb:///:memory:"
+                else lambda: duckdb.connect(
+                    database=engine.extra_params["location"],
+                    read_only=True,
+                )
+            )
+            return self._create_dbapi_pool(creator)
+        if engine.type == EngineType.SNOWFLAKE:
+            return self._create_dbapi_pool(
+                lambda: snowflake.connector.connect(
+                    **engine.extra_params,
+                    password=os.getenv("SNOWSQL_PWD"),
+                ),
+            )
+        return self._create_sqlalchemy_engine(engine.uri, engine.extra_params)
+
+    def _create_sqlalchemy_engine(
+        self,
+        uri: str,
+        connect_args: Optional[Dict[str, Any]] = None,
+    ) -> Engine:
+        options: Dict[str, Any] = {
+            "pool_pre_ping": self.settings.engine_pool_health_check
+        }
+        url = make_url(uri)
+        if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+            options["pool_size"] = self.settings.engine_pool_size
+            options["max_overflow"] = self.settings.engine_pool_max_overflow
+        sqla_engine = create_engine(uri, connect_args=connect_args or {}, **options)
+        self._expire_idle_connections(sqla_engine.pool)
+        return sqla_engine
+
+    def _create_dbapi_pool(self, creator) -> Pool:
+        # Queries are read-only, and DuckDB fails to roll back outside of a transaction,
+        # so connections aren't reset when they're returned
+        pool = QueuePool(
+            creator,
+            pool_size=self.settings.engine_pool_size,
+            max_overflow=self.settings.engine_pool_max_overflow,
+            reset_on_return=None,
+        )
+        self._expire_idle_connections(pool)
+        if self.settings.engine_pool_health_check:
+            event.listen(pool, "checkout", _ping_connection)
+        return pool
+
+    def _expire_idle_connections(self, pool: Pool) -> None:
+        """
+        Replace connections that have been idle in the pool for longer than the idle
+        timeout when they are checked out.
+        """
+        idle_timeout = self.settings.engine_pool_idle_timeout.total_seconds()
+
+        def checkin(dbapi_connection, connection_record):  # pylint: disable=W0613
+            connection_record.info["checked_in"] = time.monotonic()
+
+        def checkout(  # pylint: disable=W0613
+            dbapi_connection,
+            connection_record,
+            connection_proxy,
+        ):
+            checked_in = connection_record.info.pop("checked_in", None)
+            if checked_in is not None and time.monotonic() - checked_in > idle_timeout:
+                raise exc.DisconnectionError("Connection was idle for too long")
+
+        event.listen(pool, "checkin", checkin)
+        event.listen(pool, "checkout", checkout)
+
+
+def _ping_connection(
+    dbapi_connection,
+    connection_record,
+    connection_proxy,
+):  # pylint: disable=W0613
+    """
+    Check that a pooled DBAPI connection is alive before it is checked out.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    except Exception as ex:  # pylint: disable=broad-except
+        raise exc.DisconnectionError(str(ex)) from ex
+    finally:
+        cursor.close()
+
+
+def _pool_stats(pool: EnginePool) -> Dict[str, int]:
+    """
+    The connection counts of a pool.
+    """
+    if isinstance(pool, Engine):
+        pool = pool.pool
+    if not isinstance(pool, QueuePool):
+        return {}  # pragma: no cover
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+@lru_cache(1)
+def get_engine_pools() -> EnginePools:
+    """
+    Return the engine pools registry.
+    """
+    return EnginePools(get_settings())
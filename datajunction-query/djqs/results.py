@@ -0,0 +1,426 @@
+"""
+Storage of query results in the results backend.
+
+The rows of each statement are stored in chunks of a fixed number of rows, each under
+its own key, so that results can be written and read without holding all of their rows
+in memory. The statements themselves are stored under the query ID, each with its SQL,
+columns, row count and chunk size.
+
+Chunks are JSON arrays of rows, except for engines that fetch results as Arrow record
+batches, whose chunks are Arrow IPC streams. Those statements also have their Arrow
+schema stored, and their chunks are converted to rows when they're read as JSON.
+"""
+
+import io
+import json
+import logging
+from dataclasses import asdict
+from datetime import date, datetime
+from http import HTTPStatus
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+from cachelib.base import BaseCache
+
+from djqs.exceptions import DJResultsExpired
+from djqs.models.query import ColumnMetadata, StatementResults
+from djqs.typing import Row, Stream
+
+_logger = logging.getLogger(__name__)
+
+
+def serialize_for_json(obj):
+    """
+    Handle serialization of date/datetimes for JSON output.
+    """
+    if isinstance(obj, (list, tuple)):
+        return [serialize_for_json(x) for x in obj]
+    if isinstance(obj, dict):
+        return {k: serialize_for_json(v) for k, v in obj.items()}
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    return obj
+
+
+def chunk_key(key: str, statement: int, offset: int) -> str:
+    """
+    The key of the chunk of rows of a statement starting at a given row offset.
+    """
+    return f"{key}/{statement}/{offset}"
+
+
+def schema_key(key: str, statement: int) -> str:
+    """
+    The key of the Arrow schema of a statement whose chunks are Arrow IPC streams.
+    """
+    return f"{key}/{statement}/schema"
+
+
+def batched(stream: Stream, batch_size: int) -> Iterator[List[Row]]:
+    """
+    Split a stream of rows into lists of at most ``batch_size`` rows.
+    """
+    batch = []
+    for row in stream:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_statement_results(  # pylint: disable=too-many-arguments
+    backend: BaseCache,
+    key: str,
+    statement: int,
+    sql: str,
+    columns: List[ColumnMetadata],
+    stream: Stream,
+    chunk_size: int,
+) -> StatementResults:
+    """
+    Write the rows of a statement to the results backend as they are fetched, and
+    return the statement results without their rows.
+    """
+    row_count = 0
+    try:
+        for rows in batched(stream, chunk_size):
+            backend.add(
+                chunk_key(key, statement, row_count),
+                json.dumps(serialize_for_json(rows)),
+            )
+            row_count += len(rows)
+    except Exception:
+        for offset in range(0, row_count, chunk_size):
+            backend.delete(chunk_key(key, statement, offset))
+        raise
+    return StatementResults(sql=sql, columns=columns, row_count=row_count)
+
+
+def rebatch(
+    batches: Iterable[pa.RecordBatch],
+    batch_size: int,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Split and combine Arrow record batches into batches of ``batch_size`` rows, except
+    for the last one.
+    """
+    pending: List[pa.RecordBatch] = []
+    pending_rows = 0
+    for batch in batches:
+        offset = 0
+        while offset < batch.num_rows:
+            size = min(batch_size - pending_rows, batch.num_rows - offset)
+            pending.append(batch.slice(offset, size))
+            pending_rows += size
+            offset += size
+            if pending_rows == batch_size:
+                yield _combine_batches(pending)
+                pending, pending_rows = [], 0
+    if pending:
+        yield _combine_batches(pending)
+
+
+def _combine_batches(batches: List[pa.RecordBatch]) -> pa.RecordBatch:
+    if len(batches) == 1:
+        return batches[0]
+    return pa.Table.from_batches(batches).combine_chunks().to_batches()[0]
+
+
+def write_arrow_statement_results(  # pylint: disable=too-many-arguments
+    backend: BaseCache,
+    key: str,
+    statement: int,
+    sql: str,
+    columns: List[ColumnMetadata],
+    batches: Iterable[pa.RecordBatch],
+    schema: Optional[pa.Schema],
+    chunk_size: int,
+) -> StatementResults:
+    """
+    Write the Arrow record batches of a statement to the results backend as they are
+    fetched, and return the statement results without their rows.
+    """
+    row_count = 0
+    try:
+        for batch in rebatch(batches, chunk_size):
+            if schema is None:
+                schema = batch.schema
+            sink = io.BytesIO()
+            with pa.ipc.new_stream(sink, schema) as writer:
+                writer.write_batch(batch)
+            backend.add(chunk_key(key, statement, row_count), sink.getvalue())
+            row_count += batch.num_rows
+        if schema is not None:
+            backend.add(schema_key(key, statement), schema.serialize().to_pybytes())
+    except Exception:
+        for offset in range(0, row_count, chunk_size):
+            backend.delete(chunk_key(key, statement, offset))
+        raise
+    return StatementResults(sql=sql, columns=columns, row_count=row_count)
+
+
+def save_results(
+    backend: BaseCache,
+    key: str,
+    results: List[StatementResults],
+    chunk_size: int,
+) -> None:
+    """
+    Save the statements of a query, once the rows of all of them have been written.
+    """
+    statements = []
+    for statement_results in results:
+        statement = asdict(statement_results)
+        del statement["rows"]
+        statement["chunk_size"] = chunk_size
+        statements.append(statement)
+    backend.add(key, json.dumps(statements))
+
+
+def load_statements(backend: BaseCache, key: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load the statements of a query, if its results are available.
+    """
+    if not backend.has(key):
+        return None
+    return json.loads(backend.get(key))
+
+
+def iter_chunks(
+    backend: BaseCache,
+    key: str,
+    statement: int,
+    statement_results: Dict[str, Any],
+) -> Iterator[str]:
+    """
+    Read the chunks of rows of a statement one at a time, as JSON arrays.
+
+    Statements saved before results were chunked have their rows inline.
+    """
+    if "chunk_size" not in statement_results:
+        yield json.dumps(statement_results.get("rows", []))
+        return
+    is_arrow = backend.has(schema_key(key, statement))
+    for chunk in _iter_stored_chunks(backend, key, statement, statement_results):
+        if is_arrow:
+            chunk = json.dumps(serialize_for_json(_arrow_rows(chunk)), default=str)
+        yield chunk
+
+
+def _iter_stored_chunks(
+    backend: BaseCache,
+    key: str,
+    statement: int,
+    statement_results: Dict[str, Any],
+) -> Iterator[Any]:
+    chunk_size = statement_results["chunk_size"]
+    for offset in range(0, statement_results["row_count"], chunk_size):
+        chunk = backend.get(chunk_key(key, statement, offset))
+        if chunk is None:
+            raise _results_expired(key, statement, offset)
+        yield chunk
+
+
+def _results_expired(key: str, statement: int, offset: int) -> DJResultsExpired:
+    # Rows are never silently dropped, since the row count would no longer match them
+    return DJResultsExpired(
+        message=(
+            f"Rows {offset}+ of statement {statement} of query {key} are no longer "
+            "available in the results backend"
+        ),
+        http_status_code=HTTPStatus.GONE,
+    )
+
+
+def _read_arrow_chunk(chunk: bytes) -> Iterator[pa.RecordBatch]:
+    # The record batches reference the chunk's buffer instead of copying it
+    return iter(pa.ipc.open_stream(pa.py_buffer(chunk)))
+
+
+def _arrow_rows(
+    chunk: bytes,
+    offset: int = 0,
+    length: Optional[int] = None,
+) -> List[Row]:
+    # Only the rows in the slice are converted to Python objects
+    table = pa.ipc.open_stream(pa.py_buffer(chunk)).read_all().slice(offset, length)
+    return list(zip(*(column.to_pylist() for column in table.columns)))
+
+
+def iter_arrow_batches(
+    backend: BaseCache,
+    key: str,
+    statement: int,
+    statement_results: Dict[str, Any],
+) -> Iterator[pa.RecordBatch]:
+    """
+    Read the chunks of rows of a statement one at a time, as Arrow record batches.
+
+    Chunks stored as Arrow are read without copying them, while chunks stored as JSON
+    are converted, with the types of their columns inferred from their values.
+    """
+    if backend.has(schema_key(key, statement)):
+        for chunk in _iter_stored_chunks(backend, key, statement, statement_results):
+            yield from _read_arrow_chunk(chunk)
+        return
+
+    names = [column["name"] for column in statement_results["columns"]]
+    for chunk in iter_chunks(backend, key, statement, statement_results):
+        rows = json.loads(chunk)
+        if not rows:
+            continue
+        arrays = [pa.array(list(values)) for values in zip(*rows)]
+        yield pa.RecordBatch.from_arrays(
+            arrays,
+            names=names or [f"_col{index}" for index in range(len(arrays))],
+        )
+
+
+def iter_arrow_stream(
+    backend: BaseCache,
+    key: str,
+    metadata: Dict[str, str],
+) -> Iterator[bytes]:
+    """
+    Write the rows of the first statement of a query as an Arrow IPC stream, one record
+    batch at a time, with ``metadata`` attached to its schema.
+    """
+    statements = load_statements(backend, key) or []
+    batches: Iterator[pa.RecordBatch] = iter(())
+    schema = pa.schema([])
+    if statements:
+        batches = iter_arrow_batches(backend, key, 0, statements[0])
+        if backend.has(schema_key(key, 0)):
+            schema = pa.ipc.read_schema(pa.py_buffer(backend.get(schema_key(key, 0))))
+        else:
+            # The schema of rows stored as JSON is inferred from all of their chunks,
+            # since the types of columns whose first values are null, or integers in
+            # some chunks and floats in others, are only known once all are read
+            schemas = [
+                batch.schema
+                for batch in iter_arrow_batches(backend, key, 0, statements[0])
+            ]
+            if schemas:
+                schema = pa.unify_schemas(schemas, promote_options="permissive")
+            else:
+                schema = pa.schema(
+                    [
+                        (column["name"], pa.null())
+                        for column in statements[0]["columns"]
+                    ],
+                )
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema.with_metadata(metadata)) as writer:
+        for batch in batches:
+            if not batch.schema.equals(schema):
+                batch = pa.Table.from_batches([batch]).cast(schema).to_batches()[0]
+            writer.write_batch(batch)
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def load_results(backend: BaseCache, key: str) -> List[StatementResults]:
+    """
+    Load the results of a query with all of their rows, if available.
+    """
+    statements = load_statements(backend, key)
+    if statements is None:  # pragma: no cover
+        _logger.warning("No results found")
+        return []
+
+    _logger.info("Reading results from results backend")
+    results = []
+    for index, statement in enumerate(statements):
+        rows = [
+            row
+            for chunk in iter_chunks(backend, key, index, statement)
+            for row in json.loads(chunk)
+        ]
+        results.append(
+            StatementResults(
+                sql=statement["sql"],
+                columns=[ColumnMetadata(**column) for column in statement["columns"]],
+                rows=rows,
+                row_count=statement.get("row_count") or len(rows),
+            ),
+        )
+    return results
+
+
+def load_page(  # pylint: disable=too-many-arguments
+    backend: BaseCache,
+    cache: BaseCache,
+    key: str,
+    offset: int,
+    limit: int,
+) -> List[StatementResults]:
+    """
+    Load ``limit`` rows starting at row ``offset`` of each statement of a query, reading
+    only the chunks that hold them.
+
+    The statements and chunks read are kept in ``cache``, so that requests for the
+    following pages don't read them from the results backend again.
+    """
+    statements = _get_cached(backend, cache, key)
+    if statements is None:
+        return []
+
+    results = []
+    for index, statement in enumerate(json.loads(statements)):
+        results.append(
+            StatementResults(
+                sql=statement["sql"],
+                columns=[ColumnMetadata(**column) for column in statement["columns"]],
+                rows=_page_rows(backend, cache, key, index, statement, offset, limit),
+                row_count=statement.get("row_count") or len(statement.get("rows", [])),
+            ),
+        )
+    return results
+
+
+def _page_rows(  # pylint: disable=too-many-arguments
+    backend: BaseCache,
+    cache: BaseCache,
+    key: str,
+    statement: int,
+    statement_results: Dict[str, Any],
+    offset: int,
+    limit: int,
+) -> List[Row]:
+    if "chunk_size" not in statement_results:
+        return statement_results.get("rows", [])[offset : offset + limit]
+
+    chunk_size = statement_results["chunk_size"]
+    end = min(offset + limit, statement_results["row_count"])
+    is_arrow = backend.has(schema_key(key, statement))
+    rows: List[Row] = []
+    for chunk_offset in range(offset - offset % chunk_size, end, chunk_size):
+        chunk = _get_cached(backend, cache, chunk_key(key, statement, chunk_offset))
+        if chunk is None:
+            raise _results_expired(key, statement, chunk_offset)
+        start = max(offset - chunk_offset, 0)
+        stop = end - chunk_offset
+        if is_arrow:
+            rows.extend(serialize_for_json(_arrow_rows(chunk, start, stop - start)))
+        else:
+            rows.extend(json.loads(chunk)[start:stop])
+    return rows
+
+
+def _get_cached(backend: BaseCache, cache: BaseCache, key: str) -> Any:
+    value = cache.get(key)
+    if value is None:
+        value = backend.get(key)
+        if value is not None:
+            cache.set(key, value)
+    return value
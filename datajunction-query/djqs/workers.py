@@ -0,0 +1,144 @@
+"""
+Worker pool for running queries against engines off the event loop.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from djqs.config import Settings
+from djqs.exceptions import DJQueryQueueFull
+from djqs.models.query import Query
+from djqs.utils import get_settings
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class QueryWorkers:
+    """
+    Runs the blocking engine work of queries on a bounded thread pool, so that it
+    doesn't block the event loop.
+
+    At most ``engine_max_concurrency`` queries run on each engine at once. The others
+    wait in a queue of at most ``engine_max_queue`` queries per engine, beyond which
+    new queries are rejected. The slots and queue of an engine are only kept while it
+    has queries queued or running, so they're bounded by the queries in flight however
+    many engines are used.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.query_workers,
+            thread_name_prefix="djqs-query",
+        )
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        # Queries waiting for a slot, and queued or running, on each engine
+        self._queued: Dict[str, int] = defaultdict(int)
+        self._active: Dict[str, int] = defaultdict(int)
+
+    async def run(
+        self,
+        engine_key: str,
+        query: Query,
+        func: Callable[[], T],
+        on_start: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> T:
+        """
+        Run ``func`` on the worker pool once the engine has a free slot, recording the
+        queue depth, wait time and run time of the query on it. ``on_start`` is awaited
+        when the query leaves the queue.
+        """
+        queued = self._queued.get(engine_key, 0)
+        if queued >= self.settings.engine_max_queue:
+            raise DJQueryQueueFull(
+                message=(
+                    f"Too many queries are waiting to run on engine {engine_key}, "
+                    "please try again later"
+                ),
+                http_status_code=503,
+            )
+        query.queue_depth = queued
+        slot = self._slots.setdefault(
+            engine_key,
+            asyncio.Semaphore(self.settings.engine_max_concurrency),
+        )
+
+        self._queued[engine_key] += 1
+        self._active[engine_key] += 1
+        enqueued = time.monotonic()
+        try:
+            await slot.acquire()
+        except BaseException:
+            self._release(engine_key)
+            raise
+        finally:
+            self._queued[engine_key] -= 1
+            if not self._queued[engine_key]:
+                del self._queued[engine_key]
+
+        submitted = False
+        try:
+            query.wait_time = time.monotonic() - enqueued
+            _logger.info(
+                "Running query %s on engine %s after waiting %.3fs behind %d queries",
+                query.id,
+                engine_key,
+                query.wait_time,
+                queued,
+            )
+            if on_start:
+                await on_start()
+            started = time.monotonic()
+            future = self._executor.submit(func)
+            submitted = True
+        finally:
+            if not submitted:
+                self._release(engine_key, slot)
+
+        # The slot is released when the worker is done with the query rather than when
+        # it's no longer awaited, since cancelling the request doesn't stop the worker
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._release, engine_key, slot),
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            query.run_time = time.monotonic() - started
+
+    def _release(
+        self,
+        engine_key: str,
+        slot: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        """
+        Release the slot of a query that is done with the engine, if it took one, and
+        drop the engine's slots once it has no queries queued or running.
+        """
+        if slot is not None:
+            slot.release()
+        self._active[engine_key] -= 1
+        if not self._active[engine_key]:
+            del self._active[engine_key]
+            del self._slots[engine_key]
+
+    def shutdown(self) -> None:
+        """
+        Wait for running queries to finish and stop the worker threads.
+        """
+        self._executor.shutdown(wait=True)
+
+
+@lru_cache(1)
+def get_query_workers() -> QueryWorkers:
+    """
+    Return the query worker pool.
+    """
+    return QueryWorkers(get_settings())
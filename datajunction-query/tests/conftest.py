@@ -66,7 +66,10 @@ def postgres_container() -> PostgresContainer:
                         started TIMESTAMP,
                         finished TIMESTAMP,
                         state VARCHAR NOT NULL,
-                        progress FLOAT NOT NULL
+                        progress FLOAT NOT NULL,
+                        queue_depth INTEGER,
+                        wait_time FLOAT,
+                        run_time FLOAT
                     )
                 """,
                 )
@@ -0,0 +1,60 @@
+"""
+Tests for ``djqs.pools``.
+"""
+
+from contextlib import closing
+
+from djqs.config import EngineInfo, Settings
+from djqs.pools import EnginePools
+
+
+def test_duckdb_pool() -> None:
+    """
+    Test that DuckDB connections are reused, unless they were idle for too long.
+    """
+    engine = EngineInfo(
+        name="duckdb_inmemory",
+        version="0.7.1",
+        type="duckdb",
+        uri="duckdb:///:memory:",
+    )
+    pools = EnginePools(Settings(engine_pool_size="2"))
+    pool = pools.get(engine)
+    assert pools.get(engine) is pool
+
+    conn = pool.connect()
+    dbapi_connection = conn.dbapi_connection
+    assert conn.execute("SELECT 1").fetchall() == [(1,)]
+    assert pools.stats()["duckdb_inmemory:0.7.1"] == {
+        "size": 2,
+        "checked_in": 0,
+        "checked_out": 1,
+        "overflow": -1,
+    }
+    conn.close()
+    with closing(pool.connect()) as conn:
+        assert conn.dbapi_connection is dbapi_connection
+
+    pools = EnginePools(Settings(engine_pool_idle_timeout_seconds="-1"))
+    pool = pools.get(engine)
+    with closing(pool.connect()) as conn:
+        dbapi_connection = conn.dbapi_connection
+    with closing(pool.connect()) as conn:
+        assert conn.dbapi_connection is not dbapi_connection
+    pools.dispose()
+    assert pools.stats() == {}
+
+
+def test_header_engines() -> None:
+    """
+    Test that engines for URIs passed in request headers are reused, and that only the
+    most recently used ones are kept.
+    """
+    pools = EnginePools(Settings(header_engines_max="2"))
+    engine_a = pools.get_header_engine("sqlite:///a.db")
+    engine_b = pools.get_header_engine("sqlite:///b.db")
+    assert pools.get_header_engine("sqlite:///a.db") is engine_a
+
+    pools.get_header_engine("sqlite:///c.db")
+    assert list(pools.stats()) == ["sqlite:///a.db", "sqlite:///c.db"]
+    assert pools.get_header_engine("sqlite:///b.db") is not engine_b
@@ -0,0 +1,267 @@
+"""
+Tests for ``djqs.results``.
+"""
+
+import datetime
+import json
+
+import pyarrow as pa
+import pytest
+from cachelib import SimpleCache
+
+from djqs.config import Settings
+from djqs.exceptions import DJResultsExpired
+from djqs.models.query import ColumnMetadata, StatementResults
+from djqs.results import (
+    iter_arrow_stream,
+    iter_chunks,
+    load_page,
+    load_results,
+    load_statements,
+    rebatch,
+    save_results,
+    write_arrow_statement_results,
+    write_statement_results,
+)
+
+
+def test_write_and_load_results() -> None:
+    """
+    Test that rows are stored in chunks, and read back in order.
+    """
+    backend = SimpleCache()
+    columns = [ColumnMetadata(name="col", type="DATETIME")]
+    rows = [(datetime.date(2024, 1, day),) for day in range(1, 6)]
+    statement_results = write_statement_results(
+        backend,
+        "query",
+        0,
+        "SELECT col FROM t",
+        columns,
+        iter(rows),
+        2,
+    )
+    assert statement_results == StatementResults(
+        sql="SELECT col FROM t",
+        columns=columns,
+        rows=[],
+        row_count=5,
+    )
+    assert json.loads(backend.get("query/0/4")) == [["2024-01-05"]]
+
+    save_results(backend, "query", [statement_results], 2)
+    assert load_statements(backend, "query") == [
+        {
+            "sql": "SELECT col FROM t",
+            "columns": [{"name": "col", "type": "DATETIME"}],
+            "row_count": 5,
+            "chunk_size": 2,
+        },
+    ]
+    assert load_results(backend, "query") == [
+        StatementResults(
+            sql="SELECT col FROM t",
+            columns=columns,
+            rows=[[f"2024-01-0{day}"] for day in range(1, 6)],
+            row_count=5,
+        ),
+    ]
+
+
+def test_write_results_failure() -> None:
+    """
+    Test that the chunks written so far are removed when fetching rows fails.
+    """
+
+    def stream():
+        yield (1,)
+        yield (2,)
+        raise Exception("Connection lost")
+
+    backend = SimpleCache()
+    with pytest.raises(Exception, match="Connection lost"):
+        write_statement_results(backend, "query", 0, "SELECT 1", [], stream(), 1)
+    assert not backend.has("query/0/0")
+    assert not backend.has("query/0/1")
+
+
+def test_arrow_results() -> None:
+    """
+    Test that Arrow record batches are stored as chunks of the chunk size, and that
+    they can be read back as JSON rows or as an Arrow stream.
+    """
+    backend = SimpleCache()
+    batches = [
+        pa.record_batch({"id": [1, 2, 3], "name": ["a", "b", "c"]}),
+        pa.record_batch({"id": [4], "name": ["d"]}),
+    ]
+    assert [batch.num_rows for batch in rebatch(batches, 2)] == [2, 2]
+
+    statement_results = write_arrow_statement_results(
+        backend,
+        "query",
+        0,
+        "SELECT id, name FROM t",
+        [],
+        batches,
+        batches[0].schema,
+        2,
+    )
+    assert statement_results.row_count == 4
+    save_results(backend, "query", [statement_results], 2)
+
+    statement = load_statements(backend, "query")[0]  # type: ignore
+    assert list(iter_chunks(backend, "query", 0, statement)) == [
+        '[[1, "a"], [2, "b"]]',
+        '[[3, "c"], [4, "d"]]',
+    ]
+
+    stream = b"".join(iter_arrow_stream(backend, "query", {"dj.query": "{}"}))
+    table = pa.ipc.open_stream(stream).read_all()
+    assert table.schema.metadata == {b"dj.query": b"{}"}
+    assert table.to_pydict() == {"id": [1, 2, 3, 4], "name": ["a", "b", "c", "d"]}
+
+
+def test_arrow_stream_from_json_chunks() -> None:
+    """
+    Test that rows stored as JSON are converted to an Arrow stream.
+    """
+    backend = SimpleCache()
+    statement_results = write_statement_results(
+        backend,
+        "query",
+        0,
+        "SELECT id FROM t",
+        [ColumnMetadata(name="id", type="INT")],
+        iter([(1,), (2,), (3,)]),
+        2,
+    )
+    save_results(backend, "query", [statement_results], 2)
+
+    stream = b"".join(iter_arrow_stream(backend, "query", {}))
+    assert pa.ipc.open_stream(stream).read_all().to_pydict() == {"id": [1, 2, 3]}
+
+
+def test_arrow_stream_from_json_chunks_with_leading_nulls() -> None:
+    """
+    Test that the Arrow schema of rows stored as JSON is unified across their chunks,
+    so that a first chunk with only nulls, or with integers where later chunks have
+    floats, doesn't fix the types of the columns.
+    """
+    backend = SimpleCache()
+    statement_results = write_statement_results(
+        backend,
+        "query",
+        0,
+        "SELECT name, value FROM t",
+        [
+            ColumnMetadata(name="name", type="STR"),
+            ColumnMetadata(name="value", type="FLOAT"),
+        ],
+        iter([(None, 1), (None, 2), ("a", 3.5)]),
+        2,
+    )
+    save_results(backend, "query", [statement_results], 2)
+
+    stream = b"".join(iter_arrow_stream(backend, "query", {}))
+    table = pa.ipc.open_stream(stream).read_all()
+    assert table.schema.field("name").type == pa.string()
+    assert table.schema.field("value").type == pa.float64()
+    assert table.to_pydict() == {"name": [None, None, "a"], "value": [1.0, 2.0, 3.5]}
+
+
+def test_load_page() -> None:
+    """
+    Test that a page of rows is read from the chunks holding it, which are then kept in
+    the paginating cache.
+    """
+    backend = SimpleCache()
+    cache = SimpleCache()
+    json_results = write_statement_results(
+        backend,
+        "query",
+        0,
+        "SELECT id FROM t",
+        [ColumnMetadata(name="id", type="INT")],
+        iter([(index,) for index in range(10)]),
+        4,
+    )
+    arrow_results = write_arrow_statement_results(
+        backend,
+        "query",
+        1,
+        "SELECT id FROM u",
+        [ColumnMetadata(name="id", type="INT")],
+        [pa.record_batch({"id": list(range(100, 106))})],
+        None,
+        4,
+    )
+    save_results(backend, "query", [json_results, arrow_results], 4)
+
+    page = load_page(backend, cache, "query", 3, 3)
+    assert [results.rows for results in page] == [
+        [[3], [4], [5]],
+        [[103], [104], [105]],
+    ]
+    assert [results.row_count for results in page] == [10, 6]
+    assert cache.has("query/0/0") and cache.has("query/0/4")
+    assert not cache.has("query/0/8")
+
+    # Chunks are read from the cache from now on
+    backend.delete("query/0/4")
+    assert load_page(backend, cache, "query", 5, 4)[0].rows == [[5], [6], [7], [8]]
+    assert load_page(backend, cache, "query", 8, 4)[1].rows == []
+    assert load_page(backend, cache, "missing", 0, 4) == []
+
+
+def test_expired_results(tmp_path) -> None:
+    """
+    Test that the results backend doesn't delete chunks to stay under a file count, and
+    that missing chunks are an error instead of silently truncating the results.
+    """
+    backend = Settings(results_backend_path=str(tmp_path)).results_backend
+    statement_results = write_statement_results(
+        backend,
+        "query",
+        0,
+        "SELECT id FROM t",
+        [ColumnMetadata(name="id", type="INT")],
+        iter([(index,) for index in range(600)]),
+        1,
+    )
+    save_results(backend, "query", [statement_results], 1)
+    assert len(load_results(backend, "query")[0].rows) == 600
+
+    backend.delete("query/0/300")
+    with pytest.raises(DJResultsExpired, match="Rows 300\\+ of statement 0"):
+        load_results(backend, "query")
+    with pytest.raises(DJResultsExpired):
+        load_page(backend, SimpleCache(), "query", 299, 2)
+
+
+def test_results_expire(tmp_path) -> None:
+    """
+    Test that results expire after a day by default, their chunks along with their
+    statements.
+    """
+    assert (
+        Settings(results_backend_path=str(tmp_path)).results_backend.default_timeout
+        == 86400
+    )
+
+    backend = Settings(
+        results_backend_path=str(tmp_path),
+        results_backend_timeout="-1",
+    ).results_backend
+    statement_results = write_statement_results(
+        backend,
+        "query",
+        0,
+        "SELECT id FROM t",
+        [ColumnMetadata(name="id", type="INT")],
+        iter([(index,) for index in range(4)]),
+        2,
+    )
+    save_results(backend, "query", [statement_results], 2)
+    assert load_statements(backend, "query") is None
+    assert not backend.has("query/0/0") and not backend.has("query/0/2")
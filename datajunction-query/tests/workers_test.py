@@ -0,0 +1,94 @@
+"""
+Tests for ``djqs.workers``.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from djqs.config import Settings
+from djqs.exceptions import DJQueryQueueFull
+from djqs.models.query import Query
+from djqs.workers import QueryWorkers
+
+
+@pytest.mark.asyncio
+async def test_query_workers() -> None:
+    """
+    Test that queries run off the event loop, with at most ``engine_max_concurrency``
+    at once per engine, and that the queue per engine is bounded.
+    """
+    workers = QueryWorkers(
+        Settings(engine_max_concurrency="1", engine_max_queue="1"),
+    )
+    release = threading.Event()
+    started = []
+
+    async def on_start():
+        started.append(True)
+
+    running, waiting, rejected = Query(), Query(), Query()
+    running_task = asyncio.create_task(
+        workers.run("duckdb:1", running, release.wait, on_start=on_start),
+    )
+    while not started:
+        await asyncio.sleep(0.01)
+    waiting_task = asyncio.create_task(
+        workers.run("duckdb:1", waiting, lambda: "done"),
+    )
+    await asyncio.sleep(0.01)
+
+    # The queue of the engine is full, but other engines aren't affected
+    with pytest.raises(DJQueryQueueFull):
+        await workers.run("duckdb:1", rejected, lambda: "done")
+    assert await workers.run("trino:451", Query(), lambda: "other") == "other"
+
+    release.set()
+    assert await running_task is True
+    assert await waiting_task == "done"
+    assert running.queue_depth == 0
+    assert waiting.queue_depth == 0
+    assert waiting.wait_time > 0  # type: ignore
+    assert running.run_time > 0  # type: ignore
+
+    # Engines without queries queued or running aren't kept
+    await asyncio.sleep(0.01)
+    assert not workers._slots  # pylint: disable=protected-access
+    assert not workers._queued  # pylint: disable=protected-access
+    workers.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_query_workers_cancelled() -> None:
+    """
+    Test that the slot of a query whose request is cancelled is only released once its
+    worker is done with it.
+    """
+    workers = QueryWorkers(Settings(engine_max_concurrency="1"))
+    release = threading.Event()
+    started = []
+
+    async def on_start():
+        started.append(True)
+
+    cancelled_task = asyncio.create_task(
+        workers.run("duckdb:1", Query(), release.wait, on_start=on_start),
+    )
+    while not started:
+        await asyncio.sleep(0.01)
+    cancelled_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled_task
+
+    waiting_task = asyncio.create_task(
+        workers.run("duckdb:1", Query(), lambda: "done"),
+    )
+    await asyncio.sleep(0.05)
+    assert not waiting_task.done()
+
+    release.set()
+    assert await waiting_task == "done"
+    await asyncio.sleep(0.01)
+    assert not workers._slots  # pylint: disable=protected-access
+    workers.shutdown()
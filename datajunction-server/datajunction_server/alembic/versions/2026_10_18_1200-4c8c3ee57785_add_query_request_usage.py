@@ -0,0 +1,79 @@
+"""Add stored results and usage tracking to queryrequest
+
+Revision ID: 4c8c3ee57785
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 12:00:00.000000+00:00
+
+"""
+# pylint: disable=no-member, invalid-name, missing-function-docstring, unused-import, no-name-in-module
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "4c8c3ee57785"
+down_revision = "a1b2c3d4e5f6"
+branch_labels = None
+depends_on = None
+
+KEY_COLUMNS = [
+    "query_type",
+    "nodes",
+    "parents",
+    "dimensions",
+    "filters",
+    "engine_name",
+    "engine_version",
+    "limit",
+    "orderby",
+]
+
+
+def upgrade():
+    with op.batch_alter_table("queryrequest", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("result", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        )
+        batch_op.add_column(
+            sa.Column(
+                "hit_count",
+                sa.BigInteger(),
+                server_default=sa.text("0"),
+                nullable=False,
+            ),
+        )
+        batch_op.add_column(
+            sa.Column(
+                "last_used_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+        batch_op.create_index(
+            batch_op.f("ix_queryrequest_last_used_at"),
+            ["last_used_at"],
+            unique=False,
+        )
+        # Requests that differ only in their other args are different requests
+        batch_op.drop_constraint("query_request_unique", type_="unique")
+        batch_op.create_unique_constraint(
+            "query_request_unique",
+            KEY_COLUMNS + ["other_args"],
+            postgresql_nulls_not_distinct=True,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("queryrequest", schema=None) as batch_op:
+        batch_op.drop_constraint("query_request_unique", type_="unique")
+        batch_op.create_unique_constraint(
+            "query_request_unique",
+            KEY_COLUMNS,
+            postgresql_nulls_not_distinct=True,
+        )
+        batch_op.drop_index(batch_op.f("ix_queryrequest_last_used_at"))
+        batch_op.drop_column("last_used_at")
+        batch_op.drop_column("hit_count")
+        batch_op.drop_column("result")
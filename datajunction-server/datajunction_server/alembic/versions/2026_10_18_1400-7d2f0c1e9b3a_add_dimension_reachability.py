@@ -0,0 +1,68 @@
+"""Add dimension reachability table
+
+Revision ID: 7d2f0c1e9b3a
+Revises: 4c8c3ee57785
+Create Date: 2026-10-18 14:00:00.000000+00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7d2f0c1e9b3a"
+down_revision = "4c8c3ee57785"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are materialized lazily, the first time each node's dimensions are read
+    op.create_table(
+        "dimensionreachability",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            nullable=False,
+        ),
+        sa.Column("node_id", sa.BigInteger(), nullable=False),
+        sa.Column("dimension_id", sa.BigInteger(), nullable=False),
+        sa.Column("dimension_version", sa.String(), nullable=False),
+        sa.Column("join_path", sa.Text(), nullable=False),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["node_id"],
+            ["node.id"],
+            name="fk_dimensionreachability_node_id_node",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["dimension_id"],
+            ["node.id"],
+            name="fk_dimensionreachability_dimension_id_node",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_dimensionreachability"),
+    )
+    op.create_index(
+        "idx_dimensionreachability_node_id",
+        "dimensionreachability",
+        ["node_id"],
+    )
+    op.create_index(
+        "idx_dimensionreachability_dimension_id",
+        "dimensionreachability",
+        ["dimension_id"],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "idx_dimensionreachability_dimension_id",
+        table_name="dimensionreachability",
+    )
+    op.drop_index(
+        "idx_dimensionreachability_node_id",
+        table_name="dimensionreachability",
+    )
+    op.drop_table("dimensionreachability")
@@ -0,0 +1,94 @@
+"""Add node lineage table
+
+Revision ID: 9b4e6a2d1f58
+Revises: 7d2f0c1e9b3a
+Create Date: 2026-10-18 16:00:00.000000+00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9b4e6a2d1f58"
+down_revision = "7d2f0c1e9b3a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "nodelineage",
+        sa.Column("ancestor_id", sa.BigInteger(), nullable=False),
+        sa.Column("descendant_id", sa.BigInteger(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.Column("ancestor_version", sa.String(), nullable=False),
+        sa.Column("descendant_version", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["ancestor_id"],
+            ["node.id"],
+            name="fk_nodelineage_ancestor_id_node",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["descendant_id"],
+            ["node.id"],
+            name="fk_nodelineage_descendant_id_node",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "ancestor_id",
+            "descendant_id",
+            name="pk_nodelineage",
+        ),
+    )
+    op.create_index(
+        "idx_nodelineage_ancestor_id_depth",
+        "nodelineage",
+        ["ancestor_id", "depth"],
+    )
+    op.create_index(
+        "idx_nodelineage_descendant_id",
+        "nodelineage",
+        ["descendant_id"],
+    )
+
+    # Backfill the closure over the current revisions of all existing nodes. The
+    # recursion is bounded in depth, so that it terminates even if the graph has cycles.
+    op.execute(
+        """
+        INSERT INTO nodelineage (
+            ancestor_id, descendant_id, depth, ancestor_version, descendant_version
+        )
+        WITH RECURSIVE lineage (descendant_id, ancestor_id, depth) AS (
+            SELECT id, id, 0 FROM node
+            UNION
+            SELECT lineage.descendant_id, noderelationship.parent_id, lineage.depth + 1
+            FROM lineage
+            JOIN node ON node.id = lineage.ancestor_id
+            JOIN noderevision
+                ON noderevision.node_id = node.id
+                AND noderevision.version = node.current_version
+            JOIN noderelationship ON noderelationship.child_id = noderevision.id
+            WHERE lineage.depth < 1000
+        )
+        SELECT
+            closure.ancestor_id,
+            closure.descendant_id,
+            closure.depth,
+            ancestor.current_version,
+            descendant.current_version
+        FROM (
+            SELECT ancestor_id, descendant_id, MAX(depth) AS depth
+            FROM lineage
+            GROUP BY ancestor_id, descendant_id
+        ) AS closure
+        JOIN node AS ancestor ON ancestor.id = closure.ancestor_id
+        JOIN node AS descendant ON descendant.id = closure.descendant_id
+        """,
+    )
+
+
+def downgrade():
+    op.drop_index("idx_nodelineage_descendant_id", table_name="nodelineage")
+    op.drop_index("idx_nodelineage_ancestor_id_depth", table_name="nodelineage")
+    op.drop_table("nodelineage")
@@ -2,11 +2,12 @@
 Data related APIs.
 """
 
+import json
 import logging
 from typing import Callable, Dict, List, Optional, cast
 
 from fastapi import BackgroundTasks, Depends, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 from sse_starlette.sse import EventSourceResponse
@@ -19,6 +20,7 @@ from datajunction_server.internal.sql import (
     build_sql_for_multiple_metrics,
 )
 from datajunction_server.api.helpers import get_save_history
+from datajunction_server.constants import ARROW_STREAM, COLUMNS_HEADER
 from datajunction_server.database.availabilitystate import AvailabilityState
 from datajunction_server.database.history import History
 from datajunction_server.database.node import Node, NodeRevision
@@ -36,7 +38,11 @@ from datajunction_server.internal.history import ActivityType, EntityType
 from datajunction_server.models import access
 from datajunction_server.models.node import AvailabilityStateBase
 from datajunction_server.models.node_type import NodeType
-from datajunction_server.models.query import QueryCreate, QueryWithResults
+from datajunction_server.models.query import (
+    ColumnMetadata,
+    QueryCreate,
+    QueryWithResults,
+)
 from datajunction_server.service_clients import QueryServiceClient
 from datajunction_server.utils import (
     get_and_update_current_user,
@@ -253,6 +259,36 @@ async def remove_availability_state(
     )
 
 
+def get_arrow_data_response(
+    request: Request,
+    query_service_client: QueryServiceClient,
+    query_create: QueryCreate,
+    columns: Optional[List[ColumnMetadata]],
+) -> Optional[StreamingResponse]:
+    """
+    Proxy the results of a query as an Arrow stream if the client accepts one and the
+    query service can return one. The stream isn't decoded, so the column metadata is
+    returned in a header instead of being injected into the results.
+    """
+    if ARROW_STREAM not in request.headers.get("accept", ""):
+        return None
+    stream = query_service_client.submit_query_arrow(
+        query_create,
+        request_headers=dict(request.headers),
+    )
+    if stream is None:
+        return None
+    return StreamingResponse(
+        stream,
+        media_type=ARROW_STREAM,
+        headers={
+            COLUMNS_HEADER: json.dumps(
+                [column.model_dump() for column in columns or []],
+            ),
+        },
+    )
+
+
 @router.get("/data/{node_name}/", name="Get Data for a Node")
 async def get_data(
     node_name: str,
@@ -335,6 +371,14 @@ async def get_data(
         submitted_query=generated_sql.sql,
         async_=async_,
     )
+    arrow_response = get_arrow_data_response(
+        request,
+        query_service_client,
+        query_create,
+        generated_sql.columns,
+    )
+    if arrow_response:
+        return arrow_response  # type: ignore
     result = query_service_client.submit_query(
         query_create,
         request_headers=request_headers,
@@ -520,6 +564,14 @@ async def get_data_for_metrics(
         submitted_query=translated_sql.sql,
         async_=async_,
     )
+    arrow_response = get_arrow_data_response(
+        request,
+        query_service_client,
+        query_create,
+        translated_sql.columns,
+    )
+    if arrow_response:
+        return arrow_response  # type: ignore
     result = query_service_client.submit_query(
         query_create,
         request_headers=request_headers,
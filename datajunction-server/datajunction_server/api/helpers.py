@@ -63,6 +63,7 @@ from datajunction_server.models.materialization import (
 from datajunction_server.models.query import ColumnMetadata, QueryWithResults
 from datajunction_server.naming import from_amenable_name
 from datajunction_server.service_clients import QueryServiceClient
+from datajunction_server.sql.dag import refresh_node_lineage
 from datajunction_server.sql.parsing import ast
 from datajunction_server.typing import END_JOB_STATES
 from datajunction_server.utils import SEPARATOR
@@ -344,6 +345,7 @@ async def resolve_downstream_references(
             session.add(downstream_node_revision)
             if event:
                 await save_history(event=event, session=session)
+            await refresh_node_lineage(session, [downstream_node_revision.node_id])
             await session.commit()
             await session.refresh(downstream_node_revision)
 
@@ -49,6 +49,7 @@ from datajunction_server.api.attributes import default_attribute_types
 from datajunction_server.internal.seed import seed_default_catalogs
 from datajunction_server.api.graphql.main import graphql_app, schema as graphql_schema  # noqa: F401
 from datajunction_server.constants import AUTH_COOKIE, LOGGED_IN_FLAG_COOKIE
+from datajunction_server.database.node import check_compression_codec
 from datajunction_server.errors import DJException
 from datajunction_server.utils import get_session_manager, get_settings
 
@@ -66,6 +67,9 @@ async def lifespan(app: FastAPI):  # pragma: no cover
     """
     FastAPICache.init(InMemoryBackend(), prefix="inmemory-cache")  # pragma: no cover
 
+    # Fail early rather than on the first write of a precompiled AST
+    check_compression_codec(settings.pickle_compression)
+
     # Use scoped_session only for request lifecycle sessions. For setup/teardown (lifespan),
     # prefer direct session factories and async with
     session_factory = get_session_manager().get_writer_session_factory()
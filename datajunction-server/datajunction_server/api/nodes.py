@@ -108,6 +108,7 @@ from datajunction_server.sql.dag import (
     get_downstream_nodes,
     get_filter_only_dimensions,
     get_upstream_nodes,
+    refresh_dimension_reachability,
 )
 from datajunction_server.sql.parsing.backends.antlr4 import parse
 from datajunction_server.utils import (
@@ -828,6 +829,7 @@ async def remove_reference_dimension_link(
             ),
             session=session,
         )
+        await refresh_dimension_reachability(session, [node.id])  # type: ignore
         await session.commit()
         return JSONResponse(
             status_code=200,
@@ -11,11 +11,13 @@ from datajunction_server.internal.access.authorization import (
     validate_access,
 )
 from datajunction_server.models import access
-from datajunction_server.models.system import DimensionStats, RowOutput
+from datajunction_server.models.system import CacheStats, DimensionStats, RowOutput
 from datajunction_server.sql.dag import (
     get_cubes_using_dimensions,
     get_dimension_dag_indegree,
 )
+from datajunction_server.sql.parsing.backends.antlr4 import parse_cache
+from datajunction_server.construction.precompiled import precompiled_stats
 from datajunction_server.internal.caching.cachelib_cache import get_cache
 from datajunction_server.internal.caching.interface import Cache
 from datajunction_server.database.user import User
@@ -143,3 +145,32 @@ async def get_dimensions_stats(
         ],
         key=lambda stats: -stats.indegree,
     )
+
+
+@router.get("/system/caches", response_model=list[CacheStats])
+async def get_cache_stats() -> list[CacheStats]:
+    """
+    Hit and miss statistics for this server worker's in-process caches and its
+    precompiled query AST lookups, to help size and tune them.
+    """
+    parse_info = parse_cache.cache_info()
+    precompiled_info = precompiled_stats.info()
+    parse_lookups = parse_info.hits + parse_info.misses
+    return [
+        CacheStats(
+            name="parse",
+            hits=parse_info.hits,
+            misses=parse_info.misses,
+            hit_rate=parse_info.hits / parse_lookups if parse_lookups else 0.0,
+            evictions=parse_info.evictions,
+            maxsize=parse_info.maxsize,
+            currsize=parse_info.currsize,
+        ),
+        CacheStats(
+            name="precompiled_query_ast",
+            hits=precompiled_info.hits,
+            misses=precompiled_info.misses,
+            stale=precompiled_info.stale,
+            hit_rate=precompiled_info.hit_rate,
+        ),
+    ]
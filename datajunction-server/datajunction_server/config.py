@@ -10,10 +10,13 @@ from typing import TYPE_CHECKING, List, Optional
 from cachelib.base import BaseCache
 from cachelib.file import FileSystemCache
 from cachelib.redis import RedisCache
+from cachelib.simple import SimpleCache
 from celery import Celery
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
+from datajunction_server.internal.caching.lru_cache import LRUCache
+
 if TYPE_CHECKING:
     pass
 
@@ -144,12 +147,42 @@ class Settings(BaseSettings):  # pragma: no cover
     # Cache expiration for SQL endpoints
     query_cache_timeout: int = 86400 * 300
 
+    # Backend of the server's cache for generated SQL and DAG lookups. Defaults to an
+    # in-process LRU cache of `query_cache_size` values per worker, but can be shared
+    # across workers with Redis (redis://host:port/db).
+    query_cache_uri: Optional[str] = None
+    query_cache_size: int = 5000
+
+    # Seconds after which cached SQL is rebuilt in the background when it is served
+    query_cache_refresh_after: int = 300
+
+    # Compression for pickled values like precompiled query ASTs: zlib, zstd or lz4.
+    # zstd and lz4 require the `compression` extra. Values are read back with the
+    # codec they were written with, so this can be changed at any time.
+    pickle_compression: str = "zlib"
+
+    # Maximum number of parsed query ASTs to keep in each worker's parse cache
+    parse_cache_size: int = 128
+
+    # Content-addressed cache of serialized parse results. Defaults to an in-process
+    # cache, but can be shared across workers with either a directory
+    # (file:///tmp/dj-parse-cache) or Redis (redis://host:port/db). Cached results
+    # are unpickled, so anyone who can write to a shared directory or Redis can run
+    # code on every server worker: only share one that is as trusted as the workers.
+    parse_result_cache_uri: Optional[str] = None
+    parse_result_cache_size: int = 2000
+    # Seconds before a cached parse result expires. Results cached under an older
+    # parser version are never read again, and are dropped once they expire.
+    parse_result_cache_timeout: int = 86400 * 7
+
     # Maximum amount of nodes to return for requests to list all nodes
     node_list_max: int = 10000
 
     # DAG traversal configuration
     fanout_threshold: int = 50
     max_concurrency: int = 20
+    # Number of nodes per query when fetching the children of a BFS level
+    bfs_chunk_size: int = 1000
 
     @property
     def celery(self) -> Celery:
@@ -174,6 +207,50 @@ class Settings(BaseSettings):  # pragma: no cover
             db=parsed.path.strip("/"),
         )
 
+    @property
+    def parse_result_cache(self) -> BaseCache:
+        """
+        Configure the backend for the parse result cache.
+        """
+        if self.parse_result_cache_uri is None:
+            return SimpleCache(
+                threshold=self.parse_result_cache_size,
+                default_timeout=self.parse_result_cache_timeout,
+            )
+
+        parsed = urllib.parse.urlparse(self.parse_result_cache_uri)
+        if parsed.scheme == "redis":
+            return RedisCache(
+                host=parsed.hostname,
+                port=parsed.port,
+                password=parsed.password,
+                db=parsed.path.strip("/") or 0,
+                default_timeout=self.parse_result_cache_timeout,
+                key_prefix="dj-parse:",
+            )
+        return FileSystemCache(
+            parsed.path,
+            threshold=self.parse_result_cache_size,
+            default_timeout=self.parse_result_cache_timeout,
+        )
+
+    @property
+    def query_cache(self) -> BaseCache:
+        """
+        Configure the backend for the SQL cache.
+        """
+        if self.query_cache_uri is None:
+            return LRUCache(threshold=self.query_cache_size)
+
+        parsed = urllib.parse.urlparse(self.query_cache_uri)
+        return RedisCache(
+            host=parsed.hostname,
+            port=parsed.port,
+            password=parsed.password,
+            db=parsed.path.strip("/") or 0,
+            key_prefix="dj-sql:",
+        )
+
     seed_setup: SeedSetup = SeedSetup()
 
     @property
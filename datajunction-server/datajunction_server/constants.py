@@ -18,3 +18,9 @@ GET_COLUMNS_TIMEOUT = timedelta(seconds=60)
 
 AUTH_COOKIE = "__dj"
 LOGGED_IN_FLAG_COOKIE = "__djlif"
+
+# Content type of query results returned as an Apache Arrow IPC stream
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Response header with the column metadata of query results returned as an Arrow stream
+COLUMNS_HEADER = "X-DJ-Columns"
@@ -16,6 +16,7 @@ from typing import (
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from datajunction_server.construction.precompiled import load_precompiled_query_ast
 from datajunction_server.construction.utils import to_namespaced_name
 from datajunction_server.database import Engine
 from datajunction_server.database.dimensionlink import DimensionLink
@@ -35,6 +36,7 @@ from datajunction_server.models.engine import Dialect
 from datajunction_server.models.node import BuildCriteria
 from datajunction_server.models.node_type import NodeType
 from datajunction_server.naming import amenable_name, from_amenable_name
+from datajunction_server.sql.dag import get_dimension_links_graph
 from datajunction_server.sql.parsing.ast import CompileContext
 from datajunction_server.sql.parsing.backends.antlr4 import ast, cached_parse, parse
 from datajunction_server.utils import SEPARATOR, refresh_if_needed
@@ -277,6 +279,8 @@ class QueryBuilder:
         self.errors: list[DJQueryBuildError] = []
         # The final built query AST
         self.final_ast: Optional[ast.Query] = None
+        # The node's dimension links graph, loaded once for all requested dimensions
+        self._dimension_links_graph: Optional[dict[int, list[DimensionLink]]] = None
 
     @classmethod
     async def create(
@@ -463,16 +467,13 @@ class QueryBuilder:
         await refresh_if_needed(
             self.session,
             self.node_revision,
-            ["availability", "columns", "query_ast"],
+            ["availability", "columns"],
+        )
+        node_ast = (
+            await compile_node_ast(self.session, self.node_revision)
+            if not self.physical_table
+            else self.create_query_from_physical_table(self.physical_table)
         )
-        if self.node_revision.query_ast:
-            node_ast = self.node_revision.query_ast  # pragma: no cover
-        else:
-            node_ast = (
-                await compile_node_ast(self.session, self.node_revision)
-                if not self.physical_table
-                else self.create_query_from_physical_table(self.physical_table)
-            )
 
         if self.physical_table and not self._filters and not self.dimensions:
             self.final_ast = node_ast
@@ -872,10 +873,16 @@ class QueryBuilder:
         """
         Builds metadata on dimension joins needed for the query.
         """
+        if self._dimension_links_graph is None:
+            self._dimension_links_graph = await get_dimension_links_graph(
+                self.session,
+                self.node_revision,
+            )
         join_path = await dimension_join_path(
             self.session,
             self.node_revision,
             attr.name,
+            links_graph=self._dimension_links_graph,
         )
         if not join_path and join_path != []:
             self.errors.append(
@@ -1383,6 +1390,7 @@ async def dimension_join_path(
     session: AsyncSession,
     node: NodeRevision,
     dimension: str,
+    links_graph: Optional[dict[int, list[DimensionLink]]] = None,
 ) -> Optional[list[DimensionLink]]:
     """
     Find a join path between this node and the dimension attribute.
@@ -1390,6 +1398,10 @@ async def dimension_join_path(
     * If it is a local dimension on this node, return []
     * If it is in one of the dimension nodes on the dimensions graph, return a
     list of dimension links that represent the join path
+
+    The node's dimension links graph is loaded in one query unless it is passed in
+    as `links_graph` (see `get_dimension_links_graph`), which lets callers resolving
+    several dimensions against the same node load it only once.
     """
     # Check if it is a local dimension
     for col in node.columns:  # pragma: no cover
@@ -1413,9 +1425,11 @@ async def dimension_join_path(
     )
 
     # If it's not a local dimension, traverse the node's dimensions graph
-    # This queue tracks the dimension link being processed and the path to that link
+    if links_graph is None:
+        links_graph = await get_dimension_links_graph(session, node)
     await refresh_if_needed(session, node, ["dimension_links"])
 
+    # This queue tracks the dimension link being processed and the path to that link
     # Start with first layer of linked dims
     layer_with_role = [
         (link, [link], 1)
@@ -1433,29 +1447,21 @@ async def dimension_join_path(
         if current_link.id in visited:
             continue
         visited.add(current_link.id)
-        await refresh_if_needed(session, current_link, ["dimension"])
         if current_link.dimension.name == dimension_attr.node_name:
             return join_path
 
-        await refresh_if_needed(session, current_link.dimension, ["current"])
-        await refresh_if_needed(
-            session,
-            current_link.dimension.current,
-            ["dimension_links"],
-        )
+        next_links = links_graph.get(current_link.dimension.current.id, [])
         layer_with_role = [
             (link, join_path + [link], role_idx + 1)
-            for link in current_link.dimension.current.dimension_links
-            if not role_path or (link.role == role_path[role_idx])
+            for link in next_links
+            if not role_path
+            or (role_idx < len(role_path) and link.role == role_path[role_idx])
         ]
         if layer_with_role:
             processing_queue.extend(layer_with_role)
         else:
             processing_queue.extend(
-                [
-                    (link, join_path + [link], role_idx)
-                    for link in current_link.dimension.current.dimension_links
-                ],
+                [(link, join_path + [link], role_idx) for link in next_links],
             )
     return None
 
@@ -1499,7 +1505,6 @@ async def build_dimension_node_query(
         build_criteria=build_criteria,
         ctes_mapping=cte_mapping,
         use_materialized=use_materialized,
-        use_pickled=not physical_table,
     )
     return dimension_node_query
 
@@ -1557,8 +1562,11 @@ def build_requested_dimensions_columns(
 
 async def compile_node_ast(session, node_revision: NodeRevision) -> ast.Query:
     """
-    Parses the node's query into an AST and compiles it.
+    Parses the node's query into an AST and compiles it, or loads the node's
+    precompiled query AST if it is current.
     """
+    if node_ast := await load_precompiled_query_ast(session, node_revision):
+        return node_ast
     node_ast = parse(node_revision.query)
     ctx = CompileContext(session, DJException())
     await node_ast.compile(ctx)
@@ -1721,7 +1729,6 @@ async def build_ast(
     access_control=None,
     ctes_mapping: dict[str, ast.Query] = None,
     use_materialized: bool = True,
-    use_pickled: bool = True,
 ) -> ast.Query:
     """
     Recursively replaces DJ node references with query ASTs. These are replaced with
@@ -1732,21 +1739,7 @@ async def build_ast(
     (filters are only applied if they don't require dimension node joins).
     """
     context = CompileContext(session=session, exception=DJException())
-    await refresh_if_needed(session, node, ["query_ast"])
-    cached_query_ast = node.query_ast
-    if use_pickled and cached_query_ast:
-        try:  # pragma: no cover
-            query = cached_query_ast  # pragma: no cover
-        except TypeError as exc:  # pragma: no cover
-            logger.error(
-                "Error loading query AST pickle for %s@%s: %s",
-                node.name,
-                node.version,
-                exc,
-            )
-            await query.compile(context)
-    else:
-        await query.compile(context)
+    await query.compile(context)
 
     query.bake_ctes()
     await refresh_if_needed(session, node, ["dimension_links"])
@@ -1756,6 +1749,15 @@ async def build_ast(
         ctes_mapping = new_cte_mapping  # pragma: no cover
 
     node_to_tables_mapping = get_dj_node_references_from_select(query.select)
+
+    # Columns in the select that were resolved to DJ node tables, grouped by node, so
+    # that they can be repointed to each reference's replacement without re-walking
+    # the select after every replacement
+    node_columns: dict[str, list[ast.Column]] = collections.defaultdict(list)
+    for col in query.select.find_all(ast.Column):
+        if isinstance(col.table, ast.Table) and col.table.dj_node:
+            node_columns[col.table.dj_node.name].append(col)
+
     for referenced_node, reference_expressions in node_to_tables_mapping.items():
         await refresh_if_needed(session, referenced_node, ["dimension_links"])
 
@@ -1776,7 +1778,7 @@ async def build_ast(
                 logger.debug("Didn't find physical node: %s", referenced_node.name)
                 # Build a new CTE with the query AST if there is no materialized table
                 if referenced_node.name not in ctes_mapping:
-                    node_query = parse(cast(str, referenced_node.query))
+                    node_query = await compile_node_ast(session, referenced_node)
                     query_ast = await build_ast(  # type: ignore
                         session,
                         referenced_node,
@@ -1829,13 +1831,14 @@ async def build_ast(
             # same alias for the built query
             if ref_expr.alias and hasattr(query_ast, "alias"):
                 query_ast.alias = ref_expr.alias
+            node_columns[referenced_node.name].extend(ref_expr.ref_columns)
             query.select.replace(
                 ref_expr,
                 query_ast,
                 copy=False,
             )
             await query.select.compile(context)
-            for col in query.select.find_all(ast.Column):
+            for col in node_columns[referenced_node.name]:
                 if (
                     col.table
                     and not col.table.alias
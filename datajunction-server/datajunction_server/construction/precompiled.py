@@ -0,0 +1,299 @@
+"""
+Precompiled query ASTs, persisted on node revisions so that SQL builds for unchanged
+nodes can skip parsing and compiling their queries.
+
+A precompiled AST is stored on `NodeRevision.query_ast` along with the node version
+and the AST schema version it was compiled with, and the versions of the upstream
+nodes it was compiled against. References to database objects inside the AST (the
+DJ nodes that tables resolve to and the dimension links of dimension attributes) are
+stored by name or id and rebound to the session's objects on read, so a stale
+precompiled AST is detected with one batched query and never handed out.
+"""
+
+import io
+import logging
+import pickle
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.operators import is_
+
+from datajunction_server.database.dimensionlink import DimensionLink
+from datajunction_server.database.node import Node, NodeRevision
+from datajunction_server.errors import DJException
+from datajunction_server.models.node_type import NodeType
+from datajunction_server.sql.parsing import ast
+from datajunction_server.sql.parsing.backends.antlr4 import parse
+from datajunction_server.sql.parsing.backends.cache import parser_version
+from datajunction_server.utils import refresh_if_needed
+
+logger = logging.getLogger(__name__)
+
+# Node types whose compiled query ASTs are persisted
+PRECOMPILED_NODE_TYPES = {NodeType.TRANSFORM, NodeType.DIMENSION}
+
+
+@dataclass
+class PrecompiledQueryAST:
+    """
+    A compiled query AST as persisted on a node revision. The AST itself is kept
+    pickled in `payload` so that validating the versions doesn't require loading it.
+    """
+
+    node_version: str
+    schema_version: str
+    payload: bytes
+    # Node name -> version, for the node revisions the AST was compiled against
+    revisions: Dict[str, str] = field(default_factory=dict)
+    # Names of nodes (rather than node revisions) referenced by the AST
+    nodes: Set[str] = field(default_factory=set)
+    # Ids of dimension links referenced by the AST
+    dimension_links: Set[int] = field(default_factory=set)
+
+    def is_current(self, node_revision: NodeRevision) -> bool:
+        """
+        Whether the AST was compiled for this node revision by the current AST schema
+        """
+        return (
+            self.node_version == node_revision.version
+            and self.schema_version == parser_version()
+        )
+
+
+class PrecompiledASTInfo(NamedTuple):
+    hits: int
+    misses: int
+    stale: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups served by a precompiled AST
+        """
+        lookups = self.hits + self.misses + self.stale
+        return self.hits / lookups if lookups else 0.0
+
+
+class PrecompiledASTStats:
+    """
+    Thread-safe counters for precompiled AST lookups. A miss is a node revision
+    without a precompiled AST, while a stale lookup found one that could not be used.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+
+    def record(self, outcome: str):
+        with self._lock:
+            if outcome == "hit":
+                self._hits += 1
+            elif outcome == "miss":
+                self._misses += 1
+            else:
+                self._stale += 1
+
+    def info(self) -> PrecompiledASTInfo:
+        with self._lock:
+            return PrecompiledASTInfo(self._hits, self._misses, self._stale)
+
+    def clear(self):
+        with self._lock:
+            self._hits = self._misses = self._stale = 0
+
+
+precompiled_stats = PrecompiledASTStats()
+
+
+# Type -> whether it's a mapped database model
+_is_mapped: Dict[type, bool] = {}
+
+
+class _ASTPickler(pickle.Pickler):
+    """
+    Pickles an AST with its database object references replaced by persistent ids
+    """
+
+    def __init__(self, file, precompiled: PrecompiledQueryAST):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.precompiled = precompiled
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple]:
+        # Called for every object in the AST, so plain objects are ruled out by type
+        obj_type = type(obj)
+        is_mapped = _is_mapped.get(obj_type)
+        if is_mapped is None:
+            is_mapped = _is_mapped[obj_type] = hasattr(obj_type, "__mapper__")
+        if not is_mapped:
+            return None
+        if isinstance(obj, NodeRevision):
+            self.precompiled.revisions[obj.name] = obj.version
+            return ("revision", obj.name)
+        if isinstance(obj, Node):
+            self.precompiled.nodes.add(obj.name)
+            return ("node", obj.name)
+        if isinstance(obj, DimensionLink):
+            self.precompiled.dimension_links.add(obj.id)
+            return ("dimension_link", obj.id)
+        raise pickle.PicklingError(
+            f"Cannot precompile a reference to {obj_type.__name__}",
+        )
+
+
+class _ASTUnpickler(pickle.Unpickler):
+    """
+    Unpickles an AST, rebinding its database object references
+    """
+
+    def __init__(
+        self,
+        file,
+        nodes: Dict[str, Node],
+        dimension_links: Dict[int, DimensionLink],
+    ):
+        super().__init__(file)
+        self.nodes = nodes
+        self.dimension_links = dimension_links
+
+    def persistent_load(self, pid: Tuple) -> Any:
+        kind, key = pid
+        if kind == "revision":
+            return self.nodes[key].current
+        if kind == "node":
+            return self.nodes[key]
+        return self.dimension_links[key]
+
+
+def dump_query_ast(
+    node_revision: NodeRevision,
+    query: ast.Query,
+) -> PrecompiledQueryAST:
+    """
+    Wrap a compiled query AST for persisting on the node revision
+    """
+    precompiled = PrecompiledQueryAST(
+        node_version=node_revision.version,
+        schema_version=parser_version(),
+        payload=b"",
+    )
+    buffer = io.BytesIO()
+    _ASTPickler(buffer, precompiled).dump(query)
+    precompiled.payload = buffer.getvalue()
+    return precompiled
+
+
+async def save_precompiled_query_ast(
+    session: AsyncSession,
+    node_revision: NodeRevision,
+):
+    """
+    Compile the node revision's query and persist the AST on it. Nothing is stored
+    when the query does not compile cleanly. The caller commits the session.
+    """
+    node_revision.query_ast = None
+    if node_revision.type not in PRECOMPILED_NODE_TYPES or not node_revision.query:
+        return
+    query = parse(node_revision.query)
+    ctx = ast.CompileContext(session=session, exception=DJException())
+    await query.compile(ctx)
+    if ctx.exception.errors:
+        return
+    try:
+        node_revision.query_ast = dump_query_ast(node_revision, query)
+    except pickle.PicklingError as exc:  # pragma: no cover
+        logger.warning(
+            "Not precompiling the query AST for %s@%s: %s",
+            node_revision.name,
+            node_revision.version,
+            exc,
+        )
+
+
+async def load_precompiled_query_ast(
+    session: AsyncSession,
+    node_revision: NodeRevision,
+) -> Optional[ast.Query]:
+    """
+    Load the node revision's precompiled query AST, if it has one that is current.
+    Every call returns a freshly unpickled AST that the caller is free to mutate.
+    """
+    await refresh_if_needed(session, node_revision, ["query_ast"])
+    precompiled = node_revision.query_ast
+    if precompiled is None:
+        precompiled_stats.record("miss")
+        return None
+    if not isinstance(precompiled, PrecompiledQueryAST) or not precompiled.is_current(
+        node_revision,
+    ):
+        precompiled_stats.record("stale")
+        return None
+
+    nodes: Dict[str, Node] = {}
+    if names := set(precompiled.revisions) | precompiled.nodes:
+        statement = (
+            select(Node)
+            .where(Node.name.in_(names))
+            .where(is_(Node.deactivated_at, None))
+            .options(
+                joinedload(Node.current).options(
+                    *NodeRevision.default_load_options(),
+                ),
+            )
+        )
+        nodes = {
+            node.name: node
+            for node in (await session.execute(statement)).unique().scalars().all()
+        }
+    dimension_links: Dict[int, DimensionLink] = {}
+    if precompiled.dimension_links:
+        statement = (
+            select(DimensionLink)
+            .where(DimensionLink.id.in_(precompiled.dimension_links))
+            .options(
+                joinedload(DimensionLink.dimension).options(
+                    joinedload(Node.current).options(
+                        *NodeRevision.default_load_options(),
+                    ),
+                ),
+            )
+        )
+        dimension_links = {
+            link.id: link
+            for link in (await session.execute(statement)).unique().scalars().all()
+        }
+
+    # The AST is stale if any node it was compiled against has since changed
+    if (
+        names - set(nodes)
+        or any(
+            nodes[name].current.version != version
+            for name, version in precompiled.revisions.items()
+        )
+        or precompiled.dimension_links - set(dimension_links)
+    ):
+        precompiled_stats.record("stale")
+        return None
+
+    try:
+        query = _ASTUnpickler(
+            io.BytesIO(precompiled.payload),
+            nodes,
+            dimension_links,
+        ).load()
+    except Exception:  # pragma: no cover
+        logger.warning(
+            "Failed to load the precompiled query AST for %s@%s",
+            node_revision.name,
+            node_revision.version,
+            exc_info=True,
+        )
+        precompiled_stats.record("stale")
+        return None
+    precompiled_stats.record("hit")
+    return query
@@ -8,10 +8,12 @@ __all__ = [
     "Database",
     "Deployment",
     "DimensionLink",
+    "DimensionReachability",
     "Engine",
     "GroupMember",
     "History",
     "Node",
+    "NodeLineage",
     "NodeNamespace",
     "NodeRevision",
     "NotificationPreference",
@@ -28,11 +30,13 @@ from datajunction_server.database.catalog import Catalog
 from datajunction_server.database.collection import Collection
 from datajunction_server.database.database import Database, Table
 from datajunction_server.database.dimensionlink import DimensionLink
+from datajunction_server.database.dimensionreachability import DimensionReachability
 from datajunction_server.database.engine import Engine
 from datajunction_server.database.group_member import GroupMember
 from datajunction_server.database.measure import Measure
 from datajunction_server.database.namespace import NodeNamespace
 from datajunction_server.database.node import Node, NodeRevision
+from datajunction_server.database.nodelineage import NodeLineage
 from datajunction_server.database.notification_preference import NotificationPreference
 from datajunction_server.database.partition import Partition
 from datajunction_server.database.queryrequest import QueryRequest
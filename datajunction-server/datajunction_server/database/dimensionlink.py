@@ -1,7 +1,7 @@
 """Dimension links table."""
 
-from functools import cached_property
-from typing import TYPE_CHECKING, Dict, List, Optional, Set
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Set, Tuple
 
 from sqlalchemy import JSON, BigInteger, Enum, ForeignKey, Index, Integer
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -100,18 +100,26 @@ class DimensionLink(Base):
                 return value
         return JoinType.LEFT  # pragma: no cover
 
-    def join_sql_ast(self) -> "ast.Query":
+    @property
+    def join_query(self) -> str:
         """
-        The join query AST for this dimension link
+        The join query for this dimension link
         """
-        from datajunction_server.sql.parsing.backends.antlr4 import parse
-
-        return parse(
+        return (
             f"select 1 from {self.node_revision.name} "
             f"{self.join_type} join {self.dimension.name} "
-            + (f"on {self.join_sql}" if self.join_sql else ""),
+            + (f"on {self.join_sql}" if self.join_sql else "")
         )
 
+    def join_sql_ast(self) -> "ast.Query":
+        """
+        The join query AST for this dimension link. The parse is shared by all links
+        with the same join query, and each call returns a copy that is safe to mutate.
+        """
+        from datajunction_server.sql.parsing.backends.antlr4 import cached_parse
+
+        return cached_parse(self.join_query)
+
     def joins(self) -> List["ast.Join"]:
         """
         The join ASTs for this dimension link
@@ -126,32 +134,7 @@ class DimensionLink(Base):
         returns a mapping between the foreign keys on the node and the primary keys of
         the dimension based on the join SQL.
         """
-        from datajunction_server.sql.parsing.backends.antlr4 import ast
-
-        # Find equality comparions (i.e., fact.order_id = dim.order_id)
-        join_asts = self.joins()
-        equality_comparisons = (
-            [
-                expr
-                for expr in join_asts[0].criteria.on.find_all(ast.BinaryOp)  # type: ignore
-                if expr.op == ast.BinaryOpKind.Eq
-            ]
-            if join_asts[0].criteria
-            else []
-        )
-        mapping = {}
-        for comp in equality_comparisons:
-            if isinstance(comp.left, ast.Column) and isinstance(
-                comp.right,
-                ast.Column,
-            ):  # pragma: no cover
-                node_left = comp.left.name.namespace.identifier()  # type: ignore
-                node_right = comp.right.name.namespace.identifier()  # type: ignore
-                if node_left == self.node_revision.name:  # pragma: no cover
-                    mapping[comp.right] = comp.left
-                if node_right == self.node_revision.name:  # pragma: no cover
-                    mapping[comp.left] = comp.right  # pragma: no cover
-        return mapping
+        return _foreign_key_mapping(self.joins(), self.node_revision.name)
 
     @hybrid_property
     def foreign_keys(self) -> Dict[str, str | None]:
@@ -159,24 +142,7 @@ class DimensionLink(Base):
         Returns a mapping from the foreign key column(s) on the origin node to
         the primary key column(s) on the dimension node. The dict values are column names.
         """
-        from datajunction_server.sql.parsing.backends.antlr4 import ast
-
-        # Build equality operator-based mappings
-        join_asts = self.joins()
-        mapping: dict[str, str | None] = {
-            right.identifier(): left.identifier()
-            for left, right in self.foreign_key_mapping().items()
-        }
-
-        # Add remaining foreign key references without an equality comparison
-        columns = [col.identifier() for col in join_asts[0].find_all(ast.Column)]
-        foreign_key_refs = [
-            col for col in columns if col.startswith(self.node_revision.name)
-        ]
-        for foreign_key in foreign_key_refs:
-            if foreign_key not in mapping:
-                mapping[foreign_key] = None
-        return mapping
+        return dict(_join_keys(self.join_query, self.node_revision.name).foreign_keys)
 
     @hybrid_property
     def foreign_key_column_names(self) -> Set[str]:
@@ -189,13 +155,84 @@ class DimensionLink(Base):
             for fk in self.foreign_keys.keys()
         }
 
-    @cached_property
-    def foreign_keys_reversed(self):
+    @property
+    def foreign_keys_reversed(self) -> Dict[str, str]:
         """
         Returns a mapping from the primary key column(s) on the dimension node to the
         foreign key column(s) on the origin node. The dict values are column names.
         """
-        return {
-            left.identifier(): right.identifier()
-            for left, right in self.foreign_key_mapping().items()
-        }
+        return dict(_join_keys(self.join_query, self.node_revision.name).reversed)
+
+
+class JoinKeys(NamedTuple):
+    """
+    The column names that a join query maps between the linked node and the dimension
+    """
+
+    # Foreign key on the node -> primary key on the dimension, if joined on equality
+    foreign_keys: Tuple[Tuple[str, Optional[str]], ...]
+    # Primary key on the dimension -> foreign key on the node
+    reversed: Tuple[Tuple[str, str], ...]
+
+
+def _foreign_key_mapping(
+    join_asts: List["ast.Join"],
+    node_name: str,
+) -> Dict["ast.Column", "ast.Column"]:
+    """
+    Maps the dimension's columns to the node's columns that they are compared to for
+    equality in the join criteria
+    """
+    from datajunction_server.sql.parsing.backends.antlr4 import ast
+
+    # Find equality comparions (i.e., fact.order_id = dim.order_id)
+    equality_comparisons = (
+        [
+            expr
+            for expr in join_asts[0].criteria.on.find_all(ast.BinaryOp)  # type: ignore
+            if expr.op == ast.BinaryOpKind.Eq
+        ]
+        if join_asts[0].criteria
+        else []
+    )
+    mapping = {}
+    for comp in equality_comparisons:
+        if isinstance(comp.left, ast.Column) and isinstance(
+            comp.right,
+            ast.Column,
+        ):  # pragma: no cover
+            node_left = comp.left.name.namespace.identifier()  # type: ignore
+            node_right = comp.right.name.namespace.identifier()  # type: ignore
+            if node_left == node_name:  # pragma: no cover
+                mapping[comp.right] = comp.left
+            if node_right == node_name:  # pragma: no cover
+                mapping[comp.left] = comp.right  # pragma: no cover
+    return mapping
+
+
+@lru_cache(maxsize=4096)
+def _join_keys(join_query: str, node_name: str) -> JoinKeys:
+    """
+    Derives the join key column names from a dimension link's join query. These are
+    read several times per link for every query build, so they are cached by the join
+    query, which changes whenever the link or either of the linked nodes is renamed.
+    """
+    from datajunction_server.sql.parsing.backends.antlr4 import ast, cached_parse
+
+    join_asts = cached_parse(join_query).select.from_.relations[-1].extensions
+    mapping = _foreign_key_mapping(join_asts, node_name)
+    foreign_keys: Dict[str, Optional[str]] = {
+        right.identifier(): left.identifier() for left, right in mapping.items()
+    }
+
+    # Add remaining foreign key references without an equality comparison
+    for col in join_asts[0].find_all(ast.Column):
+        foreign_key = col.identifier()
+        if foreign_key.startswith(node_name) and foreign_key not in foreign_keys:
+            foreign_keys[foreign_key] = None
+    return JoinKeys(
+        foreign_keys=tuple(foreign_keys.items()),
+        reversed=tuple(
+            (left.identifier(), right.identifier()) for left, right in mapping.items()
+        ),
+    )
@@ -0,0 +1,55 @@
+"""Dimension reachability (dimensions graph closure) database schema."""
+
+from typing import Optional
+
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from datajunction_server.database.base import Base
+
+
+class DimensionReachability(Base):
+    """
+    The closure of the dimensions graph: one row per path from a node's current revision
+    to a dimension node reachable through its dimension links and dimension columns.
+
+    Each node also has a row with a depth of -1 pointing at itself, which records the
+    node version that its paths were computed for. Every row records the version of
+    its dimension node at that time, so paths that have gone stale since can be
+    detected on read. See `sql.dag.refresh_dimension_reachability`.
+    """
+
+    __tablename__ = "dimensionreachability"
+    __table_args__ = (
+        Index("idx_dimensionreachability_node_id", "node_id"),
+        Index("idx_dimensionreachability_dimension_id", "dimension_id"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+    )
+    node_id: Mapped[int] = mapped_column(
+        ForeignKey(
+            "node.id",
+            name="fk_dimensionreachability_node_id_node",
+            ondelete="CASCADE",
+        ),
+    )
+    dimension_id: Mapped[int] = mapped_column(
+        ForeignKey(
+            "node.id",
+            name="fk_dimensionreachability_dimension_id_node",
+            ondelete="CASCADE",
+        ),
+    )
+    # The version of the dimension node when this path was computed
+    dimension_version: Mapped[str] = mapped_column(String)
+
+    # The join path from the node to the dimension node, formatted as in the
+    # `get_dimensions_dag` query, i.e., "node.column,dim_a.[role],dim_b"
+    join_path: Mapped[str] = mapped_column(Text)
+    # The roles along the join path, joined by "->"
+    role: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # The number of dimension hops after the first one
+    depth: Mapped[int] = mapped_column(Integer)
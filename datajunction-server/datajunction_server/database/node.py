@@ -1,5 +1,6 @@
 """Node database schema."""
 
+import logging
 import pickle
 import zlib
 from datetime import datetime, timezone
@@ -72,12 +73,14 @@ from datajunction_server.models.node_type import NodeType
 from datajunction_server.models.partition import PartitionType
 from datajunction_server.naming import amenable_name, from_amenable_name
 from datajunction_server.typing import UTCDatetime
-from datajunction_server.utils import SEPARATOR, execute_with_retry
+from datajunction_server.utils import SEPARATOR, execute_with_retry, get_settings
 
 if TYPE_CHECKING:
     from datajunction_server.database.dimensionlink import DimensionLink
     from datajunction_server.database.measure import FrozenMeasure
 
+_logger = logging.getLogger(__name__)
+
 
 class NodeRelationship(Base):
     """
@@ -700,17 +703,104 @@ class Node(Base):
         return nodes
 
 
+try:  # pragma: no cover
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:  # pragma: no cover
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+# Frame magic numbers that tell zstd and lz4 payloads apart from zlib ones
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+LZ4_MAGIC = b"\x04\x22\x4d\x18"
+
+
+class MissingCompressionCodec(ValueError):
+    """
+    Raised when the package for a compression codec isn't installed
+    """
+
+
+def check_compression_codec(codec: str) -> None:
+    """
+    Check that the codec is supported and that its package is installed
+    """
+    if codec not in ("zlib", "zstd", "lz4"):
+        raise ValueError(f"Unknown compression codec `{codec}`")
+    if (codec == "zstd" and zstandard is None) or (
+        codec == "lz4" and lz4_frame is None
+    ):
+        raise MissingCompressionCodec(
+            f"The `{codec}` compression codec requires the `compression` extra",
+        )
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """
+    Compress the data with zlib, zstd or lz4
+    """
+    check_compression_codec(codec)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor().compress(data)  # pragma: no cover
+    if codec == "lz4":
+        return lz4_frame.compress(data)  # pragma: no cover
+    return zlib.compress(data)
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Decompress data compressed with any of the supported codecs
+    """
+    if data[:4] == ZSTD_MAGIC:
+        if zstandard is None:  # pragma: no cover
+            raise MissingCompressionCodec("The zstandard package is required")
+        return zstandard.ZstdDecompressor().decompress(data)  # pragma: no cover
+    if data[:4] == LZ4_MAGIC:
+        if lz4_frame is None:  # pragma: no cover
+            raise MissingCompressionCodec("The lz4 package is required")
+        return lz4_frame.decompress(data)  # pragma: no cover
+    return zlib.decompress(data)
+
+
 class CompressedPickleType(TypeDecorator):
     """
-    A SQLAlchemy type for storing zlib-compressed pickled objects.
+    A SQLAlchemy type for storing compressed pickled objects. Values are compressed
+    with the configured `pickle_compression` codec unless a codec is given, and are
+    read back with whichever codec they were written with.
     """
 
     impl = LargeBinary
     python_type = object
 
-    def __init__(self, *args, protocol=pickle.HIGHEST_PROTOCOL, **kwargs):
+    def __init__(
+        self,
+        *args,
+        protocol=pickle.HIGHEST_PROTOCOL,
+        codec: Optional[str] = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.protocol = protocol
+        self.codec = codec
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize and compress a Python object
+        """
+        return compress(
+            pickle.dumps(value, protocol=self.protocol),
+            self.codec or get_settings().pickle_compression,
+        )
+
+    @staticmethod
+    def loads(value: bytes) -> Any:
+        """
+        Decompress and deserialize a Python object
+        """
+        return pickle.loads(decompress(value))
 
     def process_bind_param(self, value, dialect):
         """
@@ -718,9 +808,7 @@ class CompressedPickleType(TypeDecorator):
         """
         if value is None:
             return None
-        return zlib.compress(  # pragma: no cover
-            pickle.dumps(value, protocol=self.protocol),
-        )
+        return self.dumps(value)  # pragma: no cover
 
     def process_result_value(self, value, dialect):
         """
@@ -728,8 +816,16 @@ class CompressedPickleType(TypeDecorator):
         """
         if value is None:
             return None
-        try:  # pragma: no cover
-            return pickle.loads(zlib.decompress(value))  # pragma: no cover
+        try:
+            return self.loads(value)
+        except MissingCompressionCodec:
+            # Only precompiled ASTs are stored with this type, so nodes fall back to
+            # compiling their queries
+            _logger.error(
+                "Failed to decompress a value written with another codec",
+                exc_info=True,
+            )
+            return None
         except TypeError:  # pragma: no cover
             return None
 
@@ -737,8 +833,7 @@ class CompressedPickleType(TypeDecorator):
         """Convert the value to a literal for SQL statements."""
         if value is not None:  # pragma: no cover
             # Convert the value to a compressed and pickled representation
-            compressed_value = zlib.compress(pickle.dumps(value))
-            return compressed_value.hex()  # Convert binary to a safe literal format
+            return self.dumps(value).hex()  # Convert binary to a safe literal format
         return None  # pragma: no cover
 
 
@@ -902,9 +997,11 @@ class NodeRevision(
         default=[],
     )
 
+    # The precompiled query AST, see `construction.precompiled`
     query_ast: Mapped[CompressedPickleType | None] = mapped_column(
         CompressedPickleType,
         default=None,
+        deferred=True,
     )
 
     custom_metadata: Mapped[Optional[Dict]] = mapped_column(
@@ -0,0 +1,46 @@
+"""Node lineage (transitive closure of the node DAG) database schema."""
+
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from datajunction_server.database.base import Base
+
+
+class NodeLineage(Base):
+    """
+    The transitive closure of the node DAG over current node revisions: one row per
+    ancestor/descendant pair, plus a row with a depth of 0 pairing each node with itself.
+
+    Every row records the current versions of both nodes at the time it was computed, so
+    that rows that have gone stale since can be detected on read. See
+    `sql.dag.refresh_node_lineage`.
+    """
+
+    __tablename__ = "nodelineage"
+    __table_args__ = (
+        Index("idx_nodelineage_ancestor_id_depth", "ancestor_id", "depth"),
+        Index("idx_nodelineage_descendant_id", "descendant_id"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey(
+            "node.id",
+            name="fk_nodelineage_ancestor_id_node",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey(
+            "node.id",
+            name="fk_nodelineage_descendant_id_node",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    # The length of the longest path from the ancestor to the descendant
+    depth: Mapped[int] = mapped_column(Integer)
+
+    # The current versions of the two nodes when this row was computed
+    ancestor_version: Mapped[str] = mapped_column(String)
+    descendant_version: Mapped[str] = mapped_column(String)
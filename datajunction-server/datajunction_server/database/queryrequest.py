@@ -1,9 +1,9 @@
 """Query request schema."""
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from functools import partial
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
+from typing import Any, Iterable, List, Optional
 
 from sqlalchemy import (
     JSON,
@@ -11,11 +11,17 @@ from sqlalchemy import (
     DateTime,
     Enum,
     UniqueConstraint,
+    delete,
+    func,
+    or_,
+    select,
     text,
+    update,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, joinedload, mapped_column, selectinload
+from sqlalchemy.sql.operators import is_
 
 from datajunction_server.construction.utils import to_namespaced_name
 from datajunction_server.database.base import Base
@@ -61,6 +67,7 @@ class QueryRequest(Base):  # type: ignore
             "engine_version",
             "limit",
             "orderby",
+            "other_args",
             name="query_request_unique",
             postgresql_nulls_not_distinct=True,
         ),
@@ -122,7 +129,7 @@ class QueryRequest(Base):  # type: ignore
     engine_name: Mapped[Optional[str]]
     engine_version: Mapped[Optional[str]]
 
-    # Additional input args
+    # Additional input args, which are part of the request key too
     other_args: Mapped[JSON] = mapped_column(
         JSONB,
         nullable=False,
@@ -140,6 +147,9 @@ class QueryRequest(Base):  # type: ignore
         nullable=False,
         server_default=text("'[]'::jsonb"),
     )
+    # The full serialized build result, for query types whose result isn't a single
+    # query (e.g., measures SQL)
+    result: Mapped[Optional[JSON]] = mapped_column(JSONB, nullable=True)
 
     # ---------- #
     #  Metadata  #
@@ -155,6 +165,131 @@ class QueryRequest(Base):  # type: ignore
     # External identifier for the query
     query_id: Mapped[Optional[str]]
 
+    # How many times the stored result has been used since it was built, and when it
+    # was last used, for pruning least recently used requests
+    hit_count: Mapped[int] = mapped_column(
+        BigInteger(),
+        default=0,
+        server_default=text("0"),
+    )
+    last_used_at: Mapped[UTCDatetime] = mapped_column(
+        DateTime(timezone=True),
+        default=partial(datetime.now, timezone.utc),
+        server_default=func.now(),
+        index=True,
+    )
+
+    @staticmethod
+    def key_values(request_key: "QueryRequestKey") -> dict[str, Any]:
+        """
+        The request key columns for a versioned query request
+        """
+        return {
+            "query_type": request_key.query_type,
+            "nodes": [str(node) for node in request_key.key.nodes],
+            "parents": [str(parent) for parent in request_key.key.parents],
+            "dimensions": [str(dim) for dim in request_key.key.dimensions],
+            "filters": request_key.key.filters,
+            "orderby": request_key.key.orderby,
+            "engine_name": request_key.engine_name,
+            "engine_version": request_key.engine_version,
+            "limit": request_key.limit,
+            "other_args": {
+                "include_all_columns": request_key.include_all_columns,
+                "preaggregate": request_key.preaggregate,
+                "use_materialized": request_key.use_materialized,
+                "query_parameters": request_key.query_parameters,
+                "other_args": request_key.other_args,
+            },
+        }
+
+    @classmethod
+    async def use(
+        cls,
+        session: AsyncSession,
+        request_key: "QueryRequestKey",
+    ) -> Optional[dict[str, Any]]:
+        """
+        Look up the stored result of a query request by its versioned key, recording
+        the hit. Returns the stored query, columns and result, if any.
+        """
+        statement = (
+            update(QueryRequest)
+            .where(
+                *[
+                    getattr(QueryRequest, column) == value
+                    for column, value in cls.key_values(request_key).items()
+                ],
+            )
+            .values(
+                hit_count=QueryRequest.hit_count + 1,
+                last_used_at=func.now(),
+            )
+            .returning(QueryRequest.query, QueryRequest.columns, QueryRequest.result)
+        )
+        row = (await session.execute(statement)).one_or_none()
+        await session.commit()
+        return row._asdict() if row else None
+
+    @classmethod
+    async def save(
+        cls,
+        session: AsyncSession,
+        request_key: "QueryRequestKey",
+        query: str,
+        columns: list[dict[str, Any]],
+        result: Optional[Any] = None,
+    ) -> None:
+        """
+        Store the built result of a query request, replacing any previous result
+        """
+        now = datetime.now(timezone.utc)
+        values = {"query": query, "columns": columns, "result": result}
+        statement = (
+            insert(QueryRequest)
+            .values(
+                **cls.key_values(request_key),
+                **values,
+                created_at=now,
+                updated_at=now,
+                last_used_at=now,
+            )
+            .on_conflict_do_update(
+                constraint="query_request_unique",
+                set_={**values, "updated_at": now, "last_used_at": now},
+            )
+        )
+        await session.execute(statement)
+        await session.commit()
+
+    @classmethod
+    async def prune(
+        cls,
+        session: AsyncSession,
+        max_requests: int,
+        unused_for: Optional[timedelta] = None,
+    ) -> int:
+        """
+        Delete the least recently used query requests beyond the most recent
+        `max_requests`, along with any that haven't been used for `unused_for`.
+        Returns the number of requests deleted.
+        """
+        cutoff = (
+            select(QueryRequest.last_used_at)
+            .order_by(QueryRequest.last_used_at.desc())
+            .offset(max_requests)
+            .limit(1)
+            .scalar_subquery()
+        )
+        conditions = [QueryRequest.last_used_at <= cutoff]
+        if unused_for is not None:
+            conditions.append(
+                QueryRequest.last_used_at < datetime.now(timezone.utc) - unused_for,
+            )
+        result = await session.execute(delete(QueryRequest).where(or_(*conditions)))
+        await session.commit()
+        return result.rowcount
+
 
 @dataclass(order=True)
 class VersionedNodeKey:
@@ -218,64 +353,130 @@ class VersionedQueryKey:
         dimensions: list[str],
         filters: list[str],
         orderby: list[str],
+        versions: dict[str, str | None] | None = None,
     ) -> "VersionedQueryKey":
         """
-        Versions a query request (e.g., nodes, dimensions, filters, and orderby).
+        Versions a query request (e.g., nodes, dimensions, filters, and orderby). All
+        of the nodes referenced by the request are looked up with one batched query.
+        If `versions` is given, it is filled in with the version of every node name
+        the key depends on, or None for names that don't resolve to a node.
         """
-        versioned_nodes, versioned_parents = await cls.version_nodes(session, nodes)
-        versioned_dims = await cls.version_dimensions(
-            session,
-            dimensions,
-            current_node=versioned_nodes[0] if versioned_nodes else None,
-        )
+        names = {
+            *nodes,
+            *(_dimension_node_name(dim) for dim in dimensions),
+            *cls._filter_names(filters),
+            *cls._orderby_names(orderby),
+        }
+        nodes_by_name = await cls._get_nodes(session, names)
+        if versions is not None:
+            versions.update(
+                {
+                    name: nodes_by_name[name].current_version
+                    if name in nodes_by_name
+                    else None
+                    for name in names
+                    if name
+                },
+            )
+            versions.update(
+                {
+                    parent.name: parent.current_version
+                    for node_name in nodes
+                    if node_name in nodes_by_name
+                    for parent in nodes_by_name[node_name].current.parents
+                },
+            )
+        versioned_nodes, versioned_parents = cls._version_nodes(nodes, nodes_by_name)
         return VersionedQueryKey(
             nodes=versioned_nodes,
             parents=versioned_parents,
-            dimensions=versioned_dims,
-            filters=await cls.version_filters(session, filters),
-            orderby=await cls.version_orderby(session, orderby),
+            dimensions=cls._version_dimensions(
+                dimensions,
+                nodes_by_name,
+                current_node=versioned_nodes[0] if versioned_nodes else None,
+            ),
+            filters=cls._version_filters(filters, nodes_by_name),
+            orderby=cls._version_orderby(orderby, nodes_by_name),
         )
 
     @staticmethod
-    async def version_nodes(
+    async def current_versions(
         session: AsyncSession,
-        nodes: list[str],
-    ) -> tuple[list[VersionedNodeKey], list[VersionedNodeKey]]:
+        names: Iterable[str],
+    ) -> dict[str, str | None]:
         """
-        Creates a versioned node key for each node in the list of nodes, and
-        returns a list of versioned parents for the nodes.
+        The current version of each of the node names, or None for names that don't
+        resolve to an active node. Only the versions are selected, so this is much
+        cheaper than versioning a query request.
+        """
+        names = list(names)
+        statement = (
+            select(Node.name, Node.current_version)
+            .where(Node.name.in_(names))
+            .where(is_(Node.deactivated_at, None))
+        )
+        found = dict((await session.execute(statement)).tuples().all())
+        return {name: found.get(name) for name in names}
+
+    @staticmethod
+    async def _get_nodes(
+        session: AsyncSession,
+        names: Iterable[str],
+    ) -> dict[str, Node]:
+        """
+        Looks up nodes by name, along with the parents of their current revisions
         """
-        nodes_objs = {
+        names = sorted(name for name in set(names) if name)
+        if not names:
+            return {}
+        return {
             node.name: node
             for node in await Node.get_by_names(
                 session,
-                nodes,
+                names,
                 options=[
                     joinedload(Node.current).options(
-                        selectinload(NodeRevision.columns),
-                        selectinload(NodeRevision.parents).options(
-                            joinedload(Node.current),
-                        ),
+                        selectinload(NodeRevision.parents),
                     ),
                 ],
             )
         }
+
+    @classmethod
+    async def version_nodes(
+        cls,
+        session: AsyncSession,
+        nodes: list[str],
+    ) -> tuple[list[VersionedNodeKey], list[VersionedNodeKey]]:
+        """
+        Creates a versioned node key for each node in the list of nodes, and
+        returns a list of versioned parents for the nodes.
+        """
+        return cls._version_nodes(nodes, await cls._get_nodes(session, nodes))
+
+    @staticmethod
+    def _version_nodes(
+        nodes: list[str],
+        nodes_by_name: dict[str, Node],
+    ) -> tuple[list[VersionedNodeKey], list[VersionedNodeKey]]:
         versioned_parents = sorted(
             {
                 VersionedNodeKey.from_node(parent)
-                for node in nodes_objs.values()
-                for parent in node.current.parents
+                for node_name in nodes
+                if node_name in nodes_by_name
+                for parent in nodes_by_name[node_name].current.parents
             },
         )
         versioned_nodes = [
-            VersionedNodeKey.from_node(nodes_objs[node_name])
+            VersionedNodeKey.from_node(nodes_by_name[node_name])
             for node_name in nodes
-            if node_name in nodes_objs
+            if node_name in nodes_by_name
         ]
         return versioned_nodes, versioned_parents
 
-    @staticmethod
+    @classmethod
     async def version_dimensions(
+        cls,
         session: AsyncSession,
         dimensions: list[str],
         current_node: VersionedNodeKey | None = None,
@@ -283,107 +484,186 @@ class VersionedQueryKey:
         """
         Versions the dimensions by creating a versioned node key for each dimension.
         """
-        node_names = [
-            name
-            for name in [".".join(dim.split(".")[:-1]) for dim in dimensions]
-            if name
-        ]
-        dimension_nodes = {
-            node.name: node
-            for node in await Node.get_by_names(
-                session,
-                node_names,
-            )
-        }
-        return [
-            VersionedNodeKey(
-                dim,
-                dimension_nodes[name].current_version
-                if name in dimension_nodes and dimension_nodes[name]
-                else current_node.version
-                if current_node
-                else None,
-            )
-            for dim, name in zip(dimensions, node_names)
-        ]
+        nodes_by_name = await cls._get_nodes(
+            session,
+            (_dimension_node_name(dim) for dim in dimensions),
+        )
+        return cls._version_dimensions(dimensions, nodes_by_name, current_node)
 
     @staticmethod
-    async def version_filters(session: AsyncSession, filters: list[str]) -> list[str]:
+    def _version_dimensions(
+        dimensions: list[str],
+        nodes_by_name: dict[str, Node],
+        current_node: VersionedNodeKey | None = None,
+    ) -> list[VersionedNodeKey]:
+        versioned_dims = []
+        for dim in dimensions:
+            dim_node = nodes_by_name.get(_dimension_node_name(dim))
+            versioned_dims.append(
+                VersionedNodeKey(
+                    dim,
+                    dim_node.current_version
+                    if dim_node
+                    else current_node.version
+                    if current_node
+                    else None,
+                ),
+            )
+        return versioned_dims
+
+    @classmethod
+    async def version_filters(
+        cls,
+        session: AsyncSession,
+        filters: list[str],
+    ) -> list[str]:
         """
         Versions the filters by parsing them and replacing dimension / metrics references
         with their versioned node keys.
         """
+        nodes_by_name = await cls._get_nodes(session, cls._filter_names(filters))
+        return cls._version_filters(filters, nodes_by_name)
+
+    @staticmethod
+    def _filter_names(filters: list[str]) -> set[str]:
+        """
+        The node names that the filters' columns may refer to: either the column is a
+        metric node, or it is a dimension attribute on a dimension node
+        """
+        return {
+            name
+            for filter_ in filters
+            if filter_
+            for col_name in _filter_columns(filter_)
+            for name in (col_name, _dimension_node_name(col_name))
+        }
+
+    @staticmethod
+    def _version_filters(
+        filters: list[str],
+        nodes_by_name: dict[str, Node],
+    ) -> list[str]:
         results = []
         for filter_ in filters:
             if not filter_:
                 continue  # pragma: no cover
-            ast_tree = parse(f"SELECT 1 WHERE {filter_}")
-            for col in ast_tree.select.where.find_all(ast.Column):  # type: ignore
-                # Extract role if column is subscripted
-                if isinstance(col.parent, ast.Subscript):
-                    if isinstance(col.parent.index, ast.Lambda):
-                        col.role = str(col.parent.index)  # pragma: no cover
-                    else:
-                        col.role = col.parent.index.identifier()  # type: ignore
-                    col.parent.swap(col)
-
-                # Try resolving as metric node first
-                col_name = col.identifier()
-                metric_node = await Node.get_by_name(
-                    session,
-                    col_name,
-                    options=[],
-                )
-                if metric_node:
-                    versioned_node_name = str(VersionedNodeKey.from_node(metric_node))
-                    col.name = to_namespaced_name(versioned_node_name)
-                else:
-                    # Fallback to dimension node
-                    dim_node_name = ".".join(col_name.split(".")[:-1])
-                    dim_node = await Node.get_by_name(
-                        session,
-                        dim_node_name,
-                        options=[],
+            versions = []
+            for col_name in _filter_columns(filter_):
+                # Try resolving as metric node first, then fall back to dimension node
+                if metric_node := nodes_by_name.get(col_name):
+                    versions.append(
+                        (True, str(VersionedNodeKey.from_node(metric_node))),
                     )
-                    if dim_node:
-                        col.alias_or_name.name = to_namespaced_name(
-                            f"{col.alias_or_name.name}"
-                            f"{'[' + col.role + ']' if col.role else ''}"
-                            f"@{dim_node.current_version}",
-                        )
-            results.append(str(ast_tree.select.where))
+                elif dim_node := nodes_by_name.get(_dimension_node_name(col_name)):
+                    versions.append((False, dim_node.current_version))
+                else:
+                    versions.append(None)
+            results.append(_versioned_filter(filter_, tuple(versions)))
         return results
 
-    @staticmethod
-    async def version_orderby(session: AsyncSession, orderby: list[str]) -> list[str]:
+    @classmethod
+    async def version_orderby(
+        cls,
+        session: AsyncSession,
+        orderby: list[str],
+    ) -> list[str]:
         """
         This handles versioning two types of ORDER BY clauses:
         * dimension order bys: <dimension attribute> <ordering>
         * metric order bys: <metric node name> <ordering>
         """
+        nodes_by_name = await cls._get_nodes(session, cls._orderby_names(orderby))
+        return cls._version_orderby(orderby, nodes_by_name)
+
+    @staticmethod
+    def _orderby_names(orderby: list[str]) -> set[str]:
+        return {
+            name
+            for order in orderby
+            for name in (order.split(" ")[0], _dimension_node_name(order.split(" ")[0]))
+        }
+
+    @classmethod
+    def _version_orderby(
+        cls,
+        orderby: list[str],
+        nodes_by_name: dict[str, Node],
+    ) -> list[str]:
         results = []
         for order in orderby:
             parts = order.split(" ")
             order_by_col = parts[0]
-            order_by_metric_node = await Node.get_by_name(
-                session,
-                order_by_col,
-                options=[],
-            )
-            if order_by_metric_node:
+            if order_by_metric_node := nodes_by_name.get(order_by_col):
                 # If it was a metric node in the order by clause, version the metric node
                 parts[0] = str(VersionedNodeKey.from_node(order_by_metric_node))
             else:
                 # Otherwise it is a dimension attribute
-                versioned_dim = await VersionedQueryKey.version_dimensions(
-                    session,
-                    [order_by_col],
-                )
+                versioned_dim = cls._version_dimensions([order_by_col], nodes_by_name)
                 parts[0] = str(versioned_dim[0])
             results.append(" ".join(parts))
         return results
 
 
+def _dimension_node_name(dimension: str) -> str:
+    """
+    The name of the node that a dimension attribute belongs to
+    """
+    return ".".join(dimension.split(".")[:-1])
+
+
+def _parse_filter(filter_: str) -> tuple[ast.Query, list[ast.Column]]:
+    """
+    Parses a filter, moving the role of any subscripted column onto the column
+    """
+    ast_tree = parse(f"SELECT 1 WHERE {filter_}")
+    columns = []
+    for col in ast_tree.select.where.find_all(ast.Column):  # type: ignore
+        # Extract role if column is subscripted
+        if isinstance(col.parent, ast.Subscript):
+            if isinstance(col.parent.index, ast.Lambda):
+                col.role = str(col.parent.index)  # pragma: no cover
+            else:
+                col.role = col.parent.index.identifier()  # type: ignore
+            col.parent.swap(col)
+        columns.append(col)
+    return ast_tree, columns
+
+
+@lru_cache(maxsize=1024)
+def _filter_columns(filter_: str) -> tuple[str, ...]:
+    """
+    The identifiers of the columns referenced by a filter, in order
+    """
+    _, columns = _parse_filter(filter_)
+    return tuple(col.identifier() for col in columns)
+
+
+@lru_cache(maxsize=1024)
+def _versioned_filter(
+    filter_: str,
+    versions: tuple[tuple[bool, str] | None, ...],
+) -> str:
+    """
+    Renders a filter with its columns versioned. For each column, `versions` holds
+    either (True, <versioned metric node name>) for metric references, (False,
+    <dimension node version>) for dimension attributes, or None to leave it as is.
+    """
+    ast_tree, columns = _parse_filter(filter_)
+    for col, version in zip(columns, versions):
+        if version is None:
+            continue
+        is_metric, versioned_name = version
+        if is_metric:
+            col.name = to_namespaced_name(versioned_name)
+        else:
+            col.alias_or_name.name = to_namespaced_name(
+                f"{col.alias_or_name.name}"
+                f"{'[' + col.role + ']' if col.role else ''}"
+                f"@{versioned_name}",
+            )
+    return str(ast_tree.select.where)
+
+
 @dataclass
 class QueryRequestKey:
     """
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
+import asyncio
+from copy import deepcopy
 import hashlib
 import json
 import logging
+import random
+import time
+from functools import partial
 from typing import Generic, Protocol, TypeVar
 from fastapi import BackgroundTasks, Request
 
@@ -72,9 +77,33 @@ class RefreshAheadCacheManager(CacheManager):
     Cache manager implementing refresh-ahead caching.
 
     This strategy always serves the currently cached value immediately, regardless of whether
-    it's stale, and then triggers a background refresh to update the cache with the latest data.
+    it's stale, and then triggers a background refresh to update the cache with the latest data
+    once the value is older than its soft TTL (`refresh_after` seconds, with some jitter so that
+    values cached together don't all refresh together).
+
+    Loads are single-flight per cache key within a process: concurrent misses for the same key
+    wait on the one in-flight `fallback` call, and at most one refresh per key runs at a time.
+    The fallback runs as its own task, so a caller that is cancelled (e.g., when its client
+    disconnects) doesn't cancel the load for the other callers waiting on it.
+
+    Managers can keep a durable second level behind the cache by implementing `get_persisted`,
+    which is checked on cache misses, and `persist`, which every loaded value is written to.
     """
 
+    # Seconds after which a cached value is refreshed when it is served
+    refresh_after: int = 0
+    # Fraction of `refresh_after` by which the refresh time of each value is randomized
+    refresh_jitter: float = 0.1
+    # Seconds after which a scheduled refresh that never completed no longer blocks new ones
+    refresh_timeout: int = 600
+
+    # The in-flight loads and the start times of scheduled refreshes by cache key, shared
+    # by all managers in the process since a manager is created per request
+    _inflight: dict[str, asyncio.Task] = {}
+    _refreshing: dict[str, float] = {}
+    # Saves of loads whose caller was cancelled, referenced until they complete
+    _saving: set[asyncio.Task] = set()
+
     async def get_or_load(
         self,
         background_tasks: BackgroundTasks,
@@ -94,9 +123,22 @@ class RefreshAheadCacheManager(CacheManager):
         key: str = await self.build_cache_key(request, params)
         if not no_cache:
             if cached := self.cache.get(key):
-                if not no_store:
+                if not no_store and self._should_refresh(key):
+                    self._refreshing[key] = time.monotonic()
                     background_tasks.add_task(self._refresh_cache, key, request, params)
                 return cached
+            if (persisted := await self.get_persisted(key, request)) is not None:
+                self.logger.info("Loaded persisted value for key=%s", key)
+                if not no_store:
+                    # Cached without a refresh time, so that it's rebuilt in the background
+                    # the next time it's served
+                    background_tasks.add_task(
+                        self.cache.set,
+                        key,
+                        persisted,
+                        timeout=self.default_timeout,
+                    )
+                return persisted
             self.logger.info(
                 "Cache miss (key=%s) for request with parameters=%s, computing fresh value.",
                 key,
@@ -108,17 +150,109 @@ class RefreshAheadCacheManager(CacheManager):
                 params,
             )
 
-        result = await self.fallback(request, params)
+        result, loaded = await self._load(key, request, params, store=not no_store)
 
-        if not no_store:
-            background_tasks.add_task(
-                self.cache.set,
-                key,
-                result,
+        # Only the caller that ran the fallback stores the result
+        if loaded and not no_store:
+            background_tasks.add_task(self._save, key, result)
+
+        return result
+
+    async def _load(
+        self,
+        key: str,
+        request: Request,
+        params: ParamsType,
+        store: bool = True,
+    ) -> tuple[ResultType, bool]:
+        """
+        Run the fallback for the key, or wait for the fallback already running for it.
+        Returns the result and whether this call started the fallback. If that call is
+        cancelled before the fallback completes, the load carries on for the other
+        callers and its result is saved once it completes, unless `store` is unset.
+        """
+        if (inflight := self._inflight.get(key)) is not None:
+            self.logger.info("Waiting on in-flight load for key=%s", key)
+            return deepcopy(await asyncio.shield(inflight)), False
+
+        load = asyncio.ensure_future(self.fallback(request, params))
+        self._inflight[key] = load
+        load.add_done_callback(partial(self._finish_load, key))
+        try:
+            result = await asyncio.shield(load)
+        except asyncio.CancelledError:
+            if store and not load.done():
+                load.add_done_callback(partial(self._save_orphaned_load, key))
+            raise
+        return result, True
+
+    def _finish_load(self, key: str, load: asyncio.Task) -> None:
+        """
+        Stop coalescing callers onto a completed load
+        """
+        if self._inflight.get(key) is load:
+            del self._inflight[key]
+        if not load.cancelled():
+            # Waiters get the exception; don't warn when there are none
+            load.exception()
+
+    def _save_orphaned_load(self, key: str, load: asyncio.Task) -> None:
+        """
+        Save the result of a load whose caller was cancelled before it completed
+        """
+        if load.cancelled() or load.exception() is not None:
+            return
+        saving = asyncio.ensure_future(self._save(key, load.result()))
+        self._saving.add(saving)
+        saving.add_done_callback(self._saving.discard)
+
+    async def get_persisted(self, key: str, request: Request) -> ResultType | None:
+        """
+        Look up a value in the durable store behind the cache, if the manager has one.
+        Called on cache misses before falling back.
+        """
+        return None
+
+    async def persist(self, key: str, result: ResultType) -> None:
+        """
+        Write a freshly loaded value behind to the durable store, if the manager has one
+        """
+
+    def _should_refresh(self, key: str) -> bool:
+        """
+        Whether a served value is due for a refresh and none is running for it
+        """
+        started = self._refreshing.get(key)
+        if started is not None and time.monotonic() - started < self.refresh_timeout:
+            return False
+        if self.refresh_after <= 0:
+            return True
+        # Values cached without a refresh time are due right away
+        refresh_at = self.cache.get(self._refresh_at_key(key))
+        return refresh_at is None or time.time() >= refresh_at
+
+    def _refresh_at_key(self, key: str) -> str:
+        return f"{key}:refresh_at"
+
+    def _store(self, key: str, result: ResultType) -> None:
+        """
+        Cache the result along with the time after which it should be refreshed
+        """
+        self.cache.set(key, result, timeout=self.default_timeout)
+        if self.refresh_after > 0:
+            jitter = random.uniform(-self.refresh_jitter, self.refresh_jitter)
+            self.cache.set(
+                self._refresh_at_key(key),
+                time.time() + self.refresh_after * (1 + jitter),
                 timeout=self.default_timeout,
             )
 
-        return result
+    async def _save(self, key: str, result: ResultType) -> None:
+        """
+        Cache a loaded value and write it behind to the durable store
+        """
+        self._store(key, result)
+        await self.persist(key, result)
 
     async def _refresh_cache(
         self,
@@ -130,6 +264,10 @@ class RefreshAheadCacheManager(CacheManager):
         Async cache refresher that re-runs fallback and updates the cache.
         """
         self.logger.info("Refreshing cache for key=%s", key)
-        result = await self.fallback(request, params)
-        self.cache.set(key, result, timeout=self.default_timeout)
+        try:
+            result, loaded = await self._load(key, request, params)
+            if loaded:
+                await self._save(key, result)
+        finally:
+            self._refreshing.pop(key, None)
         self.logger.info("Successfully refreshed cache for key=%s", key)
@@ -2,21 +2,47 @@
 Cachelib-based cache implementation
 """
 
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
-from cachelib import SimpleCache
+from cachelib import BaseCache
+from cachelib.redis import RedisCache
 from fastapi import Request
 
 from datajunction_server.internal.caching.interface import Cache, CacheInterface
+from datajunction_server.internal.caching.lru_cache import LRUCache
+from datajunction_server.internal.caching.node_index import (
+    LocalNodeKeyIndex,
+    NodeKeyIndex,
+    RedisNodeKeyIndex,
+)
 from datajunction_server.internal.caching.noop_cache import noop_cache
+from datajunction_server.utils import get_settings
 
 
 class CachelibCache(Cache):
-    """A standard implementation of CacheInterface that uses cachelib"""
+    """
+    A standard implementation of CacheInterface that uses cachelib. By default values
+    are kept in a per-process `LRUCache`, but any cachelib backend can be used,
+    including shared ones like `RedisCache`.
 
-    def __init__(self):
+    The keys of values built from each node are indexed next to the backend, in Redis
+    for a `RedisCache` and in process otherwise. The in-process index is pruned as
+    keys are deleted or, with an `LRUCache`, evicted.
+    """
+
+    def __init__(self, backend: Optional[BaseCache] = None):
         super().__init__()
-        self.cache = SimpleCache()
+        self.cache = backend if backend is not None else LRUCache()
+        self.node_index: NodeKeyIndex
+        if isinstance(self.cache, RedisCache):
+            self.node_index = RedisNodeKeyIndex(
+                self.cache._write_client,
+                self.cache._get_prefix(),
+            )
+        else:
+            self.node_index = LocalNodeKeyIndex()
+            if isinstance(self.cache, LRUCache):
+                self.cache.on_evict = self.node_index.discard
 
     def get(self, key: str) -> Optional[Any]:
         """Get a cached value from the simple cache"""
@@ -32,9 +58,29 @@ class CachelibCache(Cache):
         """Delete a key in the simple cache"""
         super().delete(key)
         self.cache.delete(key)
+        self.node_index.discard(key)
+
+    def index_by_nodes(
+        self,
+        keys: Iterable[str],
+        node_names: Iterable[str],
+        timeout: int = 300,
+    ) -> None:
+        """Index the keys by the nodes their values were built from"""
+        keys, node_names = list(keys), list(node_names)
+        super().index_by_nodes(keys, node_names, timeout)
+        self.node_index.add(keys, node_names, timeout)
+
+    def delete_by_nodes(self, node_names: Iterable[str]) -> int:
+        """Delete the values built from any of the nodes"""
+        node_names = list(node_names)
+        super().delete_by_nodes(node_names)
+        return sum(
+            bool(self.cache.delete(key)) for key in self.node_index.pop(node_names)
+        )
 
 
-cachelib_cache = CachelibCache()
+cachelib_cache = CachelibCache(get_settings().query_cache)
 
 
 def get_cache(request: Request) -> Optional[CacheInterface]:
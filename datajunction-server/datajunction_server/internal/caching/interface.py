@@ -4,7 +4,7 @@ Caching interface and logging wrapper
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 
 class CacheInterface(ABC):
@@ -49,3 +49,32 @@ class Cache(CacheInterface):
     def delete(self, key: str) -> None:
         """Log the cache deletion attempt and then use the implemented cache"""
         self.logger.info("%s: Deleting key %s", self.__class__.__name__, key)
+
+    def index_by_nodes(
+        self,
+        keys: Iterable[str],
+        node_names: Iterable[str],
+        timeout: int = 300,
+    ) -> None:
+        """
+        Record that the values cached at `keys` depend on the given nodes, so that
+        they can be evicted with `delete_by_nodes` when any of the nodes change
+        """
+        self.logger.info(
+            "%s: Indexing keys %s by nodes %s",
+            self.__class__.__name__,
+            keys,
+            node_names,
+        )
+
+    def delete_by_nodes(self, node_names: Iterable[str]) -> int:
+        """
+        Evict the values that depend on any of the given nodes, returning the number
+        of keys deleted
+        """
+        self.logger.info(
+            "%s: Deleting keys indexed by nodes %s",
+            self.__class__.__name__,
+            node_names,
+        )
+        return 0
@@ -0,0 +1,77 @@
+"""
+Size-bounded in-process cache backend
+"""
+
+import pickle
+import threading
+from collections import OrderedDict
+from time import time
+from typing import Any, Callable, Optional, Tuple
+
+from cachelib import BaseCache
+
+
+class LRUCache(BaseCache):
+    """
+    An in-process cachelib backend holding at most `threshold` values, which evicts the
+    least recently used value when full. Values are stored pickled, like cachelib's
+    `SimpleCache`, so callers can't mutate the cached copies. `on_evict` is called with
+    the keys of values that are evicted or found expired, while the cache is locked.
+    """
+
+    def __init__(self, threshold: int = 500, default_timeout: int = 300):
+        super().__init__(default_timeout)
+        self._threshold = threshold
+        # Key -> (expiry time, pickled value)
+        self._cache: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.on_evict: Optional[Callable[[str], None]] = None
+
+    def _expires(self, timeout: Optional[int]) -> float:
+        # Like cachelib's other backends, a timeout of 0 never expires while negative
+        # timeouts expire right away
+        timeout = self._normalize_timeout(timeout)
+        return time() + timeout if timeout > 0 else timeout
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires != 0 and expires <= time():
+                del self._cache[key]
+                if self.on_evict is not None:
+                    self.on_evict(key)
+                return None
+            self._cache.move_to_end(key)
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        entry = (self._expires(timeout), pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._threshold:
+                evicted, _ = self._cache.popitem(last=False)
+                if self.on_evict is not None:
+                    self.on_evict(evicted)
+        return True
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        with self._lock:
+            if key in self._cache:
+                return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._cache.pop(key, None) is not None
+
+    def has(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def clear(self) -> bool:
+        with self._lock:
+            self._cache.clear()
+        return True
@@ -0,0 +1,120 @@
+"""
+Indexes of cached values by the nodes they were built from
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Iterable
+
+
+class NodeKeyIndex(ABC):
+    """
+    Records which cache keys hold values built from each node, so that the values can
+    be evicted when any of the nodes change. The index is kept apart from the cached
+    values, so that evicting values never evicts the index.
+    """
+
+    @abstractmethod
+    def add(self, keys: Iterable[str], node_names: Iterable[str], timeout: int) -> None:
+        """
+        Index the keys under each of the nodes. Keys are dropped from the index after
+        `timeout` seconds, like the values cached at them (never if 0).
+        """
+
+    @abstractmethod
+    def pop(self, node_names: Iterable[str]) -> set[str]:
+        """
+        Remove the nodes from the index, returning the keys indexed under any of them
+        """
+
+    def discard(self, key: str) -> None:
+        """
+        Prune a key whose value is no longer cached
+        """
+
+
+class LocalNodeKeyIndex(NodeKeyIndex):
+    """
+    An in-process index, pruned as the cache backend evicts or deletes keys
+    """
+
+    def __init__(self):
+        self._keys_by_node: dict[str, set[str]] = defaultdict(set)
+        self._nodes_by_key: dict[str, set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def add(self, keys: Iterable[str], node_names: Iterable[str], timeout: int) -> None:
+        keys, node_names = set(keys), set(node_names)
+        with self._lock:
+            for node_name in node_names:
+                self._keys_by_node[node_name] |= keys
+            for key in keys:
+                self._nodes_by_key[key] |= node_names
+
+    def pop(self, node_names: Iterable[str]) -> set[str]:
+        keys: set[str] = set()
+        with self._lock:
+            for node_name in set(node_names):
+                keys |= self._keys_by_node.pop(node_name, set())
+            for key in keys:
+                self._discard(key)
+        return keys
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        for node_name in self._nodes_by_key.pop(key, ()):
+            if (node_keys := self._keys_by_node.get(node_name)) is not None:
+                node_keys.discard(key)
+                if not node_keys:
+                    del self._keys_by_node[node_name]
+
+
+class RedisNodeKeyIndex(NodeKeyIndex):
+    """
+    An index shared through Redis, holding the keys of each node in a sorted set scored
+    by their expiry time. Adds are atomic, and expired keys are pruned from a node's set
+    whenever keys are added to it. Keys that Redis evicts before they expire are pruned
+    once they would have expired.
+    """
+
+    def __init__(self, client: Any, key_prefix: str = ""):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def node_key(self, node_name: str) -> str:
+        """
+        The key of the sorted set of cache keys built from the node
+        """
+        return f"{self.key_prefix}node-keys:{node_name}"
+
+    def add(self, keys: Iterable[str], node_names: Iterable[str], timeout: int) -> None:
+        now = time.time()
+        expires = now + timeout if timeout > 0 else float("inf")
+        members = {key: expires for key in keys}
+        pipe = self.client.pipeline(transaction=False)
+        for node_name in set(node_names):
+            node_key = self.node_key(node_name)
+            pipe.zadd(node_key, members)
+            pipe.zremrangebyscore(node_key, "-inf", now)
+            if timeout > 0:
+                pipe.expire(node_key, timeout)
+        pipe.execute()
+
+    def pop(self, node_names: Iterable[str]) -> set[str]:
+        keys: set[str] = set()
+        for node_name in set(node_names):
+            node_key = self.node_key(node_name)
+            pipe = self.client.pipeline(transaction=True)
+            pipe.zrange(node_key, 0, -1)
+            pipe.delete(node_key)
+            members, _ = pipe.execute()
+            keys |= {
+                member.decode() if isinstance(member, bytes) else member
+                for member in members
+            }
+        return keys
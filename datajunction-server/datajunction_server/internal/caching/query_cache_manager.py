@@ -1,5 +1,6 @@
 from copy import deepcopy
 from dataclasses import asdict, dataclass
+import hashlib
 import json
 import logging
 from typing import Any, OrderedDict
@@ -8,6 +9,7 @@ from datajunction_server.internal.caching.cache_manager import RefreshAheadCache
 from sqlalchemy.ext.asyncio import AsyncSession
 from datajunction_server.internal.caching.interface import Cache
 from datajunction_server.database.queryrequest import (
+    QueryRequest,
     QueryRequestKey,
     QueryBuildType,
     VersionedQueryKey,
@@ -65,10 +67,24 @@ class QueryCacheManager(RefreshAheadCacheManager):
 
     _cache_key_prefix = "sql"
     default_timeout = settings.query_cache_timeout
+    refresh_after = settings.query_cache_refresh_after
+    # The number of versioned query keys kept in the in-process pre-key index
+    versioned_key_index_size = 1024
+
+    # Pre-key (a hash of the raw request) -> the versioned query key built for it, along
+    # with the node versions it was built from. Shared by all managers in the process.
+    _versioned_keys: OrderedDict[
+        str,
+        tuple[VersionedQueryKey, dict[str, str | None]],
+    ] = OrderedDict()
 
     def __init__(self, cache: Cache, query_type: QueryBuildType):
         super().__init__(cache)
         self.query_type = query_type
+        # Cache key -> names of the nodes the cached SQL depends on
+        self._key_nodes: dict[str, set[str]] = {}
+        # Cache key -> the versioned request it was built from
+        self._request_keys: dict[str, QueryRequestKey] = {}
 
     @property
     def cache_key_prefix(self) -> str:
@@ -129,8 +145,8 @@ class QueryCacheManager(RefreshAheadCacheManager):
         Returns a cache key for the query request.
         """
         async with session_context(request) as session:
-            versioned_request = await VersionedQueryKey.version_query_request(
-                session=session,
+            versioned_request, versions = await self.version_request(
+                session,
                 nodes=sorted(params.nodes),
                 dimensions=sorted(params.dimensions),
                 filters=sorted(params.filters),
@@ -148,7 +164,125 @@ class QueryCacheManager(RefreshAheadCacheManager):
                 query_parameters=json.loads(params.query_params or "{}"),
                 other_args=params.other_args or {},
             )
-            return await super().build_cache_key(request, asdict(query_request))
+            key = await super().build_cache_key(request, asdict(query_request))
+            self._key_nodes[key] = {
+                name for name, version in versions.items() if version is not None
+            }
+            self._request_keys[key] = query_request
+            return key
+
+    async def get_persisted(
+        self,
+        key: str,
+        request: Request,
+    ) -> list[GeneratedSQL] | TranslatedSQL | None:
+        """
+        Look up SQL previously built for the same versioned request in the query
+        request table, recording the hit. Failures are logged rather than raised, since
+        the SQL can always be rebuilt.
+        """
+        if (request_key := self._request_keys.get(key)) is None:
+            return None  # pragma: no cover
+        try:
+            async with session_context() as session:
+                stored = await QueryRequest.use(session, request_key)
+        except Exception:
+            logger.warning(
+                "Failed to look up stored SQL for key=%s", key, exc_info=True
+            )
+            return None
+        if stored is None or stored["result"] is None:
+            return None
+        if self.query_type == QueryBuildType.MEASURES:
+            return [GeneratedSQL.model_validate(sql) for sql in stored["result"]]
+        return TranslatedSQL.model_validate(stored["result"])
+
+    async def persist(
+        self,
+        key: str,
+        result: list[GeneratedSQL] | TranslatedSQL,
+    ) -> None:
+        """
+        Store built SQL in the query request table, so that other workers and restarted
+        servers can serve it without rebuilding. Refreshes of cached SQL rewrite it,
+        which keeps frequently served requests from being pruned.
+        """
+        if (request_key := self._request_keys.get(key)) is None:
+            return  # pragma: no cover
+        try:
+            if isinstance(result, TranslatedSQL):
+                query = result.sql
+                columns = [col.model_dump(mode="json") for col in result.columns or []]
+                serialized = result.model_dump(mode="json")
+            else:
+                query = ";\n\n".join(sql.sql for sql in result)
+                columns = []
+                serialized = [sql.model_dump(mode="json") for sql in result]
+            async with session_context() as session:
+                await QueryRequest.save(
+                    session,
+                    request_key,
+                    query=query,
+                    columns=columns,
+                    result=serialized,
+                )
+        except Exception:
+            logger.warning("Failed to store built SQL for key=%s", key, exc_info=True)
+
+    def _store(self, key: str, result: list[GeneratedSQL] | TranslatedSQL) -> None:
+        """
+        Cache the result and index it by the nodes it depends on, so that it can be
+        evicted when any of them are updated
+        """
+        super()._store(key, result)
+        if nodes := self._key_nodes.get(key):
+            self.cache.index_by_nodes(
+                [key, self._refresh_at_key(key)],
+                nodes,
+                timeout=self.default_timeout,
+            )
+
+    async def version_request(
+        self,
+        session: AsyncSession,
+        nodes: list[str],
+        dimensions: list[str],
+        filters: list[str],
+        orderby: list[str],
+    ) -> tuple[VersionedQueryKey, dict[str, str | None]]:
+        """
+        Versions the query request through the pre-key index. An indexed versioned key
+        is reused as long as none of the nodes it was built from have changed version,
+        which takes a single query for the nodes' current versions. Returns the key and
+        the node versions it was built from.
+        """
+        pre_key = hashlib.sha256(
+            json.dumps([nodes, dimensions, filters, orderby]).encode("utf-8"),
+        ).hexdigest()
+        if (indexed := self._versioned_keys.get(pre_key)) is not None:
+            versioned_request, versions = indexed
+            if (
+                not versions
+                or await VersionedQueryKey.current_versions(session, versions)
+                == versions
+            ):
+                self._versioned_keys.move_to_end(pre_key)
+                return versioned_request, versions
+            del self._versioned_keys[pre_key]
+
+        versions: dict[str, str | None] = {}
+        versioned_request = await VersionedQueryKey.version_query_request(
+            session=session,
+            nodes=nodes,
+            dimensions=dimensions,
+            filters=filters,
+            orderby=orderby,
+            versions=versions,
+        )
+        self._versioned_keys[pre_key] = (versioned_request, versions)
+        while len(self._versioned_keys) > self.versioned_key_index_size:
+            self._versioned_keys.popitem(last=False)
+        return versioned_request, versions
 
     async def _build_measures_query(
         self,
@@ -31,6 +31,10 @@ from datajunction_server.internal.nodes import (
     hard_delete_node,
     validate_complex_dimension_link,
 )
+from datajunction_server.sql.dag import (
+    refresh_dimension_reachability,
+    refresh_node_lineage,
+)
 from datajunction_server.models.deployment import (
     ColumnSpec,
     CubeSpec,
@@ -97,6 +101,7 @@ from datajunction_server.errors import (
     DJInvalidDeploymentConfig,
 )
 from datajunction_server.utils import SEPARATOR, Version, get_namespace_from_name
+from datajunction_server.sql.parsing.types import parse_column_type
 
 from sqlalchemy.orm import joinedload, selectinload, defer
 
@@ -530,6 +535,22 @@ class DeploymentOrchestrator:
             self.deployed_results.extend(delete_results)
             await self._update_deployment_status()
 
+    async def _add_nodes_with_lineage(
+        self,
+        nodes: list[Node],
+        revisions: list[NodeRevision],
+    ):
+        """
+        Add deployed nodes and their new revisions, and recompute the node lineage of
+        the nodes and their downstreams in the same transaction, so that it's never
+        committed without them
+        """
+        self.session.add_all(nodes)
+        self.session.add_all(revisions)
+        await self.session.flush()
+        await refresh_node_lineage(self.session, [node.id for node in nodes])
+        await self.session.commit()
+
     async def _deploy_nodes(
         self,
         plan: DeploymentPlan,
@@ -586,6 +607,8 @@ class DeploymentOrchestrator:
 
         validation_results = await self.validate_dimension_links(plan)
 
+        # Nodes whose dimension links changed, to refresh their dimension reachability
+        linked_node_ids: set[int] = set()
         for node_spec in plan.to_deploy:
             if not isinstance(node_spec, LinkableNodeSpec):
                 continue
@@ -604,18 +627,29 @@ class DeploymentOrchestrator:
                 for (dim, role) in existing_node_links
                 if (dim, role) not in desired_node_links
             }
-            self.deployed_results.extend(
-                await self._bulk_delete_links(to_delete, node_spec),
-            )
+            delete_results = await self._bulk_delete_links(to_delete, node_spec)
+            self.deployed_results.extend(delete_results)
 
             # Create or update links
+            link_results = []
             for link_spec in node_spec.dimension_links or []:
                 link_result = await self._process_node_dimension_link(
                     node_spec=node_spec,
                     link_spec=link_spec,
                     validation_results=validation_results,
                 )
-                deployed_links.append(link_result)
+                link_results.append(link_result)
+            deployed_links.extend(link_results)
+
+            node = self.registry.nodes.get(node_spec.rendered_name)
+            if node and any(
+                result.status == DeploymentResult.Status.SUCCESS
+                for result in delete_results + link_results
+            ):
+                linked_node_ids.add(node.id)
+
+        if linked_node_ids:
+            await refresh_dimension_reachability(self.session, linked_node_ids)
         await self.session.commit()
         logger.info("Finished deploying %d dimension links", len(deployed_links))
         return deployed_links
@@ -791,9 +825,7 @@ class DeploymentOrchestrator:
         )
 
         # Commit all cubes
-        self.session.add_all(nodes)
-        self.session.add_all(revisions)
-        await self.session.commit()
+        await self._add_nodes_with_lineage(nodes, revisions)
 
         # Refresh all deployed cube nodes
         all_nodes = await self.refresh_nodes(
@@ -1397,9 +1429,7 @@ class DeploymentOrchestrator:
             dependency_nodes,
             node_graph,
         )
-        self.session.add_all(nodes)
-        self.session.add_all(revisions)
-        await self.session.commit()
+        await self._add_nodes_with_lineage(nodes, revisions)
 
         # Refresh nodes for latest state
         all_nodes = await self.refresh_nodes(
@@ -1427,11 +1457,7 @@ class DeploymentOrchestrator:
                 for column in dep_node.current.columns:
                     if isinstance(column.type, str):
                         try:
-                            from datajunction_server.sql.parsing.backends.antlr4 import (
-                                parse_rule,
-                            )
-
-                            column.type = parse_rule(column.type, "dataType")
+                            column.type = parse_column_type(column.type)
                         except Exception:  # pragma: no cover
                             pass  # pragma: no cover
         return dependency_nodes
@@ -25,7 +25,10 @@ from datajunction_server.api.helpers import (
     resolve_downstream_references,
     validate_cube,
 )
-from datajunction_server.construction.build_v2 import compile_node_ast
+from datajunction_server.construction.precompiled import (
+    PRECOMPILED_NODE_TYPES,
+    save_precompiled_query_ast,
+)
 from datajunction_server.database.attributetype import AttributeType, ColumnAttribute
 from datajunction_server.database.column import Column
 from datajunction_server.database.catalog import Catalog
@@ -89,13 +92,18 @@ from datajunction_server.models.node_type import NodeType
 from datajunction_server.models.query import QueryCreate
 from datajunction_server.service_clients import QueryServiceClient
 from datajunction_server.sql.dag import (
+    get_dimension_dependents,
     get_downstream_nodes,
     get_nodes_with_dimension,
+    refresh_dimension_reachability,
+    refresh_node_lineage,
+    sync_node_lineage_versions,
     topological_sort,
 )
 from datajunction_server.sql.parsing import ast
 from datajunction_server.sql.parsing.ast import CompileContext
-from datajunction_server.sql.parsing.backends.antlr4 import parse, parse_rule
+from datajunction_server.sql.parsing.backends.antlr4 import parse
+from datajunction_server.sql.parsing.types import parse_column_type
 from datajunction_server.typing import UTCDatetime
 from datajunction_server.utils import (
     SEPARATOR,
@@ -288,6 +296,8 @@ async def create_a_node(
         save_column_level_lineage,
         node_revision_id=node_revision.id,
     )
+    if node.type in PRECOMPILED_NODE_TYPES:
+        background_tasks.add_task(save_query_ast, node_name=node.name)
 
     return await Node.get_by_name(  # type: ignore
         session,
@@ -726,6 +736,8 @@ async def save_node(
         ),
         session=session,
     )
+    await session.flush()
+    await refresh_node_lineage(session, [node.id])
     await session.commit()
     await session.refresh(node, ["current"])
     newly_valid_nodes = await resolve_downstream_references(
@@ -838,6 +850,8 @@ async def copy_to_new_node(
     new_node.current_version = new_revision.version
     session.add(new_revision)
     session.add(new_node)
+    await session.flush()
+    await refresh_node_lineage(session, [new_node.id])
     await session.commit()
     await save_history(
         event=History(
@@ -1003,6 +1017,7 @@ async def update_node_with_query(
             ),
             session=session,
         )
+    await refresh_node_lineage(session, [node.id])  # type: ignore
     await session.commit()
 
     await session.refresh(new_revision)
@@ -1063,14 +1078,10 @@ async def update_node_with_query(
             save_column_level_lineage,
             node_revision_id=new_revision.id,
         )
-        # TODO: Do not save this until:
-        #   1. We get to the bottom of why there are query building discrepancies
-        #   2. We audit our database calls to defer pulling the query_ast in most cases
-        # background_tasks.add_task(
-        #     save_query_ast,
-        #     session=session,
-        #     node_name=new_revision.name,
-        # )
+        background_tasks.add_task(
+            save_query_ast,
+            node_name=new_revision.name,
+        )
 
     history_events = {}
     old_columns_map = {col.name: col.type for col in old_revision.columns}
@@ -1305,6 +1316,7 @@ async def update_cube_node(
             )
     session.add(new_cube_revision)
     session.add(new_cube_revision.node)
+    await refresh_node_lineage(session, [new_cube_revision.node.id])  # type: ignore
     await session.commit()
 
     await session.refresh(new_cube_revision, ["materializations"])
@@ -1395,11 +1407,14 @@ async def _propagate_update_downstream(
             downstream.name,
             node.name,
         )
+        # The downstream's precompiled query AST is saved from the one compiled to
+        # revalidate it against the updated upstreams, so that it stays usable
         node_validator = await revalidate_node(
             downstream.name,
             session,
             current_user=current_user,
             save_history=save_history,
+            precompile=True,
         )
 
         # Reset the upstreams DAG cache of any downstream nodes
@@ -1453,6 +1468,17 @@ async def _propagate_update_downstream(
             )
         await session.commit()
 
+    # Evict cached SQL built from the updated node or any of its downstreams
+    if cache:
+        evicted = cache.delete_by_nodes(
+            [node.name, *(downstream.name for downstream in downstreams)],
+        )
+        _logger.info(
+            "Evicted %s cached values due to update of node %s",
+            evicted,
+            node.name,
+        )
+
 
 def copy_existing_node_revision(old_revision: NodeRevision, current_user: User):
     """
@@ -1850,28 +1876,16 @@ async def save_column_level_lineage(node_revision_id: int):
             await session.commit()
 
 
-async def save_query_ast(  # pragma: no cover
-    session: AsyncSession,
-    node_name: str,
-):
+async def save_query_ast(node_name: str):
     """
-    Compile and save query AST for a node
+    Compile and save the precompiled query AST for a node
     """
-    node = await Node.get_by_name(session, node_name)
-
-    if (
-        node
-        and node.current.query
-        and node.type
-        in {
-            NodeType.TRANSFORM,
-            NodeType.DIMENSION,
-        }
-    ):
-        node.current.query_ast = await compile_node_ast(session, node.current)
-
-    session.add(node.current)  # type: ignore
-    await session.commit()
+    async with session_context() as session:
+        node = await Node.get_by_name(session, node_name)
+        if node and node.current:
+            await save_precompiled_query_ast(session, node.current)
+            session.add(node.current)
+            await session.commit()
 
 
 async def get_column_level_lineage(
@@ -2198,6 +2212,7 @@ async def upsert_complex_dimension_link(
         ),
         session=session,
     )
+    await refresh_dimension_reachability(session, [node.id])  # type: ignore
     await session.commit()
     await session.refresh(node)
     return activity_type
@@ -2358,6 +2373,7 @@ async def remove_dimension_link(
         ),
         session=session,
     )
+    await refresh_dimension_reachability(session, [node.id])  # type: ignore
     await session.commit()
     await session.refresh(new_revision)  # type: ignore
     await session.refresh(node)
@@ -2437,6 +2453,7 @@ async def upsert_reference_dimension_link(
         ),
         session=session,
     )
+    await refresh_dimension_reachability(session, [node.id])  # type: ignore
     await session.commit()
 
 
@@ -2454,6 +2471,7 @@ async def create_new_revision_for_dimension_link_update(
     new_revision.node = node
 
     session.add(new_revision)
+    await sync_node_lineage_versions(session, [node.id])
     await session.commit()
     await session.refresh(new_revision)
     await session.refresh(new_revision, ["dimension_links"])
@@ -2574,6 +2592,7 @@ async def deactivate_node(
         ),
         session=session,
     )
+    await refresh_dimension_reachability(session, [node.id])  # type: ignore
     await session.commit()
     await session.refresh(node, ["current"])
 
@@ -2644,6 +2663,7 @@ async def activate_node(
         ),
         session=session,
     )
+    await refresh_dimension_reachability(session, [node.id])
     await session.commit()
 
 
@@ -2654,9 +2674,12 @@ async def revalidate_node(
     save_history: Callable,
     update_query_ast: bool = False,
     background_tasks: BackgroundTasks = None,
+    precompile: bool = False,
 ) -> NodeValidator:
     """
-    Revalidate a single existing node and update its status appropriately
+    Revalidate a single existing node and update its status appropriately. With
+    `precompile`, the node's precompiled query AST is saved from the one compiled to
+    revalidate it.
     """
     node = await Node.get_by_name(
         session,
@@ -2722,13 +2745,16 @@ async def revalidate_node(
         )
 
     # Revalidate all other node types
-    node_validator = await validate_node_data(current_node_revision, session)
+    node_validator = await validate_node_data(
+        current_node_revision,
+        session,
+        precompile=precompile,
+    )
 
     # Compile and save query AST
     if update_query_ast and background_tasks:
         background_tasks.add_task(  # pragma: no cover
             save_query_ast,
-            session=session,
             node_name=node.name,  # type: ignore
         )
 
@@ -2779,12 +2805,36 @@ async def revalidate_node(
         new_revision.node_id = node.id  # type: ignore
         session.add(node)
         session.add(new_revision)
+        await sync_node_lineage_versions(session, [node.id])  # type: ignore
+    if precompile and current_node_revision.type in PRECOMPILED_NODE_TYPES:
+        await _save_revalidated_query_ast(
+            session,
+            new_revision if updated_columns else node.current,  # type: ignore
+            node_validator,
+        )
     await session.commit()
     await session.refresh(node.current)  # type: ignore
     await session.refresh(node, ["current"])
     return node_validator
 
 
+async def _save_revalidated_query_ast(
+    session: AsyncSession,
+    node_revision: NodeRevision,
+    node_validator: NodeValidator,
+):
+    """
+    Save the query AST compiled to revalidate the node as its precompiled query AST,
+    only compiling it again when validation couldn't provide it
+    """
+    if precompiled := node_validator.precompiled_query_ast:
+        # The revision may have been bumped after validation
+        precompiled.node_version = node_revision.version
+        node_revision.query_ast = precompiled
+    else:
+        await save_precompiled_query_ast(session, node_revision)
+
+
 async def hard_delete_node(
     name: str,
     session: AsyncSession,
@@ -2811,7 +2861,21 @@ async def hard_delete_node(
             dimension_node=node,  # type: ignore
         )
 
+    # Nodes whose dimensions graphs reach this node need their paths recomputed
+    dimension_dependents = await get_dimension_dependents(session, [node.id])  # type: ignore
     await session.delete(node)
+    await refresh_dimension_reachability(
+        session,
+        dimension_dependents,
+        include_dependents=False,
+    )
+    # The deleted node's lineage rows are removed with it, but its downstream nodes
+    # need theirs recomputed
+    await refresh_node_lineage(
+        session,
+        [downstream.id for downstream in downstream_nodes],
+        include_descendants=False,
+    )
     await session.commit()
     impact = []  # Aggregate all impact of this deletion to include in response
 
@@ -2942,8 +3006,7 @@ async def refresh_source(
     if new_columns:
         # check if any of the columns have changed (only continue with update if they have)
         column_changes = {col.identifier() for col in current_revision.columns} != {
-            (col.name, str(parse_rule(str(col.type), "dataType")))
-            for col in new_columns
+            (col.name, str(parse_column_type(str(col.type)))) for col in new_columns
         }
 
         # if the columns haven't changed and the node has a table, we can skip the update
@@ -3022,6 +3085,7 @@ async def refresh_source(
         ),
         session=session,
     )
+    await sync_node_lineage_versions(session, [source_node.id])  # type: ignore
     await session.commit()
 
     source_node = await Node.get_by_name(
@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from typing import Any, Tuple, OrderedDict, cast
 import re
 
@@ -45,7 +46,12 @@ from datajunction_server.models.sql import GeneratedSQL
 from datajunction_server.naming import LOOKUP_CHARS, from_amenable_name
 from datajunction_server.sql.parsing import ast
 from datajunction_server.sql.parsing.ast import CompileContext
-from datajunction_server.utils import SEPARATOR, refresh_if_needed
+from datajunction_server.utils import (
+    SEPARATOR,
+    gather_in_sessions,
+    get_settings,
+    refresh_if_needed,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -379,9 +385,23 @@ async def get_measures_query(
 
     dimensions_without_roles = [matcher.findall(dim)[0][0] for dim in dimensions]
 
-    measures_queries = []
-    context = CompileContext(session=session, exception=DJException())
-    for parent_node, children in common_parents.items():  # type: ignore
+    async def build_measures_query(
+        session: AsyncSession,
+        parent_name: str,
+        metric_names: list[str],
+    ) -> GeneratedSQL:
+        """
+        Builds the measures query for the metrics on one parent node, loading the
+        nodes in the given session
+        """
+        parent_node = cast(
+            Node,
+            await Node.get_by_name(session, parent_name, raise_if_not_exists=True),
+        )
+        children = [
+            cast(NodeRevision, metric.current)
+            for metric in await Node.get_by_names(session, metric_names)
+        ]
         children = sorted(children, key=lambda x: metrics_sorting_order.get(x.name, 0))
 
         # Determine whether to pre-aggregate to the requested dimensions so that subsequent
@@ -444,9 +464,11 @@ async def get_measures_query(
             else:
                 measure_columns.append(expr)
                 expr.set_semantic_type(SemanticType.MEASURE)  # type: ignore
-        await parent_ast.compile(context)
-        dependencies, _ = await parent_ast.extract_dependencies(
-            CompileContext(session, DJException()),
+        ctx = CompileContext(session=session, exception=DJException())
+        await parent_ast.compile(ctx)
+        # The query is compiled, so its tables already point to their nodes
+        dependencies = dict.fromkeys(
+            table.dj_node for table in parent_ast.find_all(ast.Table) if table.dj_node
         )
 
         final_query = (
@@ -469,36 +491,47 @@ async def get_measures_query(
             )
             for col in final_query.select.projection
         ]
-        measures_queries.append(
-            GeneratedSQL.create(
-                node=parent_node.current,
-                sql=str(final_query),
-                columns=columns_metadata,
-                dialect=build_criteria.dialect,
-                upstream_tables=[
-                    f"{dep.catalog.name}.{dep.schema_}.{dep.table}"
-                    for dep in dependencies
-                    if dep.type == NodeType.SOURCE
-                ],
-                grain=(
-                    [
-                        col.name
-                        for col in columns_metadata
-                        if col.semantic_type == SemanticType.DIMENSION
-                    ]
-                    if preaggregate
-                    else [pk_col.name for pk_col in parent_node.current.primary_key()]
-                ),
-                errors=query_builder.errors,
-                metrics={
-                    metric.name: (
-                        metric_components[metric.name][0],
-                        str(metric_components[metric.name][1]).replace("\n", "")
-                        if preaggregate
-                        else metric.query,
-                    )
-                    for metric in children
-                },
+        return GeneratedSQL.create(
+            node=parent_node.current,
+            sql=str(final_query),
+            columns=columns_metadata,
+            dialect=build_criteria.dialect,
+            upstream_tables=[
+                f"{dep.catalog.name}.{dep.schema_}.{dep.table}"
+                for dep in dependencies
+                if dep.type == NodeType.SOURCE
+            ],
+            grain=(
+                [
+                    col.name
+                    for col in columns_metadata
+                    if col.semantic_type == SemanticType.DIMENSION
+                ]
+                if preaggregate
+                else [pk_col.name for pk_col in parent_node.current.primary_key()]
             ),
+            errors=query_builder.errors,
+            metrics={
+                metric.name: (
+                    metric_components[metric.name][0],
+                    str(metric_components[metric.name][1]).replace("\n", "")
+                    if preaggregate
+                    else metric.query,
+                )
+                for metric in children
+            },
         )
-    return measures_queries
+
+    # The measures queries for each parent are built concurrently in their own sessions
+    return await gather_in_sessions(
+        session,
+        [
+            partial(
+                build_measures_query,
+                parent_name=parent_node.name,
+                metric_names=[metric.name for metric in children],
+            )
+            for parent_node, children in common_parents.items()
+        ],
+        concurrency=get_settings().effective_reader_concurrency,
+    )
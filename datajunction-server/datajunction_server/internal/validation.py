@@ -1,12 +1,23 @@
 """Node validation functions."""
 
+import logging
+import pickle
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Union
+from itertools import chain
+from typing import Dict, List, Optional, Set, Union
 
+from sqlalchemy import select
 from sqlalchemy.exc import MissingGreenlet
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.operators import is_
 
 from datajunction_server.api.helpers import find_bound_dimensions
+from datajunction_server.construction.precompiled import (
+    PRECOMPILED_NODE_TYPES,
+    PrecompiledQueryAST,
+    dump_query_ast,
+)
 from datajunction_server.database import Node, NodeRevision
 from datajunction_server.database.column import Column, ColumnAttribute
 from datajunction_server.errors import (
@@ -21,6 +32,9 @@ from datajunction_server.models.node_type import NodeType
 from datajunction_server.sql.parsing import ast
 from datajunction_server.sql.parsing.backends.antlr4 import SqlSyntaxError, parse
 from datajunction_server.sql.parsing.backends.exceptions import DJParseException
+from datajunction_server.utils import SEPARATOR
+
+_logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -37,6 +51,9 @@ class NodeValidator:
     type_inference_failures: List[str] = field(default_factory=list)
     errors: List[DJError] = field(default_factory=list)
     updated_columns: List[str] = field(default_factory=list)
+    # The query AST compiled during validation, if it was requested and can be used
+    # as the node's precompiled query AST
+    precompiled_query_ast: Optional[PrecompiledQueryAST] = None
 
     def modified_columns(self, node_revision: NodeRevision) -> Set[str]:
         """
@@ -55,27 +72,79 @@ class NodeValidator:
         return updated_columns
 
 
+def referenced_node_names(query_ast: ast.Query) -> Set[str]:
+    """
+    Names of the nodes a query may reference, either as tables or as the node
+    part of a dimension attribute like `default.dim.attribute`
+    """
+    node_names = {
+        table.identifier(quotes=False) for table in query_ast.find_all(ast.Table)
+    }
+    for col in query_ast.find_all(ast.Column):
+        namespace = col.identifier(quotes=False).rsplit(SEPARATOR, 1)[0]
+        if SEPARATOR in namespace:
+            node_names.add(namespace)
+    return node_names
+
+
+async def create_compile_context_with_bulk_deps(
+    session: AsyncSession,
+    node_names: Set[str],
+) -> ast.CompileContext:
+    """
+    Create a compile context with the given nodes, and every dimension node reachable
+    from them through dimension links, already loaded. The dimension graph is loaded
+    one level at a time with a single batched query per level, so compiling against
+    this context never goes back to the database for these nodes.
+    """
+    ctx = ast.CompileContext(session=session, exception=DJException())
+    to_load = set(node_names)
+    while to_load:
+        statement = (
+            select(Node)
+            .where(Node.name.in_(to_load))
+            .where(is_(Node.deactivated_at, None))
+            .options(
+                joinedload(Node.current).options(
+                    *NodeRevision.default_load_options(),
+                ),
+            )
+            # Equivalent to the refreshes the compile step would otherwise issue
+            .execution_options(populate_existing=True)
+        )
+        nodes = (await session.execute(statement)).unique().scalars().all()
+        ctx.preloaded.update(to_load)
+        ctx.dependencies_cache.update({node.name: node for node in nodes})
+        to_load = {
+            dimension.name
+            for node in nodes
+            if node.current
+            for dimension in chain(
+                (link.dimension for link in node.current.dimension_links),
+                (col.dimension for col in node.current.columns),
+            )
+            if dimension and dimension.name not in ctx.preloaded
+        }
+    return ctx
+
+
 async def validate_node_data(
     data: Union[NodeRevisionBase, NodeRevision],
     session: AsyncSession,
+    precompile: bool = False,
 ) -> NodeValidator:
     """
     Validate a node. This function should never raise any errors.
     It will build the lists of issues (including errors) and return them all
     for the caller to decide what to do.
+
+    With `precompile`, the query AST compiled to validate the node is also kept on
+    the validator as the node's precompiled query AST, when it compiled cleanly.
     """
     node_validator = NodeValidator()
 
-    # Create context without bulk loading for new nodes
-    ctx = ast.CompileContext(session=session, exception=DJException())
-
     if isinstance(data, NodeRevision):
         validated_node = data
-        # await session.refresh(data, ["parents"])
-        # ctx = await create_compile_context_with_bulk_deps(
-        #     session=session,
-        #     node_names={parent.name for parent in data.parents},
-        # )
     else:
         node = Node(name=data.name, type=data.type)
         validated_node = NodeRevision(**data.model_dump())
@@ -92,6 +161,16 @@ async def validate_node_data(
             else validated_node.query
         )
         query_ast = parse(formatted_query)  # type: ignore
+        # Baking CTEs changes the query AST from the one that's precompiled
+        precompile = (
+            precompile
+            and validated_node.type in PRECOMPILED_NODE_TYPES
+            and not query_ast.ctes
+        )
+        ctx = await create_compile_context_with_bulk_deps(
+            session=session,
+            node_names=referenced_node_names(query_ast),
+        )
         (
             dependencies_map,
             missing_parents_map,
@@ -105,6 +184,19 @@ async def validate_node_data(
         )
         return node_validator
 
+    if precompile and not ctx.exception.errors:
+        try:
+            node_validator.precompiled_query_ast = dump_query_ast(
+                validated_node,
+                query_ast,
+            )
+        except pickle.PicklingError as exc:  # pragma: no cover
+            _logger.warning(
+                "Not precompiling the query AST for %s: %s",
+                validated_node.name,
+                exc,
+            )
+
     # Add aliases for any unnamed columns and confirm that all column types can be inferred
     query_ast.select.add_aliases_to_unnamed_columns()
 
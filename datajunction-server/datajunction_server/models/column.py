@@ -9,7 +9,7 @@ from sqlalchemy import TypeDecorator
 from sqlalchemy.types import Text
 
 from datajunction_server.enum import StrEnum
-from datajunction_server.sql.parsing.types import ColumnType
+from datajunction_server.sql.parsing.types import ColumnType, parse_column_type
 
 
 class ColumnYAML(TypedDict, total=False):
@@ -34,12 +34,10 @@ class ColumnTypeDecorator(TypeDecorator):
         return str(value)
 
     def process_result_value(self, value, dialect):
-        from datajunction_server.sql.parsing.backends.antlr4 import parse_rule
-
         if not value:
             return value
         try:
-            return parse_rule(value, "dataType")
+            return parse_column_type(value)
         except Exception:  # pragma: no cover
             return value  # pragma: no cover
 
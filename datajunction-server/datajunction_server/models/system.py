@@ -19,3 +19,18 @@ class DimensionStats(BaseModel):
     name: str
     indegree: int = 0
     cube_count: int
+
+
+class CacheStats(BaseModel):
+    """
+    Output model for in-process cache statistics.
+    """
+
+    name: str
+    hits: int
+    misses: int
+    stale: int | None = None
+    hit_rate: float
+    evictions: int | None = None
+    maxsize: int | None = None
+    currsize: int | None = None
@@ -2,13 +2,14 @@
 
 import logging
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
 from urllib.parse import urljoin
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3 import Retry
 
+from datajunction_server.constants import ARROW_STREAM
 from datajunction_server.database.column import Column
 from datajunction_server.errors import (
     DJDoesNotExistException,
@@ -211,6 +212,41 @@ class QueryServiceClient:
         query_info = response.json()
         return QueryWithResults(**query_info)
 
+    def submit_query_arrow(
+        self,
+        query_create: QueryCreate,
+        request_headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[Iterator[bytes]]:
+        """
+        Submit a query to the query service, returning its results as the raw bytes of
+        an Arrow IPC stream, which aren't decoded so that they can be proxied as is.
+        Returns None if the query service can't return Arrow results.
+        """
+        response = self.requests_session.post(
+            "/queries/",
+            headers={
+                **self.requests_session.headers,
+                **QueryServiceClient.filtered_headers(request_headers or {}),
+                "accept": ARROW_STREAM,
+            },
+            json=query_create.model_dump(),
+            stream=True,
+        )
+        if response.status_code == HTTPStatus.NOT_ACCEPTABLE:
+            response.close()
+            return None
+        if response.status_code not in (200, 201):
+            response_data = response.json()
+            raise DJQueryServiceClientException(
+                message=f"Error response from query service: {response_data}",
+                errors=[
+                    DJError(code=ErrorCode.QUERY_SERVICE_ERROR, message=error)
+                    for error in response_data.get("errors", [])
+                ],
+                http_status_code=response.status_code,
+            )
+        return response.iter_content(chunk_size=None)
+
     def get_query(
         self,
         query_id: str,
@@ -5,9 +5,32 @@ DAG related functions.
 import asyncio
 import itertools
 import logging
-from typing import Dict, List, Optional, Set, Tuple, Union, cast
+from functools import partial
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Union,
+    cast,
+)
 
-from sqlalchemy import and_, func, join, literal, or_, select, distinct
+from sqlalchemy import (
+    BigInteger,
+    and_,
+    delete,
+    distinct,
+    func,
+    insert,
+    join,
+    literal,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased, contains_eager, joinedload, selectinload
 from sqlalchemy.sql.operators import is_
@@ -16,17 +39,25 @@ from sqlalchemy.dialects.postgresql import array
 from datajunction_server.database.attributetype import AttributeType, ColumnAttribute
 from datajunction_server.database.column import Column
 from datajunction_server.database.dimensionlink import DimensionLink
+from datajunction_server.database.dimensionreachability import DimensionReachability
 from datajunction_server.database.node import (
     CubeRelationship,
     Node,
     NodeRelationship,
     NodeRevision,
 )
+from datajunction_server.database.nodelineage import NodeLineage
 from datajunction_server.errors import DJDoesNotExistException, DJGraphCycleException
 from datajunction_server.models.attribute import ColumnAttributes
 from datajunction_server.models.node import DimensionAttributeOutput
 from datajunction_server.models.node_type import NodeType
-from datajunction_server.utils import SEPARATOR, get_settings, refresh_if_needed
+from datajunction_server.utils import (
+    SEPARATOR,
+    gather_in_sessions,
+    get_settings,
+    refresh_if_needed,
+    session_context,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -68,7 +99,8 @@ async def get_downstream_nodes(
 ) -> List[Node]:
     """
     Gets all downstream children of the given node, filterable by node type.
-    Uses a recursive CTE query to build out all descendants from the node.
+    Reads them from the node lineage table when it is up to date, and otherwise uses
+    a recursive CTE query to build out all descendants from the node.
     """
     node = await Node.get_by_name(
         session,
@@ -77,6 +109,17 @@ async def get_downstream_nodes(
     )
     if not node:
         return []
+    materialized = await get_materialized_downstream_nodes(
+        session,
+        node,
+        node_type,
+        include_deactivated,
+        include_cubes,
+        depth,
+    )
+    if materialized is not None:
+        return materialized
+
     initial_dag = (
         select(
             NodeRelationship.parent_id,
@@ -180,29 +223,29 @@ async def get_downstream_nodes_bfs(
 ) -> list[Node]:
     """
     Get all downstream nodes of a given node using BFS, which is more efficient for large graphs.
-    Each level is processed concurrently, with a limit on the number of concurrent tasks
-    configured by `max_concurrency`.
+    Each level is loaded with one query for the level's nodes and one for their children.
+    The children of levels larger than `bfs_chunk_size` are fetched in chunks, concurrently
+    in separate sessions, with at most `max_concurrency` chunks at a time (or one at a time
+    in `session` when it has uncommitted changes).
     """
-    visited = set()
+    visited: Set[int] = set()
     results = []
-    current_level: list[Tuple[int, int]] = [(start_node.id, 0)]
+    current_ids = [start_node.id]
+    depth = 0
 
-    while current_level:
-        depth = current_level[0][1]
+    while current_ids:
         logger.info("Processing downstreams for %s at depth %s", start_node.name, depth)
 
-        current_ids = list(set([nid for nid, _ in current_level if nid not in visited]))
+        current_ids = [nid for nid in dict.fromkeys(current_ids) if nid not in visited]
         if not current_ids:
             break  # pragma: no cover
         visited.update(current_ids)
 
-        # Process nodes at this level concurrently
-        nodes_at_level = await _bfs_process_level_concurrently(
+        nodes_at_level = await _bfs_load_level(
             session,
             current_ids,
             include_deactivated,
             include_cubes,
-            node_type,
         )
         results.extend(
             [
@@ -217,90 +260,91 @@ async def get_downstream_nodes_bfs(
             return results[: settings.node_list_max]
 
         # Stop BFS if max depth reached
-        if max_depth != -1 and current_level[0][1] >= max_depth:
+        if max_depth != -1 and depth >= max_depth:
             break
 
         # Fetch children for next level
-        next_level = []
-        for node in nodes_at_level:
-            children_rows = await session.execute(
-                select(distinct(Node.id))
-                .select_from(NodeRelationship)
-                .join(NodeRevision, NodeRelationship.child_id == NodeRevision.id)
-                .join(Node, Node.id == NodeRevision.node_id)
-                .where(NodeRelationship.parent_id == node.id)
-                .where(
-                    Node.deactivated_at.is_(None) if not include_deactivated else True,
-                ),
+        children = await _bfs_fetch_children(
+            session,
+            [node.id for node in nodes_at_level],
+            include_deactivated,
+        )
+        current_ids = [child for child in children if child not in visited]
+        if current_ids:
+            logger.info(
+                "Processing downstreams for %s: extending from depth %s with %d children",
+                start_node.name,
+                depth,
+                len(current_ids),
             )
-            children = [
-                (c[0], depth + 1)
-                for c in children_rows.fetchall()
-                if c[0] not in visited
-            ]
-            if children:
-                logger.info(
-                    "Processing downstreams for %s: extending from %s with %d children",
-                    start_node.name,
-                    node.name,
-                    len(children),
-                )
-                next_level.extend(children)
-
-        current_level = next_level
+        depth += 1
 
     return results
 
 
-async def _bfs_process_level_concurrently(
+async def _bfs_load_level(
     session: AsyncSession,
     node_ids: list[int],
     include_deactivated: bool = True,
     include_cubes: bool = True,
-    node_type: NodeType = None,
-):
+) -> list[Node]:
     """
-    Process all nodes at a BFS level concurrently with a concurrency limit.
+    Load all nodes at a BFS level with a single query, in the order of `node_ids`.
     """
+    statement = (
+        select(Node).where(Node.id.in_(node_ids)).options(*_node_output_options())
+    )
+    if not include_deactivated:
+        statement = statement.where(is_(Node.deactivated_at, None))
+    if not include_cubes:
+        statement = statement.where(Node.type != NodeType.CUBE)
+    nodes = {
+        node.id: node
+        for node in (await session.execute(statement)).unique().scalars().all()
+    }
+    return [nodes[node_id] for node_id in node_ids if node_id in nodes]
+
+
+async def _bfs_fetch_children(
+    session: AsyncSession,
+    parent_ids: list[int],
+    include_deactivated: bool = True,
+) -> list[int]:
+    """
+    Fetch the ids of the children of all nodes at a BFS level. Levels larger than
+    `bfs_chunk_size` are split into chunks that are fetched concurrently, each in its
+    own session, unless `session` has uncommitted changes that the other sessions
+    wouldn't see, in which case the chunks are fetched one at a time in `session`.
+    """
+
+    async def fetch(chunk: list[int], chunk_session: AsyncSession) -> list[int]:
+        statement = (
+            select(distinct(Node.id))
+            .select_from(NodeRelationship)
+            .join(NodeRevision, NodeRelationship.child_id == NodeRevision.id)
+            .join(Node, Node.id == NodeRevision.node_id)
+            .where(NodeRelationship.parent_id.in_(chunk))
+            .order_by(Node.id)
+        )
+        if not include_deactivated:
+            statement = statement.where(is_(Node.deactivated_at, None))
+        return list((await chunk_session.execute(statement)).scalars().all())
+
+    chunk_size = settings.bfs_chunk_size
+    chunks = [
+        parent_ids[idx : idx + chunk_size]
+        for idx in range(0, len(parent_ids), chunk_size)
+    ]
     effective_concurrency = min(
         settings.max_concurrency,
         max(1, settings.reader_db.pool_size // 2),
     )
-    semaphore = asyncio.Semaphore(effective_concurrency)
-
-    async def _bfs_process_node(
-        session: AsyncSession,
-        node_id: int,
-        include_deactivated: bool = True,
-        include_cubes: bool = True,
-        node_type: NodeType = None,
-    ):
-        node = await Node.get_by_id(
-            session,
-            node_id,
-            options=_node_output_options(),
-        )
-        if not node:
-            return None  # pragma: no cover
-        if not include_deactivated and node.deactivated_at is not None:
-            return None  # pragma: no cover
-        if not include_cubes and node.type == NodeType.CUBE:
-            return None
-        return node
-
-    async def sem_task(node_id):
-        async with semaphore:
-            return await _bfs_process_node(
-                session,
-                node_id,
-                include_deactivated,
-                include_cubes,
-                node_type,
-            )
-
-    tasks = [sem_task(node_id) for node_id in node_ids]
-    processed = await asyncio.gather(*tasks)
-    return [node for node in processed if node is not None]
+    children = await gather_in_sessions(
+        session,
+        [partial(fetch, chunk) for chunk in chunks],
+        effective_concurrency,
+    )
+    return list(dict.fromkeys(itertools.chain.from_iterable(children)))
 
 
 async def get_upstream_nodes(
@@ -311,7 +355,8 @@ async def get_upstream_nodes(
 ) -> List[Node]:
     """
     Gets all upstreams of the given node, filterable by node type.
-    Uses a recursive CTE query to build out all parents of the node.
+    Reads them from the node lineage table when it is up to date, and otherwise uses
+    a recursive CTE query to build out all parents of the node.
     """
     node = (
         (
@@ -330,6 +375,14 @@ async def get_upstream_nodes(
         raise DJDoesNotExistException(  # pragma: no cover
             message=f"Node with name {node_name} does not exist",
         )
+    materialized = await get_materialized_upstream_nodes(
+        session,
+        node,
+        node_type,
+        include_deactivated,
+    )
+    if materialized is not None:
+        return materialized
 
     dag = (
         (
@@ -388,6 +441,338 @@ async def get_upstream_nodes(
     ]
 
 
+NODE_LINEAGE_MAX_DEPTH = 1000
+# The namespace of the advisory locks taken while refreshing node lineage
+NODE_LINEAGE_LOCK = 0x4C4E
+
+
+def _node_lineage_closure(node_ids: Iterable[int]):
+    """
+    Builds a query for the node lineage rows of the given nodes as descendants, i.e.,
+    one row per ancestor of each node's current revision with the length of the longest
+    path to it, including a row pairing each node with itself.
+    """
+    # UNION rather than UNION ALL, so that paths are deduplicated per depth, and the
+    # depth is bounded so that the recursion terminates even if the graph has cycles
+    lineage = (
+        select(
+            Node.id.label("descendant_id"),
+            Node.id.label("ancestor_id"),
+            literal(0).label("depth"),
+        )
+        .where(Node.id.in_(node_ids))
+        .cte("lineage", recursive=True)
+    )
+    lineage = lineage.union(
+        select(
+            lineage.c.descendant_id,
+            NodeRelationship.parent_id,
+            (lineage.c.depth + literal(1)).label("depth"),
+        )
+        .select_from(lineage)
+        .join(Node, Node.id == lineage.c.ancestor_id)
+        .join(
+            NodeRevision,
+            and_(
+                NodeRevision.node_id == Node.id,
+                NodeRevision.version == Node.current_version,
+            ),
+        )
+        .join(NodeRelationship, NodeRelationship.child_id == NodeRevision.id)
+        .where(lineage.c.depth < NODE_LINEAGE_MAX_DEPTH),
+    )
+    closure = (
+        select(
+            lineage.c.ancestor_id,
+            lineage.c.descendant_id,
+            func.max(lineage.c.depth).label("depth"),
+        )
+        .group_by(lineage.c.ancestor_id, lineage.c.descendant_id)
+        .subquery("closure")
+    )
+    ancestor = aliased(Node, name="ancestor")
+    descendant = aliased(Node, name="descendant")
+    return (
+        select(
+            closure.c.ancestor_id,
+            closure.c.descendant_id,
+            closure.c.depth,
+            ancestor.current_version,
+            descendant.current_version,
+        )
+        .join(ancestor, ancestor.id == closure.c.ancestor_id)
+        .join(descendant, descendant.id == closure.c.descendant_id)
+    )
+
+
+async def get_descendant_ids(
+    session: AsyncSession,
+    node_ids: Iterable[int],
+) -> Set[int]:
+    """
+    Finds the ids of all nodes downstream of the given nodes, through the parents of
+    their current revisions.
+    """
+    node_ids = list(node_ids)
+    if not node_ids:
+        return set()
+    # UNION rather than UNION ALL, so that cycles in the graph terminate the recursion
+    descendants = (
+        select(Node.id.label("node_id"))
+        .where(Node.id.in_(node_ids))
+        .cte("descendants", recursive=True)
+    )
+    descendants = descendants.union(
+        select(NodeRevision.node_id)
+        .select_from(descendants)
+        .join(NodeRelationship, NodeRelationship.parent_id == descendants.c.node_id)
+        .join(NodeRevision, NodeRevision.id == NodeRelationship.child_id)
+        .join(
+            Node,
+            and_(
+                Node.id == NodeRevision.node_id,
+                Node.current_version == NodeRevision.version,
+            ),
+        ),
+    )
+    return set(
+        (await session.execute(select(descendants.c.node_id))).scalars(),
+    ) - set(node_ids)
+
+
+async def refresh_node_lineage(
+    session: AsyncSession,
+    node_ids: Iterable[int],
+    include_descendants: bool = True,
+    wait: bool = True,
+):
+    """
+    Recomputes the node lineage rows of the given nodes and, unless `include_descendants`
+    is False, of all of their downstream nodes, whose ancestors change with theirs. This
+    should be called whenever the parents of these nodes change. The caller commits the
+    session.
+
+    Without `wait`, nothing is refreshed if another transaction is refreshing any of the
+    same nodes.
+    """
+    node_ids = set(node_ids)
+    if include_descendants:
+        node_ids |= await get_descendant_ids(session, node_ids)
+    if not node_ids:
+        return
+    if not await _lock_nodes(session, NODE_LINEAGE_LOCK, node_ids, wait=wait):
+        return
+    await session.execute(
+        delete(NodeLineage).where(NodeLineage.descendant_id.in_(node_ids)),
+    )
+    await session.execute(
+        insert(NodeLineage).from_select(
+            [
+                "ancestor_id",
+                "descendant_id",
+                "depth",
+                "ancestor_version",
+                "descendant_version",
+            ],
+            _node_lineage_closure(sorted(node_ids)),
+        ),
+    )
+
+
+async def sync_node_lineage_versions(
+    session: AsyncSession,
+    node_ids: Iterable[int],
+):
+    """
+    Records the current versions of the given nodes on their node lineage rows. This
+    should be called instead of `refresh_node_lineage` when nodes get new revisions
+    with the same parents as their previous revisions. The caller commits the session.
+    """
+    node_ids = list(node_ids)
+    for id_column, version_column in (
+        (NodeLineage.ancestor_id, "ancestor_version"),
+        (NodeLineage.descendant_id, "descendant_version"),
+    ):
+        await session.execute(
+            update(NodeLineage)
+            .where(id_column == Node.id, Node.id.in_(node_ids))
+            .values({version_column: Node.current_version})
+            .execution_options(synchronize_session=False),
+        )
+
+
+# Refreshes of materialized lineage found to be stale on read, by what they refresh
+# and the node id. They run in the background so that reads don't wait on them.
+_background_refreshes: dict[tuple[str, int], asyncio.Task] = {}
+
+
+def _refresh_in_background(
+    kind: str,
+    node_id: int,
+    refresh: Callable[[], Awaitable[None]],
+) -> None:
+    """
+    Schedules a refresh of a node's materialized lineage, unless the same refresh is
+    already running.
+    """
+    key = (kind, node_id)
+    if key in _background_refreshes:
+        return
+    task = asyncio.create_task(refresh())
+    _background_refreshes[key] = task
+    task.add_done_callback(lambda _: _background_refreshes.pop(key, None))
+
+
+async def _refresh_stale_node_lineage(node_id: int, node_name: str):
+    """
+    Refreshes the node lineage of a node whose rows were found to be missing or stale
+    on read, in a separate writer session.
+    """
+    try:
+        async with session_context() as writer_session:
+            await refresh_node_lineage(writer_session, [node_id], wait=False)
+            await writer_session.commit()
+    except Exception:  # pragma: no cover
+        logger.warning(
+            "Failed to refresh the node lineage of %s",
+            node_name,
+            exc_info=True,
+        )
+
+
+async def _has_unrefreshed_children(session: AsyncSession, node: Node) -> bool:
+    """
+    Whether any node in the node's materialized downstreams, or the node itself, has a
+    child that's missing from them, i.e., a child whose lineage was never computed.
+    Versions don't reveal these, since adding a child doesn't change its parents.
+    """
+    downstreams = select(NodeLineage.descendant_id).where(
+        NodeLineage.ancestor_id == node.id,
+    )
+    statement = (
+        select(NodeRevision.node_id)
+        .join(
+            Node,
+            and_(
+                Node.id == NodeRevision.node_id,
+                Node.current_version == NodeRevision.version,
+            ),
+        )
+        .join(NodeRelationship, NodeRelationship.child_id == NodeRevision.id)
+        .where(
+            NodeRelationship.parent_id.in_(downstreams),
+            NodeRevision.node_id.not_in(downstreams),
+        )
+        .limit(1)
+    )
+    return (await session.execute(statement)).first() is not None
+
+
+async def get_materialized_downstream_nodes(
+    session: AsyncSession,
+    node: Node,
+    node_type: NodeType = None,
+    include_deactivated: bool = True,
+    include_cubes: bool = True,
+    depth: int = -1,
+) -> Optional[List[Node]]:
+    """
+    Reads the downstream nodes of the node from the node lineage table, ordered and
+    filtered by depth like `get_downstream_nodes`. Returns None if the node's lineage
+    has not been materialized or has gone stale, in which case it is recomputed in the
+    background so that later reads can use it.
+    """
+    statement = (
+        select(
+            NodeLineage.descendant_id,
+            NodeLineage.descendant_version,
+            Node.current_version,
+            Node.deactivated_at,
+        )
+        .join(Node, Node.id == NodeLineage.descendant_id)
+        .where(NodeLineage.ancestor_id == node.id)
+    )
+    rows = (await session.execute(statement)).all()
+    if (
+        all(row.descendant_id != node.id for row in rows)
+        or any(row.descendant_version != row.current_version for row in rows)
+        or await _has_unrefreshed_children(session, node)
+    ):
+        _refresh_in_background(
+            "node_lineage",
+            node.id,
+            partial(_refresh_stale_node_lineage, node.id, node.name),
+        )
+        return None
+
+    # Nodes downstream of deactivated nodes are excluded from the traversal when
+    # deactivated nodes are, which the closure doesn't capture
+    if not include_deactivated and any(
+        row.deactivated_at is not None for row in rows if row.descendant_id != node.id
+    ):
+        return None
+
+    statement = (
+        select(Node)
+        .join(NodeLineage, NodeLineage.descendant_id == Node.id)
+        .where(NodeLineage.ancestor_id == node.id, NodeLineage.depth > 0)
+    )
+    if depth > -1:
+        statement = statement.where(NodeLineage.depth <= depth)
+    if not include_cubes:
+        statement = statement.where(Node.type != NodeType.CUBE)
+    if node_type:
+        statement = statement.where(Node.type == node_type)
+    statement = statement.order_by(NodeLineage.depth, Node.id).options(
+        *_node_output_options(),
+    )
+    return list((await session.execute(statement)).unique().scalars().all())
+
+
+async def get_materialized_upstream_nodes(
+    session: AsyncSession,
+    node: Node,
+    node_type: NodeType = None,
+    include_deactivated: bool = True,
+) -> Optional[List[Node]]:
+    """
+    Reads the upstream nodes of the node from the node lineage table. Returns None if
+    the node's lineage has not been materialized or has gone stale, in which case it is
+    recomputed in the background so that later reads can use it.
+    """
+    statement = (
+        select(
+            NodeLineage.ancestor_id,
+            NodeLineage.ancestor_version,
+            Node.current_version,
+        )
+        .join(Node, Node.id == NodeLineage.ancestor_id)
+        .where(NodeLineage.descendant_id == node.id)
+    )
+    rows = (await session.execute(statement)).all()
+    if all(row.ancestor_id != node.id for row in rows) or any(
+        row.ancestor_version != row.current_version for row in rows
+    ):
+        _refresh_in_background(
+            "node_lineage",
+            node.id,
+            partial(_refresh_stale_node_lineage, node.id, node.name),
+        )
+        return None
+
+    statement = (
+        select(Node)
+        .join(NodeLineage, NodeLineage.ancestor_id == Node.id)
+        .where(NodeLineage.descendant_id == node.id, NodeLineage.depth > 0)
+    )
+    if not include_deactivated:
+        statement = statement.where(is_(Node.deactivated_at, None))
+    if node_type:
+        statement = statement.where(Node.type == node_type)
+    statement = statement.options(*_node_output_options())
+    return list((await session.execute(statement)).unique().scalars().all())
+
+
 async def build_reference_link(
     session: AsyncSession,
     col: Column,
@@ -582,18 +967,17 @@ async def get_dimension_nodes(
     ]
 
 
-async def get_dimensions_dag(
-    session: AsyncSession,
-    node_revision: NodeRevision,
-    with_attributes: bool = True,
-    depth: int = 30,
-) -> List[Union[DimensionAttributeOutput, Node]]:
+# The maximum depth of the dimensions graph paths kept in the dimension reachability table
+DIMENSION_REACHABILITY_DEPTH = 30
+# The advisory lock namespace for refreshing the dimension reachability of a node
+DIMENSION_REACHABILITY_LOCK = 0x444A
+
+
+def _dimensions_graph_paths(node_revision_ids: List[int], depth: int):
     """
-    Gets the dimensions graph of the given node revision with a single recursive CTE query.
-    This graph is split out into dimension attributes or dimension nodes depending on the
-    `with_attributes` flag.
+    A recursive CTE of the paths through the dimensions graphs of the given node
+    revisions, to all dimension nodes reachable within `depth` hops.
     """
-
     initial_node = aliased(NodeRevision, name="initial_node")
     dimension_node = aliased(Node, name="dimension_node")
     dimension_rev = aliased(NodeRevision, name="dimension_rev")
@@ -601,7 +985,6 @@ async def get_dimensions_dag(
     current_rev = aliased(NodeRevision, name="current_rev")
     next_node = aliased(Node, name="next_node")
     next_rev = aliased(NodeRevision, name="next_rev")
-    column = aliased(Column, name="c")
 
     # Merge both branching points of the dimensions graph (the column -> dimension
     # branch and the node -> dimension branch) into a single CTE. We do this merge because
@@ -639,6 +1022,7 @@ async def get_dimensions_dag(
     dimensions_graph = (
         select(
             initial_node.id.label("path_start"),
+            initial_node.node_id.label("start_node_id"),
             graph_branches.c.name.label("col_name"),
             graph_branches.c.dimension_column.label("dimension_column"),
             dimension_node.id.label("path_end"),
@@ -654,10 +1038,11 @@ async def get_dimensions_dag(
             dimension_node.name.label("node_name"),
             dimension_rev.id.label("node_revision_id"),
             dimension_rev.display_name.label("node_display_name"),
+            dimension_rev.version.label("node_version"),
             literal(0).label("depth"),
         )
         .select_from(initial_node)
-        .join(graph_branches, node_revision.id == graph_branches.c.node_revision_id)
+        .join(graph_branches, initial_node.id == graph_branches.c.node_revision_id)
         .join(
             dimension_node,
             (dimension_node.id == graph_branches.c.dimension_id)
@@ -670,7 +1055,7 @@ async def get_dimensions_dag(
                 dimension_rev.node_id == dimension_node.id,
             ),
         )
-        .where(initial_node.id == node_revision.id)
+        .where(initial_node.id.in_(node_revision_ids))
     ).cte("dimensions_graph", recursive=True)
     dimensions_graph = dimensions_graph.suffix_with(
         "CYCLE node_revision_id SET is_cycle USING path",
@@ -679,6 +1064,7 @@ async def get_dimensions_dag(
     paths = dimensions_graph.union_all(
         select(
             dimensions_graph.c.path_start,
+            dimensions_graph.c.start_node_id,
             graph_branches.c.name.label("col_name"),
             graph_branches.c.dimension_column.label("dimension_column"),
             next_node.id.label("path_end"),
@@ -694,6 +1080,7 @@ async def get_dimensions_dag(
             next_node.name.label("node_name"),
             next_rev.id.label("node_revision_id"),
             next_rev.display_name.label("node_display_name"),
+            next_rev.version.label("node_version"),
             (dimensions_graph.c.depth + literal(1)).label("depth"),
         )
         .select_from(
@@ -729,6 +1116,25 @@ async def get_dimensions_dag(
         )
         .where(dimensions_graph.c.depth <= depth),
     )
+    return paths
+
+
+async def get_dimensions_dag(
+    session: AsyncSession,
+    node_revision: NodeRevision,
+    with_attributes: bool = True,
+    depth: int = 30,
+) -> List[Union[DimensionAttributeOutput, Node]]:
+    """
+    Gets the dimensions graph of the given node revision. The paths through the graph
+    are read from the dimension reachability table when it is current for the node,
+    and are otherwise found with a single recursive CTE query. This graph is split out
+    into dimension attributes or dimension nodes depending on the `with_attributes` flag.
+    """
+    paths = await get_materialized_dimension_paths(session, node_revision, depth)
+    if paths is None:
+        paths = _dimensions_graph_paths([node_revision.id], depth)
+    column = aliased(Column, name="c")
 
     # Final SELECT statements
     # ----
@@ -812,13 +1218,8 @@ async def get_dimensions_dag(
 
     def _extract_roles_from_path(join_path) -> str:
         """Extracts dimension roles from the query results' join path"""
-        roles = [
-            path.replace("[", "").replace("]", "").split(".")[-1]
-            for path in join_path.split(",")
-            if "[" in path  # this indicates that this a role
-        ]
-        non_empty_roles = [role for role in roles if role]
-        return f"[{'->'.join(non_empty_roles)}]" if non_empty_roles else ""
+        roles = _join_path_roles(join_path)
+        return f"[{'->'.join(roles)}]" if roles else ""
 
     # Only include a given column it's an attribute on a dimension node or
     # if the column is tagged with the attribute type 'dimension'
@@ -868,6 +1269,331 @@ async def get_dimensions_dag(
     )
 
 
+def _join_path_roles(join_path: str) -> List[str]:
+    """
+    The dimension roles along a join path from the dimensions graph query
+    """
+    roles = [
+        path.replace("[", "").replace("]", "").split(".")[-1]
+        for path in join_path.split(",")
+        if "[" in path  # this indicates that this a role
+    ]
+    return [role for role in roles if role]
+
+
+async def get_dimension_dependents(
+    session: AsyncSession,
+    node_ids: Iterable[int],
+) -> Set[int]:
+    """
+    Finds the ids of all nodes whose dimensions graphs reach any of the given nodes,
+    through dimension links or dimension columns on their current revisions.
+    """
+    node_ids = list(node_ids)
+    if not node_ids:
+        return set()
+    graph_branches = (
+        select(Column.node_revision_id, Column.dimension_id)
+        .where(Column.dimension_id.isnot(None))
+        .union_all(select(DimensionLink.node_revision_id, DimensionLink.dimension_id))
+        .cte("graph_branches")
+    )
+    dependent_rev = aliased(NodeRevision, name="dependent_rev")
+    dependent_node = aliased(Node, name="dependent_node")
+    is_current = and_(
+        dependent_node.id == dependent_rev.node_id,
+        dependent_node.current_version == dependent_rev.version,
+    )
+
+    # UNION rather than UNION ALL, so that cycles in the graph terminate the recursion
+    dependents = (
+        select(dependent_rev.node_id)
+        .select_from(graph_branches)
+        .join(dependent_rev, dependent_rev.id == graph_branches.c.node_revision_id)
+        .join(dependent_node, is_current)
+        .where(graph_branches.c.dimension_id.in_(node_ids))
+        .cte("dependents", recursive=True)
+    )
+    dependents = dependents.union(
+        select(dependent_rev.node_id)
+        .select_from(graph_branches)
+        .join(dependents, dependents.c.node_id == graph_branches.c.dimension_id)
+        .join(dependent_rev, dependent_rev.id == graph_branches.c.node_revision_id)
+        .join(dependent_node, is_current),
+    )
+    return set((await session.execute(select(dependents.c.node_id))).scalars())
+
+
+# The number of advisory locks that node ids are hashed into within each lock namespace,
+# which bounds the number of locks a refresh takes however many nodes it covers
+NODE_LOCK_BUCKETS = 32
+
+
+async def _lock_nodes(
+    session: AsyncSession,
+    lock_namespace: int,
+    node_ids: Iterable[int],
+    wait: bool = True,
+) -> bool:
+    """
+    Takes transaction-level advisory locks covering the given nodes within the lock
+    namespace, so that concurrent refreshes of the same nodes are serialized. Nodes are
+    hashed into a fixed number of locks, so refreshes of different nodes may also be
+    serialized. Without `wait`, returns whether all the locks could be taken immediately.
+    """
+    lock = func.pg_advisory_xact_lock if wait else func.pg_try_advisory_xact_lock
+    # Single bigint keys, with the namespace in the high 32 bits, taken in a fixed order
+    keys = sorted(
+        {
+            (lock_namespace << 32) | (node_id % NODE_LOCK_BUCKETS)
+            for node_id in node_ids
+        },
+    )
+    if not keys:
+        return True  # pragma: no cover
+    results = (
+        await session.execute(select(*(lock(literal(key, BigInteger)) for key in keys)))
+    ).one()
+    return wait or all(results)
+
+
+async def refresh_dimension_reachability(
+    session: AsyncSession,
+    node_ids: Iterable[int],
+    include_dependents: bool = True,
+    wait: bool = True,
+):
+    """
+    Recomputes the materialized dimensions graph paths of the given nodes and, unless
+    `include_dependents` is False, of every node whose dimensions graph reaches them.
+    This should be called whenever the dimension links, dimension columns or status
+    of these nodes change. The caller commits the session.
+
+    Without `wait`, nothing is refreshed if another transaction is refreshing any of
+    the same nodes.
+    """
+    node_ids = set(node_ids)
+    if include_dependents:
+        node_ids |= await get_dimension_dependents(session, node_ids)
+    if not node_ids:
+        return
+
+    if not await _lock_nodes(
+        session,
+        DIMENSION_REACHABILITY_LOCK,
+        node_ids,
+        wait=wait,
+    ):
+        return
+    await session.execute(
+        delete(DimensionReachability).where(
+            DimensionReachability.node_id.in_(node_ids),
+        ),
+    )
+    revisions = (
+        await session.execute(
+            select(NodeRevision.id, NodeRevision.node_id, NodeRevision.version)
+            .join(
+                Node,
+                and_(
+                    Node.id == NodeRevision.node_id,
+                    Node.current_version == NodeRevision.version,
+                ),
+            )
+            .where(Node.id.in_(node_ids)),
+        )
+    ).all()
+    if not revisions:
+        return  # pragma: no cover
+
+    # Each node's own row records the node version that its paths were computed for
+    rows = [
+        {
+            "node_id": revision.node_id,
+            "dimension_id": revision.node_id,
+            "dimension_version": revision.version,
+            "join_path": "",
+            "role": None,
+            "depth": -1,
+        }
+        for revision in revisions
+    ]
+    paths = _dimensions_graph_paths(
+        [revision.id for revision in revisions],
+        DIMENSION_REACHABILITY_DEPTH,
+    )
+    statement = select(
+        paths.c.start_node_id,
+        paths.c.path_end,
+        paths.c.node_version,
+        paths.c.join_path,
+        paths.c.depth,
+    )
+    for start_node_id, dimension_id, version, join_path, depth in (
+        await session.execute(statement)
+    ).all():
+        roles = _join_path_roles(join_path)
+        rows.append(
+            {
+                "node_id": start_node_id,
+                "dimension_id": dimension_id,
+                "dimension_version": version,
+                "join_path": join_path,
+                "role": "->".join(roles) if roles else None,
+                "depth": depth,
+            },
+        )
+    await session.execute(insert(DimensionReachability), rows)
+
+
+async def _refresh_stale_dimension_reachability(node_id: int, node_name: str):
+    """
+    Refreshes the dimensions graph paths of a node whose rows were found to be missing
+    or stale on read, in a separate writer session.
+    """
+    try:
+        async with session_context() as writer_session:
+            await refresh_dimension_reachability(
+                writer_session,
+                [node_id],
+                include_dependents=False,
+                wait=False,
+            )
+            await writer_session.commit()
+    except Exception:  # pragma: no cover
+        logger.warning(
+            "Failed to refresh the dimension reachability of %s",
+            node_name,
+            exc_info=True,
+        )
+
+
+async def get_materialized_dimension_paths(
+    session: AsyncSession,
+    node_revision: NodeRevision,
+    depth: int = DIMENSION_REACHABILITY_DEPTH,
+):
+    """
+    Reads the dimensions graph paths of the node revision from the dimension
+    reachability table, with the same columns as the recursive dimensions graph query.
+    Returns None if the node revision is not its node's current revision, or if its
+    paths have not been materialized or have gone stale. Stale paths are recomputed in
+    the background so that later reads can use them.
+    """
+    if depth > DIMENSION_REACHABILITY_DEPTH:
+        return None
+    dimension_node = aliased(Node, name="dimension_node")
+    dimension_rev = aliased(NodeRevision, name="dimension_rev")
+    statement = (
+        select(
+            DimensionReachability.depth,
+            DimensionReachability.dimension_version,
+            dimension_node.current_version,
+            dimension_node.deactivated_at,
+        )
+        .join(dimension_node, dimension_node.id == DimensionReachability.dimension_id)
+        .where(DimensionReachability.node_id == node_revision.node_id)
+    )
+    rows = (await session.execute(statement)).all()
+    own_row = next((row for row in rows if row.depth < 0), None)
+    if own_row and own_row.current_version != node_revision.version:
+        # This is not the node's current revision
+        return None
+
+    # The paths are stale if any node on them has a new version or was deactivated
+    if own_row is None or any(
+        row.dimension_version != row.current_version
+        or (row.depth >= 0 and row.deactivated_at is not None)
+        for row in rows
+    ):
+        _refresh_in_background(
+            "dimension_reachability",
+            node_revision.node_id,
+            partial(
+                _refresh_stale_dimension_reachability,
+                node_revision.node_id,
+                node_revision.name,
+            ),
+        )
+        return None
+
+    # The recursive query returns paths up to one hop past the requested depth
+    return (
+        select(
+            DimensionReachability.join_path,
+            dimension_node.name.label("node_name"),
+            dimension_rev.id.label("node_revision_id"),
+            dimension_rev.display_name.label("node_display_name"),
+        )
+        .join(dimension_node, dimension_node.id == DimensionReachability.dimension_id)
+        .join(
+            dimension_rev,
+            and_(
+                dimension_rev.version == dimension_node.current_version,
+                dimension_rev.node_id == dimension_node.id,
+            ),
+        )
+        .where(
+            DimensionReachability.node_id == node_revision.node_id,
+            DimensionReachability.depth >= 0,
+            DimensionReachability.depth <= depth + 1,
+        )
+        .subquery("paths")
+    )
+
+
+async def get_dimension_links_graph(
+    session: AsyncSession,
+    node_revision: NodeRevision,
+) -> Dict[int, List[DimensionLink]]:
+    """
+    Loads every dimension link reachable from the node revision with a single recursive
+    CTE query, along with the dimension nodes they point to. Returns the links grouped by
+    the id of the node revision they are defined on, so that the dimension links graph
+    can be walked in memory by following each link to its dimension's current revision.
+    """
+    next_node = aliased(Node, name="next_node")
+    next_rev = aliased(NodeRevision, name="next_rev")
+    next_link = aliased(DimensionLink, name="next_link")
+
+    # UNION rather than UNION ALL, so that cycles in the graph terminate the recursion
+    reachable = (
+        select(DimensionLink.id, DimensionLink.dimension_id)
+        .where(DimensionLink.node_revision_id == node_revision.id)
+        .cte("reachable_links", recursive=True)
+    )
+    reachable = reachable.union(
+        select(next_link.id, next_link.dimension_id)
+        .select_from(reachable)
+        .join(next_node, next_node.id == reachable.c.dimension_id)
+        .join(
+            next_rev,
+            and_(
+                next_rev.version == next_node.current_version,
+                next_rev.node_id == next_node.id,
+            ),
+        )
+        .join(next_link, next_link.node_revision_id == next_rev.id),
+    )
+    statement = (
+        select(DimensionLink)
+        .where(DimensionLink.id.in_(select(reachable.c.id)))
+        .order_by(DimensionLink.id)
+        .options(
+            joinedload(DimensionLink.node_revision),
+            joinedload(DimensionLink.dimension).options(
+                joinedload(Node.current).options(
+                    selectinload(NodeRevision.columns),
+                ),
+            ),
+        )
+    )
+    links_graph: Dict[int, List[DimensionLink]] = {}
+    for link in (await session.execute(statement)).unique().scalars().all():
+        links_graph.setdefault(link.node_revision_id, []).append(link)
+    return links_graph
+
+
 async def get_dimensions(
     session: AsyncSession,
     node: Node,
@@ -4,7 +4,6 @@ import collections
 import decimal
 import logging
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from dataclasses import dataclass, field, fields
 from enum import Enum
@@ -81,6 +80,8 @@ def flatten(maybe_iterables: Any) -> Iterator:
     Flattens `maybe_iterables` by descending into items that are Iterable
     """
 
+    if type(maybe_iterables) in PRIMITIVES or isinstance(maybe_iterables, Node):
+        return iter([maybe_iterables])
     if not isinstance(maybe_iterables, (list, tuple, set, Iterator)):
         return iter([maybe_iterables])
     return chain.from_iterable(
@@ -88,11 +89,43 @@ def flatten(maybe_iterables: Any) -> Iterator:
     )
 
 
+def _clone_value(value: Any, memo: Dict[int, Any]) -> Any:
+    """
+    Clones AST nodes (and containers of them) within `value` for `Node.clone`
+    """
+    value_type = type(value)
+    if value_type in PRIMITIVES:
+        return value
+    if value_type in (list, tuple, set):
+        return value_type([_clone_value(item, memo) for item in value])
+    if isinstance(value, Node):
+        return value._clone(memo)
+    if isinstance(value, dict):
+        cloned = value.copy()
+        for key, item in value.items():
+            cloned[key] = _clone_value(item, memo)
+        return cloned
+    return value
+
+
 @dataclass
 class CompileContext:
     session: AsyncSession
     exception: DJException
     dependencies_cache: dict[str, DJNodeRef] = field(default_factory=dict)
+    # Node names that were bulk loaded up front. Those that exist are in the
+    # dependencies cache with their current revision's columns and dimension
+    # links loaded, so compiling never needs to query or refresh them.
+    preloaded: set[str] = field(default_factory=set)
+
+    def is_preloaded(self, node_revision: DJNode) -> bool:
+        """
+        Whether the node revision is the bulk loaded current revision of its node
+        """
+        if node_revision.name not in self.preloaded:
+            return False
+        node = self.dependencies_cache.get(node_revision.name)
+        return node is not None and node.current is node_revision
 
 
 # typevar used for node methods that return self
@@ -100,6 +133,129 @@ class CompileContext:
 TNode = TypeVar("TNode", bound="Node")
 
 
+# Private attributes are not children, except for these when the node they point
+# to has the owning node as its parent (see `Column.children`)
+_OWNED_PRIVATE_ATTRIBUTES = frozenset(("_table",))
+
+
+def _changes_structure(node: "Node", key: str, value: Any) -> bool:
+    """
+    Whether setting `key` to `value` on the node may change which nodes are
+    reachable from it or its ancestors. Re-parenting a node doesn't, but it changes
+    which ancestors are told about later changes, so the old ones are told now.
+    """
+    if key == "parent":
+        return value is not node.__dict__.get(key)
+    if key == "parent_key":
+        return False
+    if not key.startswith("_"):
+        return True
+    if key in _OWNED_PRIVATE_ATTRIBUTES:
+        return any(
+            getattr(owned, "parent", None) is node
+            for owned in (node.__dict__.get(key), value)
+        )
+    return False
+
+
+def _bump_generation(node: Optional["Node"]):
+    """
+    Increments the structure generation of the node and its ancestors, to
+    invalidate the node indexes of every sub-ast that contains the node
+    """
+    while node is not None:
+        node_dict = node.__dict__
+        node_dict["_generation"] = node_dict.get("_generation", 0) + 1
+        node = node_dict.get("parent")
+
+
+class NodeIndex:
+    """
+    A typed index of the nodes in a sub-ast, in traversal order. It is recorded as
+    a side-effect of a full `find_all` traversal and is only used while the sub-ast
+    is unchanged.
+
+    Changes to a node bump the structure generation of the node and its ancestors,
+    so the index only compares the generation of its root. Nodes reachable from the
+    root whose parent is not the node they were reached through (shared or
+    re-parented nodes) don't pass changes up to the root, so their generations are
+    compared individually. In-place changes to child lists are caught by comparing
+    their sizes.
+    """
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.nodes_by_type: Dict[type, List["Node"]] = collections.defaultdict(list)
+        self.positions: Dict[int, int] = {}
+        self.containers: List[Tuple[Union[list, set], int]] = []
+        self.detached: List[Tuple["Node", int]] = []
+        self.matches: Dict[type, List["Node"]] = {}
+
+    @classmethod
+    def build(cls, root: "Node", node_type: Type[TNode]) -> Iterator[TNode]:
+        """
+        Traverses the sub-ast, yielding the nodes of `node_type`, and attaches an
+        index to `root` once the traversal completes without the AST changing.
+        """
+        index = cls(root.__dict__.get("_generation", 0))
+        stack: List[Tuple["Node", Optional["Node"]]] = [(root, None)]
+        while stack:
+            node, reached_from = stack.pop()
+            node_dict = node.__dict__
+            if reached_from is not None and node_dict.get("parent") is not reached_from:
+                index.detached.append((node, node_dict.get("_generation", 0)))
+            index.positions[id(node)] = len(index.positions)
+            index.nodes_by_type[type(node)].append(node)
+            for name in type(node)._field_names():
+                value = node_dict.get(name)
+                if type(value) in (list, set):
+                    index.containers.append((value, len(value)))
+            if isinstance(node, node_type):
+                yield node
+            children = [(child, node) for child in node.children]
+            children.reverse()
+            stack.extend(children)
+        if index.is_current(root):
+            object.__setattr__(root, "_node_index", index)
+
+    def is_modified(self, root: "Node") -> bool:
+        """
+        Whether any node in the sub-ast was modified since the index was built
+        """
+        return self.generation != root.__dict__.get("_generation", 0) or any(
+            generation != node.__dict__.get("_generation", 0)
+            for node, generation in self.detached
+        )
+
+    def is_current(self, root: "Node") -> bool:
+        """
+        Whether the sub-ast is unchanged since the index was built
+        """
+        return not self.is_modified(root) and all(
+            len(container) == size for container, size in self.containers
+        )
+
+    def find_all(self, node_type: Type[TNode]) -> List[TNode]:
+        """
+        All indexed nodes of `node_type`, in traversal order
+        """
+        if (matches := self.matches.get(node_type)) is None:
+            groups = [
+                nodes
+                for type_, nodes in self.nodes_by_type.items()
+                if issubclass(type_, node_type)
+            ]
+            if len(groups) == 1:
+                matches = groups[0]
+            else:
+                matches = sorted(
+                    chain.from_iterable(groups),
+                    key=lambda node: self.positions[id(node)],
+                )
+            self.matches[node_type] = matches
+        return matches
+
+
 class Node(ABC):
     """Base class for all DJ AST nodes.
 
@@ -123,9 +279,10 @@ class Node(ABC):
 
     @property
     def depth(self) -> int:
-        if self.parent is None:
-            return 0
-        return self.parent.depth + 1
+        depth, node = 0, self.parent
+        while node is not None:
+            depth, node = depth + 1, node.parent
+        return depth
 
     def clear_parent(self: TNode) -> TNode:
         """
@@ -160,13 +317,22 @@ class Node(ABC):
         """
         Facilitates setting children using `.` syntax ensuring parent is attributed
         """
+        if self.__dict__.get("_frozen"):
+            raise DJParseException(
+                f"Cannot set `{key}` on a frozen {type(self).__name__} node, "
+                "clone it first",
+            )
+        if _changes_structure(self, key, value):
+            _bump_generation(self)
         if key == "parent":
             object.__setattr__(self, key, value)
             return
 
         object.__setattr__(self, key, value)
+        if key.startswith("_"):
+            return
         for child in flatten(value):
-            if isinstance(child, Node) and not key.startswith("_"):
+            if isinstance(child, Node):
                 child.set_parent(self, key)
 
     def swap(self: TNode, other: "Node") -> TNode:
@@ -200,6 +366,59 @@ class Node(ABC):
         """
         return deepcopy(self)
 
+    def clone(self: TNode, memo: Optional[Dict[int, Any]] = None) -> TNode:
+        """
+        Create a structural copy of the sub-ast rooted at `self`. Unlike `copy`, this
+        only copies AST nodes and the containers (lists, tuples, sets and dicts)
+        holding them: every other value (literals, enums, column types) is immutable
+        and shared with the original. References between nodes within the subtree are preserved.
+        """
+        if memo is not None:
+            return self._clone(memo)
+        memo = {}
+        cloned = self._clone(memo)
+        # A node may be reached through a reference before its parent was cloned,
+        # so parents are only pointed at their clones once the whole copy is done
+        for node in memo.values():
+            node.__dict__["parent"] = memo.get(id(node.__dict__.get("parent")))
+        return cloned
+
+    def _clone(self: TNode, memo: Dict[int, Any]) -> TNode:
+        """
+        Clones the node for `clone`, leaving its parent pointing at the original one
+        """
+        if (cloned := memo.get(id(self))) is not None:
+            return cloned
+        cloned = object.__new__(type(self))
+        memo[id(self)] = cloned
+        cloned_dict = cloned.__dict__
+        for key, value in self.__dict__.items():
+            if type(value) in PRIMITIVES or key == "parent":
+                cloned_dict[key] = value
+            else:
+                cloned_dict[key] = _clone_value(value, memo)
+        cloned_dict.pop("_frozen", None)
+        cloned_dict.pop("_node_index", None)
+        return cloned
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Excludes the typed node index when pickling or copying
+        """
+        state = self.__dict__.copy()
+        state.pop("_node_index", None)
+        return state
+
+    def freeze(self: TNode) -> TNode:
+        """
+        Mark the sub-ast as frozen so that it can be safely shared, e.g. between
+        callers of `cached_parse`. Frozen nodes reject attribute assignment; use
+        `clone` to get a mutable copy.
+        """
+        for node in self.flatten():
+            object.__setattr__(node, "_frozen", True)
+        return self
+
     def get_nearest_parent_of_type(
         self: "Node",
         node_type: Type[TNode],
@@ -207,11 +426,12 @@ class Node(ABC):
         """
         Traverse up the tree until you find a node of `node_type` or hit the root
         """
-        if isinstance(self.parent, node_type):
-            return self.parent
-        if self.parent is None:
-            return None
-        return self.parent.get_nearest_parent_of_type(node_type)
+        parent = self.parent
+        while parent is not None:
+            if isinstance(parent, node_type):
+                return parent
+            parent = parent.parent
+        return None
 
     def get_furthest_parent(
         self: "Node",
@@ -257,49 +477,33 @@ class Node(ABC):
                 and optional flattening (by default Iterator[Node])
         """
 
-        def make_child_generator():
-            """
-            Makes a generator enclosing self to return
-            not obfuscated fields (fields without starting `_`)
-            """
-            for self_field in fields(self):
-                if (
-                    not self_field.name.startswith("_") if not obfuscated else True
-                ) and (self_field.name in self.__dict__):
-                    value = self.__dict__[self_field.name]
-                    values = [value]
-                    if flat:
-                        values = flatten(value)
-                    for value in values:
-                        if named:
-                            yield (self_field.name, value)
-                        else:
-                            yield value
-
-        # `iter`s used to satisfy mypy (`child_generator` type changes between generator, filter)
-        child_generator = iter(make_child_generator())
-
-        if nodes_only:
-            child_generator = iter(
-                filter(
-                    lambda child: isinstance(child, Node)
-                    if not named
-                    else isinstance(child[1], Node),
-                    child_generator,
-                ),
-            )
+        node_dict = self.__dict__
+        for name in type(self)._field_names(obfuscated):
+            if name not in node_dict:
+                continue
+            value = node_dict[name]
+            for value in flatten(value) if flat else (value,):
+                if nodes_only and not isinstance(value, Node):
+                    continue
+                if not nones and value is None:
+                    continue
+                yield (name, value) if named else value
 
-        if not nones:
-            child_generator = iter(
-                filter(
-                    lambda child: (child is not None)
-                    if not named
-                    else (child[1] is not None),
-                    child_generator,
-                ),
+    @classmethod
+    def _field_names(cls, obfuscated: bool = False) -> Tuple[str, ...]:
+        """
+        The names of the node's dataclass fields, computed once per class. Fields
+        with leading underscores are only included if `obfuscated` is set.
+        """
+        cache = cls.__dict__.get("_FIELD_NAMES")
+        if cache is None:
+            all_names = tuple(getattr(cls, "__dataclass_fields__", {}))
+            cache = (
+                tuple(name for name in all_names if not name.startswith("_")),
+                all_names,
             )
-
-        return child_generator
+            type.__setattr__(cls, "_FIELD_NAMES", cache)
+        return cache[obfuscated]
 
     @property
     def children(self) -> Iterator["Node"]:
@@ -307,13 +511,17 @@ class Node(ABC):
         Returns an iterator of all nodes that are one
         step from the current node down including through iterables
         """
-        return self.fields(
-            flat=True,
-            nodes_only=True,
-            obfuscated=False,
-            nones=False,
-            named=False,
-        )
+        node_dict = self.__dict__
+        for name in type(self)._field_names():
+            value = node_dict.get(name)
+            if value is None or type(value) in PRIMITIVES:
+                continue
+            if type(value) in (list, tuple, set):
+                for child in flatten(value):
+                    if isinstance(child, Node):
+                        yield child
+            elif isinstance(value, Node):
+                yield value
 
     def replace(
         self,
@@ -345,11 +553,14 @@ class Node(ABC):
         """
         Find all nodes that `func` returns `True` for
         """
-        if func(self):
-            yield self
-
-        for node in chain(*[child.filter(func) for child in self.children]):
-            yield node
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if func(node):
+                yield node
+            children = list(node.children)
+            children.reverse()
+            stack.extend(children)
 
     def contains(self, other: "Node") -> bool:
         """
@@ -365,17 +576,33 @@ class Node(ABC):
 
     def find_all(self, node_type: Type[TNode]) -> Iterator[TNode]:
         """
-        Find all nodes of a particular type in the node's sub-ast
+        Find all nodes of a particular type in the node's sub-ast. A full traversal
+        records a typed index of the sub-ast, so repeated calls on an unchanged
+        AST only visit the matching nodes.
         """
-        return self.filter(lambda n: isinstance(n, node_type))  # type: ignore
+        index = self.__dict__.get("_node_index")
+        if index is None or not index.is_current(self):
+            yield from NodeIndex.build(self, node_type)
+            return
+
+        matches = index.find_all(node_type)
+        for position, node in enumerate(matches):
+            yield node
+            if index.is_modified(self):
+                # The AST was changed by the caller mid-iteration, so continue
+                # with a regular traversal of the current AST
+                seen = {id(match) for match in matches[: position + 1]}
+                for node in self.filter(lambda n: isinstance(n, node_type)):
+                    if id(node) not in seen:
+                        yield node
+                return
 
     def apply(self, func: Callable[["Node"], None]):
         """
         Traverse ast and apply func to each Node
         """
-        func(self)
-        for child in self.children:
-            child.apply(func)
+        for node in self.flatten():
+            func(node)
 
     def compare(
         self,
@@ -880,8 +1107,10 @@ class Column(Aliasable, Named, Expression):
         )
         direct_tables = list(
             filter(
-                lambda tbl: tbl.in_from_or_lateral()
-                and tbl.get_nearest_parent_of_type(Query) is query,
+                lambda tbl: (
+                    tbl.in_from_or_lateral()
+                    and tbl.get_nearest_parent_of_type(Query) is query
+                ),
                 query.find_all(TableExpression),
             ),
         )
@@ -938,8 +1167,10 @@ class Column(Aliasable, Named, Expression):
         if not query.in_from_or_lateral():
             correlation_tables = list(
                 filter(
-                    lambda tbl: tbl.in_from_or_lateral()
-                    and query.is_ancestor_of(tbl.get_nearest_parent_of_type(Query)),
+                    lambda tbl: (
+                        tbl.in_from_or_lateral()
+                        and query.is_ancestor_of(tbl.get_nearest_parent_of_type(Query))
+                    ),
                     query.find_all(TableExpression),
                 ),
             )
@@ -1019,25 +1250,38 @@ class Column(Aliasable, Named, Expression):
                                 for col in col_dimension.current.columns
                             ]
                             to_process.append((new_table, path))
-                await ctx.session.refresh(current_table.dj_node, ["dimension_links"])
+                preloaded = ctx.is_preloaded(current_table.dj_node)
+                if not preloaded:
+                    await ctx.session.refresh(
+                        current_table.dj_node,
+                        ["dimension_links"],
+                    )
                 for link in current_table.dj_node.dimension_links:
                     all_roles = []
                     if self.role:
                         all_roles = self.role.split(" -> ")
                     if (not link.role and not all_roles) or (link.role in all_roles):
-                        await ctx.session.refresh(link, ["dimension"])
+                        if not preloaded:
+                            await ctx.session.refresh(link, ["dimension"])
                         if link.dimension:
-                            await ctx.session.refresh(link.dimension, ["current"])
+                            dimension_preloaded = (
+                                link.dimension.name in ctx.preloaded
+                                and ctx.dependencies_cache.get(link.dimension.name)
+                                is link.dimension
+                            )
+                            if not dimension_preloaded:
+                                await ctx.session.refresh(link.dimension, ["current"])
                             new_table = Table(
                                 name=to_namespaced_name(link.dimension.name),
                                 _dj_node=link.dimension.current,
                                 dimension_link=link,
                                 path=path + [link],
                             )
-                            await ctx.session.refresh(
-                                link.dimension.current,
-                                ["columns"],
-                            )
+                            if not dimension_preloaded:
+                                await ctx.session.refresh(
+                                    link.dimension.current,
+                                    ["columns"],
+                                )
                             new_table._columns = [
                                 Column(
                                     name=Name(col.name),
@@ -1652,22 +1896,30 @@ class BinaryOp(Operation):
             BinaryOpKind.Lt: lambda left, right: BooleanType(),
             BinaryOpKind.GtEq: lambda left, right: BooleanType(),
             BinaryOpKind.LtEq: lambda left, right: BooleanType(),
-            BinaryOpKind.BitwiseOr: lambda left, right: IntegerType()
-            if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
-            else raise_binop_exception(),
-            BinaryOpKind.BitwiseAnd: lambda left, right: IntegerType()
-            if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
-            else raise_binop_exception(),
-            BinaryOpKind.BitwiseXor: lambda left, right: IntegerType()
-            if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
-            else raise_binop_exception(),
+            BinaryOpKind.BitwiseOr: lambda left, right: (
+                IntegerType()
+                if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
+                else raise_binop_exception()
+            ),
+            BinaryOpKind.BitwiseAnd: lambda left, right: (
+                IntegerType()
+                if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
+                else raise_binop_exception()
+            ),
+            BinaryOpKind.BitwiseXor: lambda left, right: (
+                IntegerType()
+                if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
+                else raise_binop_exception()
+            ),
             BinaryOpKind.Multiply: resolve_numeric_types_binary_operations,
             BinaryOpKind.Divide: resolve_numeric_types_binary_operations,
             BinaryOpKind.Plus: resolve_numeric_types_binary_operations,
             BinaryOpKind.Minus: resolve_numeric_types_binary_operations,
-            BinaryOpKind.Modulo: lambda left, right: IntegerType()
-            if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
-            else raise_binop_exception(),
+            BinaryOpKind.Modulo: lambda left, right: (
+                IntegerType()
+                if str(left) == str(IntegerType()) and str(right) == str(IntegerType())
+                else raise_binop_exception()
+            ),
         }
         return BINOP_TYPE_COMBO_LOOKUP[kind](left_type, right_type)
 
@@ -2754,6 +3006,85 @@ class Select(SelectExpression):
         await super().compile(ctx)
 
 
+class ColumnSymbolTable:
+    """
+    Maps the column names exposed by a query's table sources to the table expressions
+    that provide them, keyed by `(table alias, column name)` and by `(None, column name)`
+    for unqualified references. Resolving a column then takes a few dict lookups
+    instead of trying every table source in the query.
+
+    Table sources whose columns can match on more than their names (table-valued
+    functions and tables with struct columns) are always returned as candidates.
+    """
+
+    def __init__(self, table_options: List[TableExpression]):
+        self.table_options = table_options
+        self.aliases: List[Optional[str]] = []
+        self.symbols: Dict[Tuple[Optional[str], str], List[int]] = (
+            collections.defaultdict(list)
+        )
+        self.identifiers: Dict[str, List[int]] = collections.defaultdict(list)
+        self.unindexed: List[int] = []
+        for idx, option in enumerate(table_options):
+            alias = option.alias.name if option.alias else None
+            self.aliases.append(alias)
+            self.identifiers[option.identifier()].append(idx)
+            if self._matches_by_name_only(option):
+                names = {
+                    col.alias_or_name.name
+                    for col in option._columns
+                    if isinstance(col, (Aliasable, Named))
+                }
+                for name in names:
+                    self.symbols[(None, name)].append(idx)
+                    if alias is not None:
+                        self.symbols[(alias, name)].append(idx)
+            else:
+                self.unindexed.append(idx)
+
+    @staticmethod
+    def _matches_by_name_only(option: TableExpression) -> bool:
+        """
+        Whether `option.add_column_reference` can only match columns by name
+        """
+        if isinstance(option, FunctionTable):
+            return False
+        try:
+            return not any(
+                isinstance(col.type, StructType)
+                for col in option.columns
+                if not hasattr(col, "_type") or col._type
+            )
+        except Exception:  # pragma: no cover
+            # Leave columns whose types can't be resolved yet to add_column_reference
+            return False
+
+    def candidates(self, col: Column) -> List[TableExpression]:
+        """
+        The table sources that may provide the column, in their original order
+        """
+        namespace = col.namespace[0].name if col.namespace else None
+        indices = set(self.symbols.get((namespace, col.name.name), ()))
+        indices.update(
+            idx
+            for idx in self.unindexed
+            if namespace is None or self.aliases[idx] == namespace
+        )
+        if namespace is not None:
+            # Dimension attributes like `default.dim.attribute` match the dimension
+            # node's table source
+            identifier = col.identifier()
+            if SEPARATOR in identifier:
+                dimension_node = identifier.rsplit(SEPARATOR, 1)[0]
+                if SEPARATOR in dimension_node:
+                    indices.update(
+                        idx
+                        for idx in self.identifiers.get(dimension_node, ())
+                        if self.aliases[idx] != namespace
+                    )
+        return [self.table_options[idx] for idx in sorted(indices)]
+
+
 @dataclass(eq=False)
 class Query(TableExpression, UnNamed):
     """
@@ -2772,30 +3103,15 @@ class Query(TableExpression, UnNamed):
         if self._is_compiled:
             return
 
-        def _compile(info: Tuple[Column, List[TableExpression]]):
+        def _compile(col: Column, symbols: ColumnSymbolTable):
             """
-            Given a list of table sources, find a matching origin table for the column.
+            Find the matching origin tables for the column among the query's table sources.
             """
-            col, table_options = info
             matching_origin_tables = 0
-            for option in table_options:
-                namespace = col.namespace[0].name if col.namespace else None
-                table_alias = option.alias.name if option.alias else None
-                if namespace is None or namespace == table_alias:
-                    result = option.add_column_reference(col)
-                    if result:
-                        matching_origin_tables += 1
-                        col._is_compiled = True
-                elif SEPARATOR in col.identifier():
-                    dimension_node = col.identifier().rsplit(SEPARATOR, 1)[0]
-                    if (
-                        SEPARATOR in dimension_node
-                        and dimension_node == option.identifier()
-                    ):
-                        result = option.add_column_reference(col)
-                        if result:
-                            matching_origin_tables += 1
-                            col._is_compiled = True
+            for option in symbols.candidates(col):
+                if option.add_column_reference(col):
+                    matching_origin_tables += 1
+                    col._is_compiled = True
             if matching_origin_tables > 1:
                 ctx.exception.errors.append(
                     DJError(
@@ -2827,17 +3143,19 @@ class Query(TableExpression, UnNamed):
             else []
         ) + referenced_dimension_options
         if table_options:
-            referenced_nodes = await DJNodeRef.get_by_names(
-                ctx.session,
-                {
-                    option.identifier()
-                    for option in table_options
-                    if isinstance(option, Table)
-                },
-            )
-            ctx.dependencies_cache.update(
-                {node.name: node for node in referenced_nodes},
-            )
+            referenced_names = {
+                option.identifier()
+                for option in table_options
+                if isinstance(option, Table)
+            } - ctx.preloaded
+            if referenced_names:
+                referenced_nodes = await DJNodeRef.get_by_names(
+                    ctx.session,
+                    list(referenced_names),
+                )
+                ctx.dependencies_cache.update(
+                    {node.name: node for node in referenced_nodes},
+                )
             for idx, option in enumerate(table_options):
                 if isinstance(option, Table) and option.name.name in cte_mapping:
                     option = cte_mapping[option.name.name]
@@ -2861,13 +3179,9 @@ class Query(TableExpression, UnNamed):
                     ]
 
             if columns_to_compile:
-                with ThreadPoolExecutor() as executor:
-                    list(
-                        executor.map(
-                            _compile,
-                            [(col, table_options) for col in columns_to_compile],
-                        ),
-                    )
+                symbols = ColumnSymbolTable(table_options)
+                for col in columns_to_compile:
+                    _compile(col, symbols)
 
         for child in self.children:
             if child is not self and not child.is_compiled():
@@ -2887,8 +3201,10 @@ class Query(TableExpression, UnNamed):
 
         for cte in self.ctes:
             for tbl in self.filter(
-                lambda node: isinstance(node, Table)
-                and node.identifier(False) == cte.alias_or_name.identifier(False),
+                lambda node: (
+                    isinstance(node, Table)
+                    and node.identifier(False) == cte.alias_or_name.identifier(False)
+                ),
             ):
                 tbl.swap(cte)
         self.ctes = []
@@ -1,10 +1,10 @@
 # mypy: ignore-errors
-import copy
 import inspect
 import logging
-from functools import lru_cache
 import re
-from typing import TYPE_CHECKING, List, Optional, Tuple, Union, cast
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple, Union, cast
 
 import antlr4
 from antlr4 import InputStream, RecognitionException
@@ -15,6 +15,7 @@ from antlr4.error.ErrorStrategy import BailErrorStrategy
 import datajunction_server.sql.parsing.types as ct
 from datajunction_server.sql.parsing import ast
 from datajunction_server.sql.parsing.ast import UnaryOpKind
+from datajunction_server.sql.parsing.backends.cache import ParseResultCache
 from datajunction_server.sql.parsing.backends.exceptions import DJParseException
 from datajunction_server.sql.parsing.backends.grammar.generated.SqlBaseLexer import (
     SqlBaseLexer,
@@ -25,6 +26,7 @@ from datajunction_server.sql.parsing.backends.grammar.generated.SqlBaseParser im
 from datajunction_server.sql.parsing.backends.grammar.generated.SqlBaseParser import (
     SqlBaseParser as sbp,
 )
+from datajunction_server.utils import get_settings
 
 if TYPE_CHECKING:
     from datajunction_server.sql.parsing.types import ColumnType
@@ -174,21 +176,18 @@ def tree_to_strings(tree, indent=0):
 
 def parse_rule(sql: str, rule: str) -> Union[ast.Node, "ColumnType"]:
     """
-    Parse a string into a DJ ast using the ANTLR4 backend.
+    Parse a string into a DJ ast using the ANTLR4 backend. Results are cached
+    in the content-addressed parse result cache, which may be shared with
+    other workers.
     """
+    if (ast_tree := parse_result_cache.get(sql, rule)) is not None:
+        return ast_tree
     antlr_tree = parse_sql(sql, rule)
     ast_tree = visit(antlr_tree)
+    parse_result_cache.set(sql, rule, ast_tree)
     return ast_tree
 
 
-@lru_cache(maxsize=128)
-def _cached_parse(sql: Optional[str]) -> ast.Query:
-    """
-    Parse a string sql query into a DJ query AST and cache it.
-    """
-    return parse(sql)
-
-
 def parse(sql: Optional[str]) -> ast.Query:
     """
     Parse a string sql query into a DJ ast Query
@@ -201,11 +200,79 @@ def parse(sql: Optional[str]) -> ast.Query:
         raise DJParseException(message=f"Error parsing SQL `{sql}`: {exc}") from exc
 
 
+class ParseCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache:
+    """
+    A thread-safe LRU cache of frozen query ASTs keyed by SQL. The cached ASTs are
+    shared snapshots that are never handed out directly: callers get a clone.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, ast.Query] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, sql: str) -> Optional[ast.Query]:
+        with self._lock:
+            query = self._entries.get(sql)
+            if query is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(sql)
+            self._hits += 1
+            return query
+
+    def put(self, sql: str, query: ast.Query):
+        with self._lock:
+            self._entries[sql] = query
+            self._entries.move_to_end(sql)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def cache_info(self) -> ParseCacheInfo:
+        with self._lock:
+            return ParseCacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._entries),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+parse_cache = ParseCache(maxsize=get_settings().parse_cache_size)
+parse_result_cache = ParseResultCache(
+    get_settings().parse_result_cache,
+    timeout=get_settings().parse_result_cache_timeout,
+)
+
+
 def cached_parse(sql: Optional[str]) -> ast.Query:
     """
-    Parse a string sql query into a DJ ast Query
+    Parse a string sql query into a DJ ast Query, reusing a frozen snapshot of
+    previously parsed queries. The returned AST is a clone and safe to mutate.
     """
-    return copy.deepcopy(_cached_parse(sql))
+    snapshot = parse_cache.get(sql)
+    if snapshot is None:
+        snapshot = parse(sql).freeze()
+        parse_cache.put(sql, snapshot)
+    return snapshot.clone()
 
 
 TERMINAL_NODE = antlr4.tree.Tree.TerminalNodeImpl
@@ -214,6 +281,9 @@ TERMINAL_NODE = antlr4.tree.Tree.TerminalNodeImpl
 class Visitor:
     def __init__(self):
         self.registry = {}
+        # A flat dispatch table of context type -> (handler, can be parenthesized,
+        # can be aliased with AS), precomputed at registration time
+        self.dispatch = {}
 
     def register(self, func):
         params = inspect.signature(func).parameters
@@ -227,41 +297,55 @@ class Visitor:
                 f"A visitor is already registered for type {type_.__name__}.",
             )
         self.registry[type_] = func
+        self.dispatch[type_] = (
+            func,
+            hasattr(type_, "LEFT_PAREN"),
+            hasattr(type_, "AS"),
+        )
         return func
 
     def __call__(self, ctx):
-        if type(ctx) == TERMINAL_NODE:
+        ctx_type = type(ctx)
+        if ctx_type is TERMINAL_NODE:
             return None
-        func = self.registry.get(type(ctx), None)
-        if func is None:
+        handler = self.dispatch.get(ctx_type, None)
+        if handler is None:
             line, col = ctx.start.line, ctx.start.column
             raise TypeError(
-                f"{line}:{col} No visitor registered for type {type(ctx).__name__}",
+                f"{line}:{col} No visitor registered for type {ctx_type.__name__}",
             )
+        func, has_paren, has_as = handler
         result = func(ctx)
 
         if result is None:
             line, col = ctx.start.line, ctx.start.column
             raise DJParseException(f"{line}:{col} Could not parse {ctx.getText()}")
         if (
-            hasattr(result, "parenthesized")
-            and result.parenthesized is None
-            and hasattr(ctx, "LEFT_PAREN")
-        ):
-            if text := ctx.getText():
-                text = text.strip()
-                if (text[0] == "(") and (text[-1] == ")"):
-                    result.parenthesized = True
-        if (
-            hasattr(ctx, "AS")
-            and ctx.AS()
-            and hasattr(result, "as_")
-            and result.as_ is None
+            has_paren
+            and getattr(result, "parenthesized", False) is None
+            and is_parenthesized(ctx)
         ):
+            result.parenthesized = True
+        if has_as and ctx.AS() and getattr(result, "as_", False) is None:
             result = result.set_as(True)
         return result
 
 
+def is_parenthesized(ctx) -> bool:
+    """
+    Whether the context's tokens start with `(` and end with `)`, determined from
+    its first and last tokens rather than the text of the whole subtree.
+    """
+    start, stop = ctx.start, ctx.stop
+    return (
+        start is not None
+        and stop is not None
+        and start.tokenIndex <= stop.tokenIndex
+        and start.type == sbp.LEFT_PAREN
+        and stop.type == sbp.RIGHT_PAREN
+    )
+
+
 visit = Visitor()
 
 
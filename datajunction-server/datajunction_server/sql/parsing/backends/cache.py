@@ -0,0 +1,84 @@
+"""
+Content-addressed cache for parse results, shared across server workers.
+
+Parse results are keyed by a SHA-256 of the SQL, the grammar rule, and a version
+digest of the grammar and the modules that build the DJ AST, so any change to
+the parser invalidates previously cached entries automatically.
+
+Entries are pickled, and unpickling can run arbitrary code. A shared backend must
+therefore only be writable by the DJ server workers themselves.
+"""
+
+import hashlib
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from cachelib.base import BaseCache
+
+from datajunction_server.sql.parsing.backends.grammar.generated.SqlBaseParser import (
+    serializedATN,
+)
+
+logger = logging.getLogger(__name__)
+
+PARSING_DIR = Path(__file__).parent.parent
+
+# Modules whose changes alter the shape of parsed ASTs
+AST_MODULES = (
+    PARSING_DIR / "ast.py",
+    PARSING_DIR / "types.py",
+    PARSING_DIR / "backends" / "antlr4.py",
+)
+
+
+@lru_cache(maxsize=1)
+def parser_version() -> str:
+    """
+    A digest of the serialized grammar and the AST modules
+    """
+    digest = hashlib.sha256(repr(serializedATN()).encode())
+    for module in AST_MODULES:
+        digest.update(module.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def parse_cache_key(sql: str, rule: str) -> str:
+    """
+    The content-addressed key for a parse result
+    """
+    content = f"{parser_version()}:{rule}:{sql.strip()}"
+    return f"parse:{hashlib.sha256(content.encode()).hexdigest()}"
+
+
+class ParseResultCache:
+    """
+    Stores parsed ASTs in a cachelib backend. Backends serialize values, so every
+    `get` returns a fresh AST that the caller is free to mutate. An in-process
+    `SimpleCache` keeps results per worker, while a `FileSystemCache` or
+    `RedisCache` lets a cold worker warm up from results parsed by its peers.
+    """
+
+    def __init__(self, backend: BaseCache, timeout: int = 0):
+        self.backend = backend
+        self.timeout = timeout
+
+    def get(self, sql: str, rule: str) -> Optional[Any]:
+        """
+        Get the cached parse result for the SQL, if any
+        """
+        try:
+            return self.backend.get(parse_cache_key(sql, rule))
+        except Exception:  # pragma: no cover
+            logger.warning("Failed to read from parse cache", exc_info=True)
+            return None
+
+    def set(self, sql: str, rule: str, result: Any) -> None:
+        """
+        Cache a parse result for the SQL
+        """
+        try:
+            self.backend.set(parse_cache_key(sql, rule), result, timeout=self.timeout)
+        except Exception:  # pragma: no cover
+            logger.warning("Failed to write to parse cache", exc_info=True)
@@ -13,6 +13,7 @@ field_type=IntegerType(), is_optional=True, doc='an optional field'))
 """
 
 import re
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -60,7 +61,7 @@ class ColumnType(BaseModel):
 
     _initialized = False
 
-    model_config = ConfigDict(extra="allow", arbitrary_types_allowed=True)
+    model_config = ConfigDict(extra="allow", arbitrary_types_allowed=True, frozen=True)
 
     def __init__(
         self,
@@ -95,9 +96,7 @@ class ColumnType(BaseModel):
         """
         Parses the column type
         """
-        from datajunction_server.sql.parsing.backends.antlr4 import parse_rule
-
-        return cast(ColumnType, parse_rule(str(v), "dataType"))
+        return parse_column_type(str(v))
 
     def __eq__(self, other: "ColumnType"):  # type: ignore
         """
@@ -886,3 +885,165 @@ PRIMITIVE_TYPES: Dict[str, PrimitiveType] = {
     "wildcard": WildcardType(),
     "dict": StringType(),
 }
+
+# Maximum number of distinct type strings kept in the interned type registry
+TYPE_CACHE_SIZE = 4096
+
+_TYPE_TOKEN = re.compile(r"\s*(?:(?P<word>\w+)|(?P<symbol>[<>(),:]))")
+
+
+class _TypeStringParser:
+    """
+    A hand-written recursive descent parser for the column type strings that DJ
+    itself produces (primitives, ``decimal(p, s)``, ``array<...>``, ``map<...>``
+    and ``struct<...>``). It returns ``None`` for anything it does not recognize
+    so that the caller can fall back to the full ANTLR grammar.
+    """
+
+    def __init__(self, tokens: Tuple[str, ...]):
+        self.tokens = tokens
+        self.pos = 0
+
+    @classmethod
+    def parse(cls, type_string: str) -> Optional[ColumnType]:
+        """
+        Parses the type string, returning ``None`` if the fast path can't handle it.
+        """
+        tokens = []
+        pos, end = 0, len(type_string)
+        while pos < end:
+            match = _TYPE_TOKEN.match(type_string, pos)
+            if not match:
+                return None
+            tokens.append(match.group("word") or match.group("symbol"))
+            pos = match.end()
+        parser = cls(tuple(tokens))
+        column_type = parser.parse_type()
+        if column_type is None or parser.pos != len(parser.tokens):
+            return None
+        return column_type
+
+    def next(self) -> Optional[str]:
+        """
+        Consumes the next token
+        """
+        if self.pos >= len(self.tokens):
+            return None
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def peek(self) -> Optional[str]:
+        """
+        Returns the next token without consuming it
+        """
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def expect(self, token: str) -> bool:
+        """
+        Consumes the next token if it matches the expected one
+        """
+        if self.peek() == token:
+            self.pos += 1
+            return True
+        return False
+
+    def integer(self) -> Optional[int]:
+        """
+        Consumes an integer literal
+        """
+        token = self.next()
+        return int(token) if token and token.isdigit() else None
+
+    def parse_type(self) -> Optional[ColumnType]:
+        """
+        Parses a single (possibly nested) data type
+        """
+        word = self.next()
+        if word is None or not word.isidentifier():
+            return None
+        name = word.lower()
+        if name == "array":
+            if not self.expect("<"):
+                return None
+            element_type = self.parse_type()
+            if element_type is None or not self.expect(">"):
+                return None
+            return ListType(element_type)
+        if name == "map":
+            if not self.expect("<"):
+                return None
+            key_type = self.parse_type()
+            if key_type is None or not self.expect(","):
+                return None
+            value_type = self.parse_type()
+            if value_type is None or not self.expect(">"):
+                return None
+            return MapType(key_type, value_type)
+        if name == "struct":
+            return self.parse_struct()
+        if self.peek() == "(":
+            return self.parse_parameterized(name)
+        return PRIMITIVE_TYPES.get(name)
+
+    def parse_parameterized(self, name: str) -> Optional[ColumnType]:
+        """
+        Parses ``decimal(p, s)``, ``varchar(n)`` and ``fixed(n)``
+        """
+        self.expect("(")
+        if name == "decimal":
+            precision = self.integer()
+            if precision is None or not self.expect(","):
+                return None
+            scale = self.integer()
+            if scale is None or not self.expect(")"):
+                return None
+            return DecimalType(precision, scale)
+        if name in ("varchar", "fixed"):
+            length = self.integer()
+            if length is None or not self.expect(")"):
+                return None
+            return VarcharType(length) if name == "varchar" else FixedType(length)
+        return None
+
+    def parse_struct(self) -> Optional[ColumnType]:
+        """
+        Parses ``struct<name type, ...>``. Fields with quoting, comments or
+        NOT NULL constraints are left to the ANTLR grammar.
+        """
+        from datajunction_server.sql.parsing.ast import Name
+
+        if not self.expect("<"):
+            return None
+        fields = []
+        if self.expect(">"):
+            return StructType()
+        while True:
+            field_name = self.next()
+            if field_name is None or not field_name.isidentifier():
+                return None
+            self.expect(":")
+            field_type = self.parse_type()
+            if field_type is None:
+                return None
+            fields.append(NestedField(Name(field_name), field_type))
+            if self.expect(">"):
+                return StructType(*fields)
+            if not self.expect(","):
+                return None
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def parse_column_type(type_string: str) -> ColumnType:
+    """
+    Converts a type string into a `ColumnType`. Results are interned, so callers
+    receive a shared instance, which is why column types are frozen. Common types
+    are handled by a hand-written parser and only exotic type strings go through
+    ANTLR.
+    """
+    if column_type := _TypeStringParser.parse(type_string.strip()):
+        return column_type
+
+    from datajunction_server.sql.parsing.backends.antlr4 import parse_rule
+
+    return cast(ColumnType, parse_rule(type_string, "dataType"))
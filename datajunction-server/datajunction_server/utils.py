@@ -11,12 +11,12 @@ import re
 from functools import lru_cache
 from http import HTTPStatus
 
-from typing import AsyncIterator, List, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
 
 from dotenv import load_dotenv
 from fastapi import Depends
 from rich.logging import RichHandler
-from sqlalchemy import AsyncAdaptedQueuePool
+from sqlalchemy import AsyncAdaptedQueuePool, event
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import MissingGreenlet, OperationalError
 from sqlalchemy.ext.asyncio import (
@@ -25,6 +25,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session, SessionTransaction
 from sqlalchemy.sql import Select
 
 from starlette.requests import Request
@@ -250,6 +251,68 @@ async def session_context(request: Request = None) -> AsyncIterator[AsyncSession
         await gen.aclose()  # type: ignore
 
 
+@asynccontextmanager
+async def reader_session_context() -> AsyncIterator[AsyncSession]:
+    """
+    A session on the reader database
+    """
+    async with get_session_manager().reader_sessionmaker() as session:
+        yield session
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session: Session, flush_context) -> None:
+    session.info["flushed_changes"] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_flushed_changes(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("flushed_changes", None)
+
+
+def has_uncommitted_changes(session: AsyncSession) -> bool:
+    """
+    Whether the session has pending changes, or has flushed changes that it hasn't
+    committed yet, which other sessions can't see
+    """
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.info.get("flushed_changes"),
+    )
+
+
+T = TypeVar("T")
+
+
+async def gather_in_sessions(
+    session: AsyncSession,
+    funcs: List[Callable[[AsyncSession], Awaitable[T]]],
+    concurrency: int,
+) -> List[T]:
+    """
+    Run the functions concurrently, each with its own session on the reader database
+    and at most `concurrency` at a time, returning their results in order. The other
+    sessions don't share `session`'s ORM objects or see its uncommitted changes, so
+    the functions should take plain values like names and ids, and only return plain
+    values. A single function, or all of them if `session` has uncommitted changes,
+    run one at a time with `session`.
+    """
+    if len(funcs) <= 1 or has_uncommitted_changes(session):
+        return [await func(session) for func in funcs]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(func: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with semaphore:
+            async with reader_session_context() as task_session:
+                return await func(task_session)
+
+    return list(await asyncio.gather(*[run(func) for func in funcs]))
+
+
 async def refresh_if_needed(session: AsyncSession, obj, attributes: list[str]):
     """
     Conditionally refresh a list of attributes for a SQLAlchemy ORM object.
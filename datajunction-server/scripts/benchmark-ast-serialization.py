@@ -0,0 +1,150 @@
+"""
+Benchmarks storing precompiled query ASTs through `CompressedPickleType`: the stored
+size and the dump and load latency with each available compression codec.
+
+Usage: python scripts/benchmark-ast-serialization.py [repeat]
+"""
+
+import asyncio
+import io
+import sys
+import time
+
+import datajunction_server.database  # noqa: F401
+from datajunction_server.construction.precompiled import _ASTUnpickler, dump_query_ast
+from datajunction_server.database.column import Column
+from datajunction_server.database.node import (
+    CompressedPickleType,
+    Node,
+    NodeRevision,
+    lz4_frame,
+    zstandard,
+)
+from datajunction_server.errors import DJException
+from datajunction_server.models.node_type import NodeType
+from datajunction_server.sql.parsing import ast
+from datajunction_server.sql.parsing.backends.antlr4 import parse
+from datajunction_server.sql.parsing.types import IntegerType, StringType
+
+NODE_QUERY = """
+SELECT
+  o.order_id,
+  o.customer_id,
+  c.region,
+  CAST(o.ordered_at AS DATE) AS order_date,
+  CASE
+    WHEN o.status IN ('shipped', 'delivered') THEN 'fulfilled'
+    WHEN o.status = 'cancelled' THEN 'cancelled'
+    ELSE 'open'
+  END AS order_state,
+  SUM(li.quantity * (li.unit_price - COALESCE(li.discount, 0))) AS revenue,
+  COUNT(DISTINCT li.product_id) AS num_products
+FROM orders o
+JOIN customers c ON o.customer_id = c.customer_id
+LEFT JOIN line_items li ON (li.order_id = o.order_id AND li.is_deleted = false)
+WHERE o.ordered_at >= DATE_SUB(CURRENT_DATE(), 30)
+GROUP BY o.order_id, o.customer_id, c.region, CAST(o.ordered_at AS DATE), o.status
+"""
+
+# The DJ nodes that compiled queries reference, by name
+NODES: dict[str, Node] = {}
+
+
+def make_node(name: str, num_columns: int) -> Node:
+    """
+    A transient source node with an id column and `num_columns` string columns
+    """
+    node = Node(name=name, type=NodeType.SOURCE, current_version="v1")
+    node.current = NodeRevision(
+        name=name,
+        type=NodeType.SOURCE,
+        version="v1",
+        node=node,
+        columns=[Column(name="id", type=IntegerType(), order=0)]
+        + [
+            Column(name=f"{name}_col_{idx}", type=StringType(), order=idx + 1)
+            for idx in range(num_columns)
+        ],
+    )
+    return node
+
+
+async def compiled_join_query(num_joins: int, num_columns: int) -> ast.Query:
+    """
+    A compiled query selecting from a fact table joined to `num_joins` other tables
+    """
+    tables = [f"t{idx}" for idx in range(num_joins + 1)]
+    nodes = {table: make_node(table, num_columns) for table in tables}
+    projection = ", ".join(
+        f"a{idx % len(tables)}.{tables[idx % len(tables)]}_col_{idx % num_columns}"
+        for idx in range(num_columns * 2)
+    )
+    joins = " ".join(
+        f"JOIN {table} a{idx} ON a0.id = a{idx}.id"
+        for idx, table in enumerate(tables[1:], start=1)
+    )
+    query = parse(f"SELECT {projection} FROM t0 a0 {joins}")
+    await query.compile(
+        ast.CompileContext(
+            session=None,  # type: ignore
+            exception=DJException(),
+            dependencies_cache=nodes,
+            preloaded=set(nodes),
+        ),
+    )
+    NODES.update(nodes)
+    return query
+
+
+def mean_of(func, repeat: int) -> float:
+    """
+    The mean time of `repeat` calls in milliseconds
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def load(column_type: CompressedPickleType, value: bytes) -> ast.Query:
+    """
+    Load a stored precompiled AST
+    """
+    precompiled = column_type.loads(value)
+    return _ASTUnpickler(io.BytesIO(precompiled.payload), NODES, {}).load()
+
+
+async def benchmark(repeat: int = 50):
+    queries = {
+        "node query (~1KB)": parse(NODE_QUERY),
+        "compiled, 5 joins": await compiled_join_query(5, 20),
+        "compiled, 20 joins": await compiled_join_query(20, 20),
+    }
+    codecs = ["zlib"]
+    codecs += ["zstd"] if zstandard else []
+    codecs += ["lz4"] if lz4_frame else []
+    print(f"{'query':<20} {'codec':<6} {'size':>8} {'dump':>9} {'load':>9}")
+    revision = NodeRevision(name="transform", type=NodeType.TRANSFORM, version="v1")
+    for name, query in queries.items():
+        for codec in codecs:
+            column_type = CompressedPickleType(codec=codec)
+            value = column_type.dumps(dump_query_ast(revision, query))
+            assert str(load(column_type, value)) == str(query)
+            dump_time = mean_of(
+                lambda column_type=column_type, query=query: column_type.dumps(
+                    dump_query_ast(revision, query),
+                ),
+                repeat,
+            )
+            load_time = mean_of(
+                lambda column_type=column_type, value=value: load(column_type, value),
+                repeat,
+            )
+            print(
+                f"{name:<20} {codec:<6} {len(value):>8} {dump_time:>7.2f}ms "
+                f"{load_time:>7.2f}ms",
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
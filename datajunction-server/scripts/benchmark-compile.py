@@ -0,0 +1,88 @@
+"""
+Benchmarks compiling wide queries with many joins. Node metadata is preloaded into
+the compile context, so only column resolution is measured and no database is
+needed.
+
+Usage: python scripts/benchmark-compile.py [num_columns] [num_joins] [repeat]
+"""
+
+import asyncio
+import sys
+import time
+
+import datajunction_server.database  # noqa: F401
+from datajunction_server.database.column import Column
+from datajunction_server.database.node import Node, NodeRevision
+from datajunction_server.errors import DJException
+from datajunction_server.models.node_type import NodeType
+from datajunction_server.sql.parsing import ast
+from datajunction_server.sql.parsing.backends.antlr4 import parse
+from datajunction_server.sql.parsing.types import IntegerType, StringType
+
+COLUMNS_PER_TABLE = 20
+
+
+def make_node(name: str) -> Node:
+    """
+    A transient source node with `COLUMNS_PER_TABLE` columns
+    """
+    node = Node(name=name, type=NodeType.SOURCE, current_version="v1")
+    node.current = NodeRevision(
+        name=name,
+        type=NodeType.SOURCE,
+        version="v1",
+        node=node,
+        columns=[Column(name="id", type=IntegerType(), order=0)]
+        + [
+            Column(name=f"{name}_col_{idx}", type=StringType(), order=idx + 1)
+            for idx in range(COLUMNS_PER_TABLE)
+        ],
+    )
+    return node
+
+
+def build_query(num_columns: int, num_joins: int) -> str:
+    """
+    A query selecting `num_columns` columns across a fact table joined to
+    `num_joins` other tables, with a mix of qualified and unqualified references
+    """
+    tables = [f"t{idx}" for idx in range(num_joins + 1)]
+    projection = []
+    for idx in range(num_columns):
+        table_idx = idx % len(tables)
+        column = f"{tables[table_idx]}_col_{idx % COLUMNS_PER_TABLE}"
+        projection.append(
+            f"a{table_idx}.{column} AS c{idx}" if idx % 2 else f"{column} AS c{idx}",
+        )
+    joins = "\n".join(
+        f"JOIN {table} a{idx} ON a0.id = a{idx}.id"
+        for idx, table in enumerate(tables[1:], start=1)
+    )
+    return f"SELECT {', '.join(projection)}\nFROM {tables[0]} a0\n{joins}"
+
+
+async def benchmark(num_columns: int = 200, num_joins: int = 20, repeat: int = 5):
+    query = build_query(num_columns, num_joins)
+    nodes = {f"t{idx}": make_node(f"t{idx}") for idx in range(num_joins + 1)}
+    timings = []
+    for _ in range(repeat):
+        query_ast = parse(query)
+        ctx = ast.CompileContext(
+            session=None,  # type: ignore
+            exception=DJException(),
+            dependencies_cache=dict(nodes),
+            preloaded=set(nodes),
+        )
+        start = time.perf_counter()
+        await query_ast.compile(ctx)
+        timings.append(time.perf_counter() - start)
+        assert not ctx.exception.errors
+    print(
+        f"Compiled {num_columns} columns across {num_joins} joins: "
+        f"best {min(timings) * 1000:.1f}ms, "
+        f"mean {sum(timings) / len(timings) * 1000:.1f}ms",
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(*(int(arg) for arg in sys.argv[1:4])))
@@ -0,0 +1,105 @@
+"""
+Micro-benchmarks for parsing representative node queries, bypassing the parse
+caches. Reports the ANTLR parse time and the time spent converting the ANTLR
+tree into a DJ AST separately.
+
+Usage: python scripts/benchmark-parsing.py [repeat]
+"""
+
+import sys
+import time
+
+import datajunction_server.database  # noqa: F401
+from datajunction_server.sql.parsing.backends.antlr4 import parse_sql, visit
+
+NODE_QUERY = """
+SELECT
+  o.order_id,
+  o.customer_id,
+  c.region,
+  CAST(o.ordered_at AS DATE) AS order_date,
+  CASE
+    WHEN o.status IN ('shipped', 'delivered') THEN 'fulfilled'
+    WHEN o.status = 'cancelled' THEN 'cancelled'
+    ELSE 'open'
+  END AS order_state,
+  SUM(li.quantity * (li.unit_price - COALESCE(li.discount, 0))) AS revenue,
+  COUNT(DISTINCT li.product_id) AS num_products
+FROM orders o
+JOIN customers c ON o.customer_id = c.customer_id
+LEFT JOIN line_items li ON (li.order_id = o.order_id AND li.is_deleted = false)
+WHERE o.ordered_at >= DATE_SUB(CURRENT_DATE(), 30)
+GROUP BY o.order_id, o.customer_id, c.region, CAST(o.ordered_at AS DATE), o.status
+"""
+
+
+def wide_query(num_columns: int) -> str:
+    """
+    A SELECT with `num_columns` columns of mixed expressions
+    """
+    columns = []
+    for idx in range(num_columns):
+        if idx % 3 == 0:
+            columns.append(f"t.col_{idx}")
+        elif idx % 3 == 1:
+            columns.append(f"(t.col_{idx} + 1) * (t.col_{idx} - 2) AS expr_{idx}")
+        else:
+            columns.append(f"COALESCE(t.col_{idx}, 'n/a') AS coalesced_{idx}")
+    return f"SELECT {', '.join(columns)} FROM some_table t"
+
+
+def sized_query(num_bytes: int) -> str:
+    """
+    A query padded with extra projected expressions up to roughly `num_bytes`
+    """
+    num_columns = 1
+    while len(wide_query(num_columns)) < num_bytes:
+        num_columns *= 2
+    low, high = num_columns // 2, num_columns
+    while low < high:
+        mid = (low + high) // 2
+        if len(wide_query(mid)) < num_bytes:
+            low = mid + 1
+        else:
+            high = mid
+    return wide_query(low)
+
+
+def nested_case_query(depth: int) -> str:
+    """
+    A CASE expression nested `depth` levels deep
+    """
+    expr = "'leaf'"
+    for idx in range(depth):
+        expr = f"CASE WHEN (a > {idx}) THEN ({expr}) ELSE 'level_{idx}' END"
+    return f"SELECT {expr} AS nested FROM t"
+
+
+QUERIES = {
+    "node query (~1KB)": NODE_QUERY,
+    "10KB": sized_query(10_000),
+    "100KB": sized_query(100_000),
+    "nested CASE (depth 20)": nested_case_query(20),
+    "500-column SELECT": wide_query(500),
+}
+
+
+def benchmark(repeat: int = 3):
+    print(f"{'query':<24} {'size':>8} {'antlr':>10} {'visit':>10}")
+    for name, query in QUERIES.items():
+        antlr_times, visit_times = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tree = parse_sql(query, "singleStatement")
+            antlr_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            visit(tree)
+            visit_times.append(time.perf_counter() - start)
+        print(
+            f"{name:<24} {len(query):>8} "
+            f"{min(antlr_times) * 1000:>8.1f}ms {min(visit_times) * 1000:>8.1f}ms",
+        )
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
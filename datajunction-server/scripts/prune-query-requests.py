@@ -0,0 +1,43 @@
+"""
+Prunes the stored SQL in the query request table, keeping the most recently used
+requests. Meant to be run periodically, e.g. from cron.
+
+Usage: python scripts/prune-query-requests.py [max_requests] [max_unused_days]
+"""
+
+import asyncio
+import sys
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import datajunction_server.database  # noqa: F401
+from datajunction_server.database.queryrequest import QueryRequest
+from datajunction_server.utils import get_settings
+
+settings = get_settings()
+
+
+async def prune_query_requests(max_requests: int, max_unused_days: int | None):
+    engine = create_async_engine(settings.writer_db.uri)
+    async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with async_session() as session:
+        deleted = await QueryRequest.prune(
+            session,
+            max_requests=max_requests,
+            unused_for=timedelta(days=max_unused_days)
+            if max_unused_days is not None
+            else None,
+        )
+    print(f"Pruned {deleted} query requests")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        prune_query_requests(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else None,
+        ),
+    )
@@ -2,6 +2,7 @@
 Tests for the data API.
 """
 
+import json
 from typing import Dict, List, Optional, cast
 from unittest import mock
 
@@ -439,6 +440,56 @@ class TestDataForNode:
             "submitted_query": mock.ANY,
         }
 
+    @pytest.mark.asyncio
+    async def test_get_metric_data_as_arrow(
+        self,
+        module__client_with_roads,
+        module__query_service_client,
+    ) -> None:
+        """
+        Test that Arrow results are proxied from the query service as is, with the
+        column metadata in a header, and that JSON results are returned when the query
+        service can't return Arrow
+        """
+        with mock.patch.object(
+            module__query_service_client,
+            "submit_query_arrow",
+            return_value=iter([b"arrow ", b"stream"]),
+        ) as submit_query_arrow:
+            response = await module__client_with_roads.get(
+                "/data/default.num_repair_orders/",
+                headers={"Accept": "application/vnd.apache.arrow.stream"},
+            )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        assert response.content == b"arrow stream"
+        assert json.loads(response.headers["X-DJ-Columns"]) == [
+            {
+                "column": "default_DOT_num_repair_orders",
+                "name": "default_DOT_num_repair_orders",
+                "node": "default.num_repair_orders",
+                "semantic_entity": (
+                    "default.num_repair_orders.default_DOT_num_repair_orders"
+                ),
+                "semantic_type": "metric",
+                "type": "bigint",
+            },
+        ]
+        query_create = submit_query_arrow.call_args.args[0]
+        assert "default_DOT_num_repair_orders" in query_create.submitted_query
+
+        with mock.patch.object(
+            module__query_service_client,
+            "submit_query_arrow",
+            return_value=None,
+        ):
+            response = await module__client_with_roads.get(
+                "/data/default.num_repair_orders/",
+                headers={"Accept": "application/vnd.apache.arrow.stream"},
+            )
+        assert response.status_code == 200
+        assert response.json()["results"][0]["rows"] == [[25]]
+
     @pytest.mark.asyncio
     async def test_get_multiple_metrics_and_dimensions_data(
         self,
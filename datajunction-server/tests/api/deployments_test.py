@@ -13,7 +13,10 @@ from datajunction_server.models.deployment import (
     CubeSpec,
     DimensionJoinLinkSpec,
 )
+from sqlalchemy import select
+
 from datajunction_server.models.dimensionlink import JoinType
+from datajunction_server.database.dimensionreachability import DimensionReachability
 from datajunction_server.database.node import Node
 from datajunction_server.database.tag import Tag
 from datajunction_server.models.node import (
@@ -1377,6 +1380,65 @@ class TestDeployments:
             "status": "success",
         }
 
+    @pytest.mark.asyncio
+    async def test_deploy_links_refreshes_dimension_reachability(
+        self,
+        session,
+        client,
+        default_hard_hats,
+        default_us_states,
+        default_us_state,
+    ):
+        """
+        Test that deploying dimension links refreshes the materialized dimensions graph
+        paths of the linked nodes, so that they're never committed stale
+        """
+        namespace = "link_reachability"
+        dim_spec = DimensionSpec(
+            name="default.hard_hat",
+            query="""
+            SELECT
+                hard_hat_id,
+                state
+            FROM ${prefix}default.hard_hats
+            """,
+            primary_key=["hard_hat_id"],
+            owners=["dj"],
+            dimension_links=[
+                DimensionJoinLinkSpec(
+                    dimension_node="${prefix}default.us_state",
+                    join_type="inner",
+                    join_on="${prefix}default.hard_hat.state = ${prefix}default.us_state.state_short",
+                ),
+            ],
+        )
+        nodes_list = [dim_spec, default_hard_hats, default_us_states, default_us_state]
+        data = await deploy_and_wait(
+            client,
+            DeploymentSpec(namespace=namespace, nodes=nodes_list),
+        )
+        assert data["status"] == "success"
+        hard_hat = await Node.get_by_name(session, f"{namespace}.default.hard_hat")
+        us_state = await Node.get_by_name(session, f"{namespace}.default.us_state")
+
+        async def reachable_dimension_ids() -> set[int]:
+            statement = select(DimensionReachability.dimension_id).where(
+                DimensionReachability.node_id == hard_hat.id,  # type: ignore
+                DimensionReachability.depth >= 0,
+            )
+            return set((await session.execute(statement)).scalars())
+
+        assert us_state.id in await reachable_dimension_ids()  # type: ignore
+
+        # Removing the link refreshes the paths in the same deployment
+        dim_spec.dimension_links = []
+        data = await deploy_and_wait(
+            client,
+            DeploymentSpec(namespace=namespace, nodes=nodes_list),
+        )
+        assert data["status"] == "success"
+        assert us_state.id not in await reachable_dimension_ids()  # type: ignore
+
     @pytest.mark.asyncio
     async def test_deploy_with_dimension_link_update(
         self,
@@ -203,3 +203,47 @@ async def test_system_dimension_stats(module__client_with_system: AsyncClient) -
         {"name": "default.local_hard_hats_2", "indegree": 0, "cube_count": 0},
         {"name": "system.dj.nodes", "indegree": 0, "cube_count": 0},
     ]
+
+
+@pytest.mark.asyncio
+async def test_system_cache_stats(module__client_with_system: AsyncClient) -> None:
+    """
+    Test ``GET /system/caches``.
+    """
+    from datajunction_server.construction.precompiled import precompiled_stats
+    from datajunction_server.sql.parsing.backends.antlr4 import (
+        cached_parse,
+        parse_cache,
+    )
+
+    parse_cache.clear()
+    cached_parse("SELECT 1")
+    cached_parse("SELECT 1")
+    precompiled_stats.clear()
+    for outcome in ("hit", "hit", "hit", "stale"):
+        precompiled_stats.record(outcome)
+    response = await module__client_with_system.get("/system/caches")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "name": "parse",
+            "hits": 1,
+            "misses": 1,
+            "stale": None,
+            "hit_rate": 0.5,
+            "evictions": 0,
+            "maxsize": parse_cache.maxsize,
+            "currsize": 1,
+        },
+        {
+            "name": "precompiled_query_ast",
+            "hits": 3,
+            "misses": 0,
+            "stale": 1,
+            "hit_rate": 0.75,
+            "evictions": None,
+            "maxsize": None,
+            "currsize": None,
+        },
+    ]
@@ -56,6 +56,7 @@ from datajunction_server.database.engine import Engine
 from datajunction_server.database.user import User
 from datajunction_server.errors import DJQueryServiceClientEntityNotFound
 from datajunction_server.internal.access.authorization import validate_access
+from datajunction_server.internal.caching.query_cache_manager import QueryCacheManager
 from datajunction_server.models.access import AccessControl, ValidateAccessFn
 from datajunction_server.models.materialization import MaterializationInfo
 from datajunction_server.models.query import QueryCreate, QueryWithResults
@@ -123,11 +124,12 @@ def jwt_token() -> str:
 @pytest.fixture(autouse=True)
 def _init_cache() -> Generator[Any, Any, None]:
     """
-    Initialize FastAPI caching
+    Initialize FastAPI caching, and reset the versioned query key index afterwards
     """
     FastAPICache.init(InMemoryBackend())
     yield
     FastAPICache.reset()
+    QueryCacheManager._versioned_keys.clear()
 
 
 @pytest_asyncio.fixture
@@ -478,6 +480,8 @@ def patch_session_contexts(
             "datajunction_server.internal.nodes.session_context",
             "datajunction_server.internal.materializations.session_context",
             "datajunction_server.api.deployments.session_context",
+            "datajunction_server.sql.dag.session_context",
+            "datajunction_server.utils.reader_session_context",
         ]
         if use_patch
         else []
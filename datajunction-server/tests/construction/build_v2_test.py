@@ -620,6 +620,63 @@ async def test_dimension_join_path(
     assert path == []
 
 
+@pytest.mark.asyncio
+async def test_dimension_join_path_preloaded_graph():
+    """
+    Test that join paths are resolved in memory against a preloaded dimension
+    links graph, without touching the database.
+    """
+    dimensions = {}
+    for idx, name in enumerate(["shared.users", "shared.countries", "shared.regions"]):
+        dimensions[name] = Node(name=name, type=NodeType.DIMENSION)
+        dimensions[name].current = NodeRevision(
+            id=idx + 2,
+            name=name,
+            type=NodeType.DIMENSION,
+            version="v1",
+        )
+    fact = NodeRevision(id=1, name="agg.events", type=NodeType.TRANSFORM, columns=[])
+    users_link = DimensionLink(
+        id=1,
+        node_revision=fact,
+        dimension=dimensions["shared.users"],
+    )
+    countries_link = DimensionLink(
+        id=2,
+        node_revision=fact,
+        dimension=dimensions["shared.countries"],
+        role="home",
+    )
+    regions_link = DimensionLink(
+        id=3,
+        node_revision=dimensions["shared.countries"].current,
+        dimension=dimensions["shared.regions"],
+    )
+    links_graph = {1: [users_link, countries_link], 3: [regions_link]}
+
+    path = await dimension_join_path(
+        None,  # type: ignore
+        fact,
+        "shared.users.name",
+        links_graph=links_graph,
+    )
+    assert path == [users_link]
+    path = await dimension_join_path(
+        None,  # type: ignore
+        fact,
+        "shared.regions.name[home]",
+        links_graph=links_graph,
+    )
+    assert path == [countries_link, regions_link]
+    path = await dimension_join_path(
+        None,  # type: ignore
+        fact,
+        "shared.cities.name",
+        links_graph=links_graph,
+    )
+    assert path is None
+
+
 @pytest.mark.asyncio
 async def test_build_source_node(
     session: AsyncSession,
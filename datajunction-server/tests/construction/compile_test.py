@@ -7,6 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from datajunction_server.database.node import Node, NodeRevision
 from datajunction_server.errors import DJException
+from datajunction_server.internal.validation import (
+    create_compile_context_with_bulk_deps,
+    referenced_node_names,
+)
 from datajunction_server.sql.parsing.ast import CompileContext
 from datajunction_server.sql.parsing.backends.antlr4 import parse
 from datajunction_server.sql.parsing.backends.exceptions import DJParseException
@@ -216,3 +220,37 @@ async def test_having(construction_session: AsyncSession):
     query_ast = parse(node_a_rev.query)
     ctx = CompileContext(session=construction_session, exception=DJException())
     await query_ast.compile(ctx)
+
+
+@pytest.mark.asyncio
+async def test_compile_with_preloaded_dependencies(
+    construction_session: AsyncSession,
+    mocker,
+):
+    """
+    Test that compiling against a bulk loaded context resolves columns through the
+    dimension graph without going back to the database
+    """
+    query = parse(
+        "SELECT id, full_name, basic.dimension.users.age FROM basic.source.comments",
+    )
+    ctx = await create_compile_context_with_bulk_deps(
+        construction_session,
+        referenced_node_names(query),
+    )
+    assert {
+        "basic.source.comments",
+        "basic.dimension.users",
+    } <= ctx.dependencies_cache.keys()
+
+    execute = mocker.spy(construction_session, "execute")
+    refresh = mocker.spy(construction_session, "refresh")
+    await query.compile(ctx)
+    assert not ctx.exception.errors
+    assert execute.call_count == 0
+    assert refresh.call_count == 0
+    assert [str(col.type) for col in query.select.projection] == [
+        "int",
+        "string",
+        "int",
+    ]
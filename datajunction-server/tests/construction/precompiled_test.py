@@ -0,0 +1,171 @@
+"""
+Tests for precompiled query ASTs
+"""
+
+import pickle
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from datajunction_server.construction.precompiled import (
+    PrecompiledASTInfo,
+    PrecompiledQueryAST,
+    dump_query_ast,
+    load_precompiled_query_ast,
+    precompiled_stats,
+    save_precompiled_query_ast,
+)
+from datajunction_server.database.column import Column
+from datajunction_server.database.node import Node, NodeRevision
+from datajunction_server.errors import DJException
+from datajunction_server.internal.nodes import save_query_ast
+from datajunction_server.internal.validation import validate_node_data
+from datajunction_server.models.node_type import NodeType
+from datajunction_server.sql.parsing import ast
+from datajunction_server.sql.parsing.backends.antlr4 import parse
+from datajunction_server.sql.parsing.types import IntegerType
+
+
+@pytest.mark.asyncio
+async def test_dump_query_ast():
+    """
+    Test that a precompiled AST references DJ nodes by name and version only
+    """
+    source = Node(name="orders", type=NodeType.SOURCE, current_version="v3")
+    source.current = NodeRevision(
+        name="orders",
+        type=NodeType.SOURCE,
+        version="v3",
+        node=source,
+        columns=[Column(name="id", type=IntegerType(), order=0)],
+    )
+    ctx = ast.CompileContext(
+        session=None,  # type: ignore
+        exception=DJException(),
+        dependencies_cache={"orders": source},
+        preloaded={"orders"},
+    )
+    query = parse("SELECT id FROM orders")
+    await query.compile(ctx)
+
+    transform = NodeRevision(name="transform", type=NodeType.TRANSFORM, version="v1")
+    precompiled = dump_query_ast(transform, query)
+    assert precompiled.revisions == {"orders": "v3"}
+    assert precompiled.is_current(transform)
+    assert not precompiled.is_current(
+        NodeRevision(name="transform", type=NodeType.TRANSFORM, version="v2"),
+    )
+    with pytest.raises(pickle.UnpicklingError):
+        pickle.loads(precompiled.payload)
+
+    assert PrecompiledASTInfo(hits=3, misses=0, stale=1).hit_rate == 0.75
+    assert PrecompiledASTInfo(hits=0, misses=0, stale=0).hit_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_load_precompiled_query_ast(construction_session: AsyncSession):
+    """
+    Test loading a node's precompiled query AST, and that it goes stale when an
+    upstream node changes
+    """
+    node = await Node.get_by_name(construction_session, "basic.transform.country_agg")
+    await save_precompiled_query_ast(construction_session, node.current)  # type: ignore
+    await construction_session.commit()
+    assert isinstance(node.current.query_ast, PrecompiledQueryAST)  # type: ignore
+
+    precompiled_stats.clear()
+    query = await load_precompiled_query_ast(
+        construction_session,
+        node.current,  # type: ignore
+    )
+    assert query is not None and query.is_compiled()
+    table = query.select.from_.relations[0].primary  # type: ignore
+    assert table.dj_node.name == "basic.source.users"  # type: ignore
+    assert precompiled_stats.info() == PrecompiledASTInfo(hits=1, misses=0, stale=0)
+
+    upstream = await Node.get_by_name(construction_session, "basic.source.users")
+    upstream.current.version = "2"  # type: ignore
+    await construction_session.commit()
+    assert (
+        await load_precompiled_query_ast(
+            construction_session,
+            node.current,  # type: ignore
+        )
+        is None
+    )
+    assert precompiled_stats.info() == PrecompiledASTInfo(hits=1, misses=0, stale=1)
+
+
+@pytest.mark.asyncio
+async def test_save_query_ast(construction_session: AsyncSession, mocker):
+    """
+    Test the background task that persists a node's precompiled query AST, and that
+    the persisted AST can be reloaded
+    """
+
+    @asynccontextmanager
+    async def session_context():
+        yield construction_session
+
+    mocker.patch(
+        "datajunction_server.internal.nodes.session_context",
+        session_context,
+    )
+    await save_query_ast("basic.transform.country_agg")
+    await save_query_ast("basic.transform.missing")
+
+    node = await Node.get_by_name(construction_session, "basic.transform.country_agg")
+    await construction_session.refresh(node.current, ["query_ast"])  # type: ignore
+    assert isinstance(node.current.query_ast, PrecompiledQueryAST)  # type: ignore
+    query = await load_precompiled_query_ast(
+        construction_session,
+        node.current,  # type: ignore
+    )
+    assert query is not None and query.is_compiled()
+    table = query.select.from_.relations[0].primary  # type: ignore
+    assert table.dj_node.name == "basic.source.users"  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_validate_node_data_precompile(construction_session: AsyncSession):
+    """
+    Test that the query AST compiled to validate a node can be used as its precompiled
+    query AST, except when baking CTEs changed it
+    """
+    node = await Node.get_by_name(construction_session, "basic.transform.country_agg")
+    await save_precompiled_query_ast(construction_session, node.current)  # type: ignore
+    await construction_session.commit()
+    saved = await load_precompiled_query_ast(
+        construction_session,
+        node.current,  # type: ignore
+    )
+
+    validator = await validate_node_data(
+        node.current,  # type: ignore
+        construction_session,
+        precompile=True,
+    )
+    assert validator.precompiled_query_ast is not None
+    node.current.query_ast = validator.precompiled_query_ast  # type: ignore
+    await construction_session.commit()
+    validated = await load_precompiled_query_ast(
+        construction_session,
+        node.current,  # type: ignore
+    )
+    assert validated is not None and validated.is_compiled()
+    assert str(validated) == str(saved)
+
+    with_ctes = NodeRevision(
+        name="basic.transform.with_ctes",
+        type=NodeType.TRANSFORM,
+        version="v1",
+        query="WITH t AS (SELECT 1 AS a) SELECT a FROM t",
+    )
+    with_ctes.node = Node(name=with_ctes.name, type=NodeType.TRANSFORM)
+    validator = await validate_node_data(
+        with_ctes,
+        construction_session,
+        precompile=True,
+    )
+    assert validator.precompiled_query_ast is None
@@ -0,0 +1,43 @@
+"""
+Tests for the dimension link database schema
+"""
+
+from datajunction_server.database.dimensionlink import DimensionLink, _join_keys
+from datajunction_server.database.node import Node, NodeRevision
+from datajunction_server.models.dimensionlink import JoinType
+from datajunction_server.models.node_type import NodeType
+from datajunction_server.sql.parsing import ast
+
+
+def test_join_asts_and_keys_are_cached():
+    """
+    Test that the join query is parsed once per link definition, and that callers
+    mutating the join AST don't affect later reads
+    """
+    link = DimensionLink(
+        node_revision=NodeRevision(name="default.orders", type=NodeType.SOURCE),
+        dimension=Node(name="default.users", type=NodeType.DIMENSION),
+        join_sql=(
+            "default.orders.user_id = default.users.id AND default.orders.region = 'US'"
+        ),
+        join_type=JoinType.LEFT,
+    )
+    _join_keys.cache_clear()
+    assert link.foreign_keys == {
+        "default.orders.user_id": "default.users.id",
+        "default.orders.region": None,
+    }
+    assert link.foreign_keys_reversed == {"default.users.id": "default.orders.user_id"}
+    assert link.foreign_key_column_names == {"user_id", "region"}
+    assert _join_keys.cache_info().misses == 1
+
+    join_ast = link.joins()[0]
+    for col in join_ast.find_all(ast.Column):
+        col.name = ast.Name("renamed")
+    assert "renamed" not in str(link.join_sql_ast())
+
+    # Changing the join SQL is picked up on the next read
+    link.join_sql = "default.orders.account_id = default.users.id"
+    assert link.foreign_keys_reversed == {
+        "default.users.id": "default.orders.account_id",
+    }
@@ -0,0 +1,44 @@
+"""
+Tests for the node database schema
+"""
+
+import pickle
+import zlib
+
+import pytest
+
+from datajunction_server.database import node
+from datajunction_server.database.node import (
+    ZSTD_MAGIC,
+    CompressedPickleType,
+    MissingCompressionCodec,
+    compress,
+)
+from datajunction_server.sql.parsing.backends.antlr4 import parse
+
+
+def test_compressed_pickle_type(monkeypatch, caplog):
+    """
+    Test that values round trip through the compressed pickle type, including
+    values written before the compression codec became configurable
+    """
+    query = parse("SELECT a, b + 1 AS c FROM t WHERE a > 2")
+    column_type = CompressedPickleType(codec="zlib")
+    value = column_type.process_bind_param(query, None)
+    assert str(column_type.process_result_value(value, None)) == str(query)
+
+    legacy_value = zlib.compress(pickle.dumps(query))
+    assert str(column_type.process_result_value(legacy_value, None)) == str(query)
+
+    # Codecs whose package isn't installed can't be written with, and values written
+    # with them are read as missing, so that they get recompiled
+    monkeypatch.setattr(node, "zstandard", None)
+    monkeypatch.setattr(node, "lz4_frame", None)
+    for codec in ("zstd", "lz4"):
+        with pytest.raises(MissingCompressionCodec):
+            CompressedPickleType(codec=codec).process_bind_param(query, None)
+    assert column_type.process_result_value(ZSTD_MAGIC + b"data", None) is None
+    assert "Failed to decompress" in caplog.text
+
+    with pytest.raises(ValueError):
+        compress(b"data", "brotli")
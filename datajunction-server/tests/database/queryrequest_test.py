@@ -1,9 +1,20 @@
+from dataclasses import replace
+from datetime import timedelta
+from unittest.mock import patch
+
 import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from datajunction_server.database.queryrequest import (
+    QueryBuildType,
+    QueryRequest,
+    QueryRequestKey,
     VersionedNodeKey,
     VersionedQueryKey,
 )
 from datajunction_server.database.node import Node
+from datajunction_server.sql.parsing.backends.antlr4 import parse
 
 
 def test_str_with_version():
@@ -377,3 +388,87 @@ async def test_version_query_request_filter_on_dim_role(
         filters=[f"default.hard_hat.state[stuff]@{hard_hat.current_version} = 'NY'"],
         orderby=[],
     )
+
+
+def test_version_filters_memoized():
+    """
+    Test versioning filters against already looked up nodes, including metric and
+    role references, and that filters are only parsed once
+    """
+    nodes_by_name = {
+        "default.hard_hat": Node(name="default.hard_hat", current_version="v1.1"),
+        "default.num_repair_orders": Node(
+            name="default.num_repair_orders",
+            current_version="v2.0",
+        ),
+    }
+    filters = [
+        "default.hard_hat.state[manager] = 'CA' AND default.num_repair_orders > 5",
+        "default.unknown.state = 'CA'",
+    ]
+    assert VersionedQueryKey._filter_names(filters) >= {
+        "default.hard_hat.state",
+        "default.hard_hat",
+        "default.num_repair_orders",
+        "default",
+        "default.unknown.state",
+        "default.unknown",
+    }
+    with patch("datajunction_server.database.queryrequest.parse") as parse_mock:
+        parse_mock.side_effect = parse
+        versioned = VersionedQueryKey._version_filters(filters, nodes_by_name)
+        assert VersionedQueryKey._version_filters(filters, nodes_by_name) == versioned
+    assert versioned == [
+        "default.hard_hat.state[manager]@v1.1 = 'CA' AND "
+        "default.num_repair_orders@v2.0 > 5",
+        "default.unknown.state = 'CA'",
+    ]
+    assert parse_mock.call_count <= 2
+
+
+@pytest.mark.asyncio
+async def test_save_and_use_query_request(session: AsyncSession):
+    """
+    Test storing built SQL for a versioned query request, looking it up again, and
+    pruning the least recently used requests
+    """
+    versioned = VersionedQueryKey(
+        nodes=[VersionedNodeKey("default.num_repair_orders", "v1.0")],
+        parents=[VersionedNodeKey("default.repair_orders", "v1.0")],
+        dimensions=[VersionedNodeKey("default.hard_hat.state", "v1.0")],
+        filters=[],
+        orderby=[],
+    )
+    request_key = QueryRequestKey(
+        key=versioned,
+        query_type=QueryBuildType.METRICS,
+        engine_name="",
+        engine_version="",
+        limit=None,
+        include_all_columns=False,
+        preaggregate=False,
+        use_materialized=True,
+        query_parameters={},
+        other_args={},
+    )
+    assert await QueryRequest.use(session, request_key) is None
+
+    await QueryRequest.save(session, request_key, "SELECT 1", [], {"sql": "SELECT 1"})
+    await QueryRequest.save(session, request_key, "SELECT 2", [], {"sql": "SELECT 2"})
+    stored = await QueryRequest.use(session, request_key)
+    assert stored == {"query": "SELECT 2", "columns": [], "result": {"sql": "SELECT 2"}}
+
+    # Requests that differ only in their other args are stored separately
+    other_request_key = replace(request_key, use_materialized=False)
+    assert await QueryRequest.use(session, other_request_key) is None
+    await QueryRequest.save(session, other_request_key, "SELECT 3", [])
+    query_request = (
+        await session.execute(
+            select(QueryRequest).where(QueryRequest.query == "SELECT 2"),
+        )
+    ).scalar_one()
+    assert query_request.hit_count == 1
+
+    assert await QueryRequest.prune(session, max_requests=1) == 1
+    assert await QueryRequest.use(session, other_request_key) is not None
+    assert await QueryRequest.prune(session, 10, unused_for=timedelta(0)) == 1
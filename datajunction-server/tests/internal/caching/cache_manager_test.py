@@ -2,6 +2,9 @@
 Tests for cache manager
 """
 
+import asyncio
+import time
+
 from fastapi import BackgroundTasks
 import pytest
 from datajunction_server.internal.caching.cachelib_cache import CachelibCache
@@ -183,3 +186,179 @@ async def test_background_refresh_updates_cache():
     # After refresh, the cache should be updated with fresh value
     stored = cache.get(key)
     assert stored["fresh"] is True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_coalesced():
+    """
+    Concurrent misses for the same key should wait on a single fallback call, and
+    only that call should store its result.
+    """
+    release = asyncio.Event()
+    calls = []
+
+    class SlowCacheManager(RefreshAheadCacheManager):
+        async def fallback(self, request, params):
+            calls.append(params)
+            await release.wait()
+            return {"fresh": True, "params": params}
+
+    cache = CachelibCache()
+    background = BackgroundTasks()
+    request = DummyRequest()
+    loads = [
+        asyncio.create_task(
+            SlowCacheManager(cache).get_or_load(background, request, {"a": 1}),
+        )
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*loads)
+
+    assert len(calls) == 1
+    assert all(result == {"fresh": True, "params": {"a": 1}} for result in results)
+    assert len(background.tasks) == 1
+    assert not RefreshAheadCacheManager._inflight
+
+
+@pytest.mark.asyncio
+async def test_coalesced_miss_failure():
+    """
+    A failing fallback should fail every caller waiting on it, and not block later loads.
+    """
+    release = asyncio.Event()
+
+    class FailingCacheManager(RefreshAheadCacheManager):
+        async def fallback(self, request, params):
+            await release.wait()
+            raise ValueError("failed")
+
+    cm = FailingCacheManager(CachelibCache())
+    loads = [
+        asyncio.create_task(cm.get_or_load(BackgroundTasks(), DummyRequest(), {"a": 2}))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*loads, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not RefreshAheadCacheManager._inflight
+
+
+@pytest.mark.asyncio
+async def test_coalesced_miss_leader_cancelled():
+    """
+    Cancelling the caller that started a load should not cancel it for the callers
+    waiting on it, and its result should still be stored.
+    """
+    release = asyncio.Event()
+
+    class SlowCacheManager(RefreshAheadCacheManager):
+        async def fallback(self, request, params):
+            await release.wait()
+            return {"fresh": True, "params": params}
+
+    cache = CachelibCache()
+    request = DummyRequest()
+    leader = asyncio.create_task(
+        SlowCacheManager(cache).get_or_load(BackgroundTasks(), request, {"a": 3}),
+    )
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(
+        SlowCacheManager(cache).get_or_load(BackgroundTasks(), request, {"a": 3}),
+    )
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiter == {"fresh": True, "params": {"a": 3}}
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    await asyncio.gather(*RefreshAheadCacheManager._saving)
+    key = await SlowCacheManager(cache).build_cache_key(request, {"a": 3})
+    assert cache.get(key) == {"fresh": True, "params": {"a": 3}}
+    assert not RefreshAheadCacheManager._inflight
+
+
+@pytest.mark.asyncio
+async def test_refresh_after_soft_ttl(mocker):
+    """
+    Served values should only be refreshed once their soft TTL has elapsed, and at most
+    one refresh per key should be scheduled at a time.
+    """
+
+    class SoftTTLCacheManager(ExampleCacheManager):
+        refresh_after = 60
+
+    cache = CachelibCache()
+    cm = SoftTTLCacheManager(cache)
+    request = DummyRequest()
+    params = {"soft": "ttl"}
+
+    background = BackgroundTasks()
+    await cm.get_or_load(background, request, params)
+    for task in background.tasks:
+        await task()
+
+    # Within the soft TTL, hits don't refresh
+    background = BackgroundTasks()
+    await cm.get_or_load(background, request, params)
+    assert not background.tasks
+
+    # Once the soft TTL (plus jitter) has elapsed, only one refresh is scheduled
+    now = time.time()
+    mocker.patch(
+        "datajunction_server.internal.caching.cache_manager.time.time",
+        return_value=now + 60 * (1 + cm.refresh_jitter) + 1,
+    )
+    background = BackgroundTasks()
+    await cm.get_or_load(background, request, params)
+    await cm.get_or_load(background, request, params)
+    assert len(background.tasks) == 1
+    for task in background.tasks:
+        await task()
+    assert not RefreshAheadCacheManager._refreshing
+
+
+@pytest.mark.asyncio
+async def test_durable_second_level():
+    """
+    Loaded values should be written behind to the durable store, which should be
+    checked on cache misses before falling back.
+    """
+    store: dict = {}
+
+    class DurableCacheManager(ExampleCacheManager):
+        async def get_persisted(self, key, request):
+            return store.get(key)
+
+        async def persist(self, key, result):
+            store[key] = {**result, "fresh": False}
+
+    request = DummyRequest()
+    params = {"durable": True}
+    background = BackgroundTasks()
+    result = await DurableCacheManager(CachelibCache()).get_or_load(
+        background,
+        request,
+        params,
+    )
+    assert result["fresh"]
+    for task in background.tasks:
+        await task()
+    assert len(store) == 1
+
+    # A manager with an empty cache (e.g., in another worker) serves the stored value,
+    # and caches it to be refreshed the next time it's served
+    cache = CachelibCache()
+    cm = DurableCacheManager(cache)
+    background = BackgroundTasks()
+    result = await cm.get_or_load(background, request, params)
+    assert not result["fresh"]
+    for task in background.tasks:
+        await task()
+    key = await cm.build_cache_key(request, params)
+    assert cache.get(key) == result
+    assert cm._should_refresh(key)
@@ -2,12 +2,75 @@
 Tests for cachelib cache implementation
 """
 
+import time
+
+from cachelib.redis import RedisCache
 from starlette.requests import Headers, Request
 
 from datajunction_server.internal.caching.cachelib_cache import CachelibCache, get_cache
+from datajunction_server.internal.caching.lru_cache import LRUCache
 from datajunction_server.internal.caching.noop_cache import NoOpCache
 
 
+class LocalRedis:
+    """
+    A local stand-in for a Redis client, supporting the commands cachelib uses
+    """
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def set(self, name, value):
+        self.data[name] = value
+        return True
+
+    def setex(self, name, value, time):
+        return self.set(name, value)
+
+    def delete(self, *names):
+        return sum(self.data.pop(name, None) is not None for name in names)
+
+    def zadd(self, name, mapping):
+        self.data.setdefault(name, {}).update(mapping)
+
+    def zremrangebyscore(self, name, min, max):
+        zset = self.data.get(name, {})
+        for member, score in list(zset.items()):
+            if score <= max:
+                del zset[member]
+
+    def expire(self, name, time):
+        return name in self.data
+
+    def zrange(self, name, start, end):
+        zset = self.data.get(name, {})
+        return [member.encode() for member in sorted(zset, key=zset.__getitem__)]
+
+    def pipeline(self, transaction=True):
+        return LocalPipeline(self)
+
+
+class LocalPipeline:
+    """
+    A local stand-in for a Redis pipeline, which runs the queued commands in order
+    """
+
+    def __init__(self, client: LocalRedis):
+        self.client = client
+        self.commands: list = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append(
+            (getattr(self.client, name), args, kwargs),
+        )
+
+    def execute(self):
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
 def test_cachelib_cache():
     """
     Test getting, setting, and deleting using the cachelib implementation
@@ -19,6 +82,89 @@ def test_cachelib_cache():
     assert cache.get(key="foo") is None
 
 
+def test_lru_cache():
+    """
+    Test that the LRU backend evicts the least recently used values when full
+    """
+    cache = CachelibCache(LRUCache(threshold=2))
+    cache.set("a", [1])
+    cache.set("b", [2])
+    cache.get("a")[0] = 3  # cached values can't be mutated through get
+    assert cache.get("a") == [1]
+    cache.set("c", [3])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1] and cache.get("c") == [3]
+
+    cache.set("expired", 1, timeout=-1)
+    assert cache.get("expired") is None
+    assert cache.cache.add("c", 4) is False and cache.cache.has("c")
+    assert cache.cache.clear() and cache.get("c") is None
+
+
+def test_delete_by_nodes():
+    """
+    Test evicting cached values by the nodes they depend on, with both an in-process
+    and a shared backend
+    """
+    for backend in (LRUCache(), RedisCache(host=LocalRedis(), key_prefix="dj-sql:")):
+        cache = CachelibCache(backend)
+        cache.set("sql:1", "SELECT 1")
+        cache.set("sql:2", "SELECT 2")
+        cache.set("sql:3", "SELECT 3")
+        cache.index_by_nodes(["sql:1"], ["default.a", "default.b"])
+        cache.index_by_nodes(["sql:2"], ["default.b"])
+        cache.index_by_nodes(["sql:3"], ["default.c"])
+
+        assert cache.delete_by_nodes(["default.b"]) == 2
+        assert cache.get("sql:1") is None and cache.get("sql:2") is None
+        assert cache.get("sql:3") == "SELECT 3"
+        assert cache.delete_by_nodes(["default.a", "default.missing"]) == 0
+        assert cache.delete_by_nodes(["default.c"]) == 1
+        assert cache.get("sql:3") is None
+
+        # Evicting other values never evicts the index of a value still cached
+        cache.set("sql:4", "SELECT 4")
+        cache.index_by_nodes(["sql:4"], ["default.d"])
+        for i in range(1000):
+            cache.set(f"other:{i}", i)
+            assert cache.get("sql:4") == "SELECT 4"
+        assert cache.delete_by_nodes(["default.d"]) == 1
+
+
+def test_node_index_pruned_on_eviction():
+    """
+    Test that keys are pruned from the in-process node index when their values are
+    evicted or deleted
+    """
+    cache = CachelibCache(LRUCache(threshold=2))
+    for key in ("sql:1", "sql:2", "sql:3"):
+        cache.set(key, key)
+        cache.index_by_nodes([key], ["default.hub"])
+    index = cache.node_index
+    assert index._keys_by_node == {"default.hub": {"sql:2", "sql:3"}}  # type: ignore
+
+    cache.delete("sql:2")
+    cache.set("sql:4", "sql:4", timeout=-1)
+    cache.get("sql:4")
+    assert index._keys_by_node == {"default.hub": {"sql:3"}}  # type: ignore
+    assert set(index._nodes_by_key) == {"sql:3"}  # type: ignore
+
+
+def test_redis_node_index_prunes_expired_keys(mocker):
+    """
+    Test that expired keys are pruned from a node's set in Redis when keys are added
+    """
+    redis = LocalRedis()
+    cache = CachelibCache(RedisCache(host=redis, key_prefix="dj-sql:"))
+    cache.index_by_nodes(["sql:1"], ["default.hub"], timeout=60)
+    mocker.patch(
+        "datajunction_server.internal.caching.node_index.time.time",
+        return_value=time.time() + 120,
+    )
+    cache.index_by_nodes(["sql:2"], ["default.hub"], timeout=60)
+    assert list(redis.data["dj-sql:node-keys:default.hub"]) == ["sql:2"]
+
+
 def test_cachelib_cache_nocache_headers():
     """Test cachelib cache with various request headers"""
 
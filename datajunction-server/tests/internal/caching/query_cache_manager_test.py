@@ -61,6 +61,75 @@ async def test_build_cache_key_calls_versioning():
         assert key.startswith("sql:measures:")
 
 
+@pytest.mark.asyncio
+async def test_build_cache_key_pre_key_index():
+    """
+    Versioned keys should be reused from the pre-key index until a node they were
+    built from changes version.
+    """
+    versions = {"foo": "v1", "dim1": None}
+
+    async def version_query_request(**kwargs):
+        kwargs["versions"].update(versions)
+        return f"versioned-{versions['foo']}"
+
+    with (
+        patch(
+            "datajunction_server.internal.caching.query_cache_manager.VersionedQueryKey.version_query_request",
+            side_effect=version_query_request,
+        ) as version_query_request_mock,
+        patch(
+            "datajunction_server.internal.caching.query_cache_manager.VersionedQueryKey.current_versions",
+            side_effect=lambda session, names: dict(versions),
+        ) as current_versions_mock,
+    ):
+        manager = QueryCacheManager(CachelibCache(), QueryBuildType.MEASURES)
+        params = QueryRequestParams(
+            nodes=["foo"],
+            dimensions=["dim1.attr"],
+            filters=[],
+        )
+        key = await manager.build_cache_key(DummyRequest(), params)
+        assert await manager.build_cache_key(DummyRequest(), params) == key
+        assert version_query_request_mock.call_count == 1
+        assert current_versions_mock.call_count == 1
+
+        versions["foo"] = "v2"
+        assert await manager.build_cache_key(DummyRequest(), params) != key
+        assert version_query_request_mock.call_count == 2
+
+        manager.versioned_key_index_size = 1
+        other_params = QueryRequestParams(nodes=["bar"], dimensions=[], filters=[])
+        await manager.build_cache_key(DummyRequest(), other_params)
+        assert len(QueryCacheManager._versioned_keys) == 1
+
+
+@pytest.mark.asyncio
+async def test_stored_sql_evicted_by_node():
+    """
+    Stored SQL should be indexed by the nodes it was built from, so that it can be
+    evicted when any of them are updated.
+    """
+
+    async def version_query_request(**kwargs):
+        kwargs["versions"].update({"foo": "v1", "default": None})
+        return "versioned123"
+
+    with patch(
+        "datajunction_server.internal.caching.query_cache_manager.VersionedQueryKey.version_query_request",
+        side_effect=version_query_request,
+    ):
+        cache = CachelibCache()
+        manager = QueryCacheManager(cache, QueryBuildType.MEASURES)
+        params = QueryRequestParams(nodes=["foo"], dimensions=[], filters=[])
+        key = await manager.build_cache_key(DummyRequest(), params)
+        manager._store(key, [{"sql": "SELECT 1"}])
+        assert cache.delete_by_nodes(["default"]) == 0
+
+        assert cache.delete_by_nodes(["foo"]) == 2
+        assert cache.get(key) is None
+
+
 @pytest.mark.asyncio
 async def test_fallback_calls_get_measures_query():
     """
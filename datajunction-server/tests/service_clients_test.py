@@ -333,6 +333,51 @@ class TestQueryServiceClient:
             },
         )
 
+    def test_query_service_client_submit_query_arrow(
+        self,
+        mocker: MockerFixture,
+    ) -> None:
+        """
+        Test submitting a query for Arrow results to a query service client.
+        """
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = iter([b"arrow ", b"stream"])
+        mock_request = mocker.patch(
+            "datajunction_server.service_clients.RequestsSessionWithEndpoint.post",
+            return_value=mock_response,
+        )
+
+        query_service_client = QueryServiceClient(uri=self.endpoint)
+        query_create = QueryCreate(
+            catalog_name="default",
+            engine_name="postgres",
+            engine_version="15.2",
+            submitted_query="SELECT 1",
+            async_=False,
+        )
+        stream = query_service_client.submit_query_arrow(
+            query_create,
+            request_headers={"accept": "*/*", "accept-encoding": "gzip"},
+        )
+        assert b"".join(stream) == b"arrow stream"  # type: ignore
+        assert mock_request.call_args.kwargs["headers"]["accept"] == (
+            "application/vnd.apache.arrow.stream"
+        )
+        assert "accept-encoding" not in mock_request.call_args.kwargs["headers"]
+        assert mock_request.call_args.kwargs["stream"] is True
+
+        # Query services that can't return Arrow results
+        mock_response.status_code = 406
+        assert query_service_client.submit_query_arrow(query_create) is None
+        mock_response.close.assert_called_once()
+
+        mock_response.status_code = 500
+        mock_response.json.return_value = {"errors": ["Query failed"]}
+        with pytest.raises(DJQueryServiceClientException) as exc_info:
+            query_service_client.submit_query_arrow(query_create)
+        assert exc_info.value.errors[0].message == "Query failed"
+
     def test_query_service_client_get_query(self, mocker: MockerFixture) -> None:
         """
         Test getting a previously submitted query from a query service client.
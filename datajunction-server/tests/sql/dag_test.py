@@ -2,9 +2,11 @@
 Tests for ``datajunction_server.sql.dag``.
 """
 
+import asyncio
 import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from datajunction_server.database.column import Column
@@ -12,17 +14,40 @@ from datajunction_server.database.database import Database
 from datajunction_server.database.node import Node, NodeRevision
 from datajunction_server.database.user import User
 from datajunction_server.database.dimensionlink import DimensionLink
+from datajunction_server.config import Settings
 from datajunction_server.errors import DJException
 from datajunction_server.models.node import DimensionAttributeOutput, NodeType
 from datajunction_server.sql.dag import (
+    DIMENSION_REACHABILITY_LOCK,
+    NODE_LOCK_BUCKETS,
+    _background_refreshes,
+    _bfs_fetch_children,
+    _lock_nodes,
+    _refresh_in_background,
+    get_dimension_dependents,
     get_dimensions,
+    get_descendant_ids,
     get_downstream_nodes,
+    get_materialized_dimension_paths,
+    get_materialized_downstream_nodes,
+    get_materialized_upstream_nodes,
+    get_upstream_nodes,
+    refresh_dimension_reachability,
+    refresh_node_lineage,
+    sync_node_lineage_versions,
     topological_sort,
     get_dimension_dag_indegree,
 )
 from datajunction_server.sql.parsing.types import IntegerType, StringType
 
 
+async def wait_for_background_refreshes() -> None:
+    """
+    Wait for the refreshes scheduled by reads of stale materialized lineage
+    """
+    await asyncio.gather(*_background_refreshes.values())
+
+
 @pytest.mark.asyncio
 async def test_get_dimensions(session: AsyncSession, current_user: User) -> None:
     """
@@ -118,6 +143,295 @@ async def test_get_dimensions(session: AsyncSession, current_user: User) -> None
     ]
 
 
+@pytest.mark.asyncio
+async def test_dimension_reachability(
+    session: AsyncSession,
+    current_user: User,
+    settings: Settings,
+) -> None:
+    """
+    Test that a node's dimensions graph paths are materialized, read back with the
+    same dimensions as the recursive query, and go stale when the graph changes.
+    """
+    dimension_ref = Node(
+        name="B",
+        type=NodeType.DIMENSION,
+        current_version="1",
+        created_by_id=current_user.id,
+    )
+    dimension_ref.current = NodeRevision(
+        node=dimension_ref,
+        name=dimension_ref.name,
+        type=dimension_ref.type,
+        display_name="B",
+        version="1",
+        columns=[
+            Column(name="id", type=IntegerType(), order=0),
+            Column(name="attribute", type=StringType(), order=1),
+        ],
+        created_by_id=current_user.id,
+    )
+    parent_ref = Node(
+        name="A",
+        current_version="1",
+        type=NodeType.SOURCE,
+        created_by_id=current_user.id,
+    )
+    parent_ref.current = NodeRevision(
+        node=parent_ref,
+        name=parent_ref.name,
+        type=parent_ref.type,
+        display_name="A",
+        version="1",
+        columns=[
+            Column(name="ds", type=StringType(), order=0),
+            Column(name="b_id", type=IntegerType(), dimension=dimension_ref, order=1),
+        ],
+        created_by_id=current_user.id,
+    )
+    session.add_all([dimension_ref, parent_ref])
+    await session.commit()
+
+    expected = await get_dimensions(session, parent_ref)
+    assert [dim.name for dim in expected] == ["B.attribute", "B.id"]
+    assert await get_dimension_dependents(session, [dimension_ref.id]) == {
+        parent_ref.id,
+    }
+
+    # Refreshing the dimension node refreshes the nodes that reach it
+    await refresh_dimension_reachability(session, [dimension_ref.id])
+    await session.commit()
+    assert await get_materialized_dimension_paths(session, parent_ref.current)
+    assert await get_dimensions(session, parent_ref) == expected
+
+    # Deactivating the dimension node makes the materialized paths stale
+    dimension_ref.deactivated_at = datetime.datetime.now(datetime.timezone.utc)
+    await session.commit()
+    with patch(
+        "datajunction_server.sql.dag.refresh_dimension_reachability",
+        new_callable=AsyncMock,
+    ) as refresh:
+        assert (
+            await get_materialized_dimension_paths(session, parent_ref.current) is None
+        )
+        await wait_for_background_refreshes()
+        refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_lock_nodes(session: AsyncSession) -> None:
+    """
+    Test that the advisory locks taken for a refresh are bounded however many nodes it
+    covers, including nodes with ids beyond the range of 32-bit integers.
+    """
+    node_ids = [*range(1, 5000), 2**40 + 1]
+    assert await _lock_nodes(session, DIMENSION_REACHABILITY_LOCK, node_ids)
+    assert await _lock_nodes(
+        session,
+        DIMENSION_REACHABILITY_LOCK,
+        node_ids,
+        wait=False,
+    )
+    locks = await session.execute(
+        text(
+            "SELECT count(*) FROM pg_locks "
+            "WHERE locktype = 'advisory' AND pid = pg_backend_pid()",
+        ),
+    )
+    assert locks.scalar() == NODE_LOCK_BUCKETS
+    await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_node_lineage(
+    session: AsyncSession,
+    current_user: User,
+    settings: Settings,
+) -> None:
+    """
+    Test that the node lineage closure is materialized, read back with the same
+    upstreams and downstreams as the recursive queries, and goes stale when nodes
+    get new revisions.
+    """
+    nodes = {}
+    for name, node_type, parents in [
+        ("A", NodeType.SOURCE, []),
+        ("B", NodeType.TRANSFORM, ["A"]),
+        ("C", NodeType.TRANSFORM, ["A", "B"]),
+        ("D", NodeType.METRIC, ["C"]),
+    ]:
+        node = Node(
+            name=name,
+            type=node_type,
+            current_version="1",
+            created_by_id=current_user.id,
+        )
+        node.current = NodeRevision(
+            node=node,
+            name=name,
+            type=node_type,
+            version="1",
+            parents=[nodes[parent] for parent in parents],
+            created_by_id=current_user.id,
+        )
+        nodes[name] = node
+    session.add_all(nodes.values())
+    await session.commit()
+
+    assert await get_descendant_ids(session, [nodes["B"].id]) == {
+        nodes["C"].id,
+        nodes["D"].id,
+    }
+    with patch(
+        "datajunction_server.sql.dag.refresh_node_lineage",
+        new_callable=AsyncMock,
+    ) as refresh:
+        assert await get_materialized_downstream_nodes(session, nodes["A"]) is None
+        await wait_for_background_refreshes()
+        refresh.assert_awaited_once()
+        expected_downstreams = await get_downstream_nodes(session, "A")
+
+    await refresh_node_lineage(session, [nodes["A"].id])
+    await session.commit()
+
+    # Downstreams are ordered by the length of the longest path to them
+    downstreams = await get_materialized_downstream_nodes(session, nodes["A"])
+    assert [node.name for node in downstreams] == ["B", "C", "D"]  # type: ignore
+    assert downstreams == expected_downstreams
+    downstreams = await get_materialized_downstream_nodes(
+        session,
+        nodes["A"],
+        depth=2,
+    )
+    assert [node.name for node in downstreams] == ["B", "C"]  # type: ignore
+    upstreams = await get_materialized_upstream_nodes(session, nodes["D"])
+    assert {node.name for node in upstreams} == {"A", "B", "C"}  # type: ignore
+    assert {node.name for node in await get_upstream_nodes(session, "D")} == {
+        "A",
+        "B",
+        "C",
+    }
+
+    # A new revision of a node makes the rows that it's part of stale until its
+    # versions are synced
+    nodes["B"].current_version = "2"
+    session.add(
+        NodeRevision(
+            node=nodes["B"],
+            name="B",
+            type=NodeType.TRANSFORM,
+            version="2",
+            parents=[nodes["A"]],
+            created_by_id=current_user.id,
+        ),
+    )
+    await session.commit()
+    with patch(
+        "datajunction_server.sql.dag.refresh_node_lineage",
+        new_callable=AsyncMock,
+    ) as refresh:
+        assert await get_materialized_upstream_nodes(session, nodes["D"]) is None
+        await wait_for_background_refreshes()
+        refresh.assert_awaited_once()
+    await sync_node_lineage_versions(session, [nodes["B"].id])
+    await session.commit()
+    upstreams = await get_materialized_upstream_nodes(session, nodes["D"])
+    assert {node.name for node in upstreams} == {"A", "B", "C"}  # type: ignore
+
+    # A child whose lineage was never computed makes the downstreams of its ancestors
+    # stale
+    child = Node(
+        name="E",
+        type=NodeType.METRIC,
+        current_version="1",
+        created_by_id=current_user.id,
+    )
+    child.current = NodeRevision(
+        node=child,
+        name="E",
+        type=NodeType.METRIC,
+        version="1",
+        parents=[nodes["D"]],
+        created_by_id=current_user.id,
+    )
+    session.add(child)
+    await session.commit()
+    with patch(
+        "datajunction_server.sql.dag.refresh_node_lineage",
+        new_callable=AsyncMock,
+    ) as refresh:
+        assert await get_materialized_downstream_nodes(session, nodes["A"]) is None
+        await wait_for_background_refreshes()
+        refresh.assert_awaited_once()
+    await refresh_node_lineage(session, [child.id])
+    await session.commit()
+    downstreams = await get_materialized_downstream_nodes(session, nodes["A"])
+    assert [node.name for node in downstreams] == ["B", "C", "D", "E"]  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_refresh_in_background() -> None:
+    """
+    Test that refreshes run in the background, once at a time per node.
+    """
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def wait_for_release():
+        started.set()
+        await release.wait()
+
+    refresh = AsyncMock(side_effect=wait_for_release)
+
+    _refresh_in_background("node_lineage", 1, refresh)
+    _refresh_in_background("node_lineage", 1, refresh)
+    await started.wait()
+    assert refresh.await_count == 1
+    assert ("node_lineage", 1) in _background_refreshes
+
+    release.set()
+    await wait_for_background_refreshes()
+    await asyncio.sleep(0)
+    assert ("node_lineage", 1) not in _background_refreshes
+    _refresh_in_background("node_lineage", 1, refresh)
+    await wait_for_background_refreshes()
+    assert refresh.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_bfs_fetch_children_in_chunks() -> None:
+    """
+    Test that the children of a large BFS level are fetched in chunks, one query per
+    chunk, and merged without duplicates.
+    """
+    children_by_chunk = {(1, 2): [10, 11], (3, 4): [11, 12], (5,): [13]}
+    statements = []
+
+    async def execute(statement):
+        statements.append(statement)
+        chunk = tuple(statement.compile().params["parent_id_1"])
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = children_by_chunk[chunk]
+        return result
+
+    async def gather(session, funcs, concurrency):
+        assert concurrency == 2
+        return [await func(session) for func in funcs]
+
+    session = MagicMock()
+    session.execute = execute
+    chunked_settings = MagicMock()
+    chunked_settings.bfs_chunk_size = 2
+    chunked_settings.max_concurrency = 2
+    chunked_settings.reader_db.pool_size = 20
+    with (
+        patch("datajunction_server.sql.dag.settings", chunked_settings),
+        patch("datajunction_server.sql.dag.gather_in_sessions", gather),
+    ):
+        children = await _bfs_fetch_children(session, [1, 2, 3, 4, 5])
+    assert children == [10, 11, 12, 13]
+    assert len(statements) == 3
+
+
 @pytest.mark.asyncio
 async def test_topological_sort(session: AsyncSession) -> None:
     """
@@ -354,6 +668,10 @@ class TestGetDimensionDagIndegree:
         assert result == expected
 
     @pytest.mark.asyncio
+    @patch(
+        "datajunction_server.sql.dag.get_materialized_downstream_nodes",
+        AsyncMock(return_value=None),
+    )
     async def test_node_downstreams_with_fanout(
         self,
         module__session: AsyncSession,
@@ -383,6 +701,7 @@ class TestGetDimensionDagIndegree:
         min_fanout_settings.fanout_threshold = 1
         min_fanout_settings.reader_db.pool_size = 20
         min_fanout_settings.max_concurrency = 5
+        min_fanout_settings.bfs_chunk_size = 1000
         min_fanout_settings.node_list_max = 10000
         with patch("datajunction_server.sql.dag.settings", min_fanout_settings):
             downstreams = await get_downstream_nodes(
@@ -408,6 +727,7 @@ class TestGetDimensionDagIndegree:
         max_fanout_settings.fanout_threshold = 100
         max_fanout_settings.reader_db.pool_size = 20
         max_fanout_settings.max_concurrency = 5
+        max_fanout_settings.bfs_chunk_size = 1000
         max_fanout_settings.node_list_max = 10000
         with patch("datajunction_server.sql.dag.settings", max_fanout_settings):
             downstreams = await get_downstream_nodes(
@@ -421,6 +741,7 @@ class TestGetDimensionDagIndegree:
         max_node_list_settings.fanout_threshold = 1
         max_node_list_settings.reader_db.pool_size = 20
         max_node_list_settings.max_concurrency = 5
+        max_node_list_settings.bfs_chunk_size = 1000
         max_node_list_settings.node_list_max = 5
         with patch("datajunction_server.sql.dag.settings", max_node_list_settings):
             downstreams = await get_downstream_nodes(
@@ -201,3 +201,117 @@ def test_antlr4_arithmetic_unary_op():
         expr=ast.Column(name=ast.Name(name="a")),
     )
     assert "~a" in str(query_ast)
+
+
+def test_cached_parse_returns_mutable_clones():
+    """
+    Test that cached_parse shares a frozen snapshot and hands out clones
+    """
+    from datajunction_server.sql.parsing.backends.antlr4 import (
+        ParseCache,
+        cached_parse,
+        parse_cache,
+    )
+
+    query = "SELECT a, b + 1 AS c FROM t WHERE a > 1"
+    first = cached_parse(query)
+    second = cached_parse(query)
+    assert first is not second
+    assert str(first) == str(second) == str(parse(query))
+    for node in second.flatten():
+        for child in node.children:
+            assert child.parent is node
+
+    first.select.where = None
+    assert str(cached_parse(query)) == str(parse(query))
+
+    snapshot = parse_cache.get(query)
+    with pytest.raises(DJParseException) as exc_info:
+        snapshot.select.where = None
+    assert "frozen" in str(exc_info.value)
+
+    cache = ParseCache(maxsize=1)
+    cache.put("SELECT 1", parse("SELECT 1"))
+    assert cache.get("SELECT 1") is not None
+    cache.put("SELECT 2", parse("SELECT 2"))
+    assert cache.get("SELECT 1") is None
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 1, 1, 1)
+
+
+def test_clone_parents_and_containers():
+    """
+    Test that clones point every node at its cloned parent, even when it is
+    reached through a reference first, and don't share containers with the
+    snapshot
+    """
+    query = parse("SELECT t.a FROM t")
+    column = query.select.projection[0]
+    table = query.select.from_.relations[0].primary
+    column._table = table
+    query.__dict__["_metadata"] = {"tables": [table]}
+    query.freeze()
+
+    clone = query.clone()
+    cloned_table = clone.select.from_.relations[0].primary
+    assert clone.parent is None
+    assert clone.select.projection[0]._table is cloned_table
+    assert cloned_table.parent is clone.select.from_.relations[0]
+    for node in clone.flatten():
+        for child in node.children:
+            assert child.parent is node
+
+    assert clone.__dict__["_metadata"] == {"tables": [cloned_table]}
+    clone.__dict__["_metadata"]["tables"].clear()
+    assert query.__dict__["_metadata"] == {"tables": [table]}
+
+
+def test_parse_result_cache(tmp_path, mocker):
+    """
+    Test that parse results are shared through the content-addressed cache
+    and invalidated when the parser version changes
+    """
+    from cachelib.file import FileSystemCache
+
+    from datajunction_server.config import Settings
+    from datajunction_server.sql.parsing.backends import antlr4, cache
+
+    query = "SELECT a, SUM(b) AS total FROM t GROUP BY a"
+    shared = FileSystemCache(str(tmp_path), default_timeout=0)
+    mocker.patch.object(antlr4, "parse_result_cache", cache.ParseResultCache(shared))
+    expected = str(parse(query))
+
+    # A different worker with the same backend reuses the cached parse result
+    visit = mocker.patch.object(antlr4, "visit", side_effect=antlr4.visit)
+    other_worker = cache.ParseResultCache(FileSystemCache(str(tmp_path)))
+    mocker.patch.object(antlr4, "parse_result_cache", other_worker)
+    first, second = parse(query), parse(query)
+    assert str(first) == str(second) == expected
+    assert first is not second
+    visit.assert_not_called()
+
+    # Changing the parser version invalidates the cached entries
+    cache.parser_version.cache_clear()
+    mocker.patch.object(cache, "serializedATN", return_value="changed")
+    assert str(parse(query)) == expected
+    visit.assert_called()
+    cache.parser_version.cache_clear()
+
+    # Shared backends expire entries, so those of old parser versions are dropped
+    settings = Settings(parse_result_cache_uri=f"file://{tmp_path}")
+    backend = settings.parse_result_cache
+    assert backend.default_timeout == settings.parse_result_cache_timeout > 0
+
+
+def test_antlr4_parenthesized_expressions():
+    """
+    Test that parenthesization is detected from the expressions' tokens
+    """
+    query = parse("SELECT (a + b) * c, a + (b), ((c)) AS d FROM t WHERE (a > 1)")
+    first, second, third = query.select.projection
+    assert first.left.parenthesized
+    assert not first.parenthesized
+    assert not second.parenthesized and second.right.parenthesized
+    assert third.parenthesized and str(third.alias) == "d"
+    assert query.select.where.parenthesized
+    assert str(parse(str(query))) == str(query)
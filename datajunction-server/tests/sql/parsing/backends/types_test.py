@@ -2,6 +2,9 @@
 Tests for types
 """
 
+import pytest
+from pydantic import ValidationError
+
 import datajunction_server.sql.parsing.types as ct
 from datajunction_server.sql.parsing import ast
 
@@ -36,3 +39,43 @@ def test_varchar_in_ast():
         expression=ast.Column(ast.Name("abc")),
     )
     assert str(cast_expr) == "CAST(abc AS VARCHAR(10))"
+
+
+def test_parse_column_type_fast_path():
+    """
+    Test that the hand-written type parser agrees with the ANTLR grammar and
+    that parsed types are interned and immutable.
+    """
+    from datajunction_server.sql.parsing.backends.antlr4 import parse_rule
+
+    for type_string in [
+        "int",
+        "BIGINT",
+        "long",
+        "decimal(10, 2)",
+        "varchar(10)",
+        "fixed(8)",
+        "array<int>",
+        "map<string, array<bigint>>",
+        "struct<a int,b: map<string,double>>",
+        "struct<>",
+    ]:
+        assert ct._TypeStringParser.parse(type_string) is not None
+        assert repr(ct.parse_column_type(type_string)) == repr(
+            parse_rule(type_string, "dataType"),
+        )
+
+    # Exotic type strings fall back to the ANTLR grammar
+    for type_string in [
+        "INTERVAL DAY TO SECOND",
+        "struct<`a b` int>",
+        "struct<a int NOT NULL>",
+    ]:
+        assert ct._TypeStringParser.parse(type_string) is None
+        assert repr(ct.parse_column_type(type_string)) == repr(
+            parse_rule(type_string, "dataType"),
+        )
+
+    assert ct.parse_column_type("array<int>") is ct.parse_column_type("array<int>")
+    with pytest.raises(ValidationError):
+        ct.parse_column_type("array<int>").element = ct.StringType()  # type: ignore
@@ -8,7 +8,10 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from datajunction_server.database.column import Column
+from datajunction_server.database.node import Node, NodeRevision
 from datajunction_server.errors import DJException
+from datajunction_server.models.node_type import NodeType
 from datajunction_server.sql.parsing import ast, types
 from datajunction_server.sql.parsing.backends.antlr4 import parse
 from tests.sql.utils import compare_query_strings
@@ -1279,3 +1282,120 @@ async def test_ast_hints():
     assert cast(ast.Hint, query.select.hints[0]).name.name == "REBALANCE"
     assert [str(col) for col in query.select.hints[0].parameters] == ["3", "c"]
     assert "/*+ REBALANCE(3, c) */" in str(query)
+
+
+def test_ast_find_all_index():
+    """
+    Test that repeated find_all calls reuse the typed node index and that the
+    index is invalidated when the AST changes
+    """
+    query = parse("SELECT a, b + c AS d FROM t WHERE e > 1")
+    expected = ["a", "b", "c", "e"]
+    assert [col.name.name for col in query.find_all(ast.Column)] == expected
+    assert query.__dict__.get("_node_index") is not None
+    assert [col.name.name for col in query.find_all(ast.Column)] == expected
+    assert [str(node) for node in query.find_all(ast.BinaryOp)] == ["b + c", "e > 1"]
+
+    # Setting an attribute invalidates the index
+    query.select.where = ast.Column(ast.Name("f"))
+    assert [col.name.name for col in query.find_all(ast.Column)] == [
+        "a",
+        "b",
+        "c",
+        "f",
+    ]
+
+    # So does changing a container in place
+    query.select.projection.append(query.select.where)
+    assert [col.name.name for col in query.find_all(ast.Column)] == [
+        "a",
+        "b",
+        "c",
+        "f",
+        "f",
+    ]
+
+    # Changes made while iterating are picked up
+    seen = []
+    for col in query.find_all(ast.Column):
+        seen.append(col.name.name)
+        if col.name.name == "a":
+            query.select.projection[1].child.right = ast.Column(ast.Name("g"))
+    assert seen == ["a", "b", "g", "f", "f"]
+
+    # Changes to other ASTs don't invalidate the index
+    assert len(list(query.find_all(ast.Column))) == 5
+    index = query.__dict__["_node_index"]
+    other = parse("SELECT h FROM u")
+    other.select.where = ast.Column(ast.Name("z"))
+    assert len(list(query.find_all(ast.Column))) == 5
+    assert query.__dict__["_node_index"] is index
+
+    # Changes to a node whose parent is in another AST are still picked up
+    query.select.projection.append(other.select.projection[0])
+    assert len(list(query.find_all(ast.Column))) == 6
+    other.select.projection[0].name = ast.Name("i")
+    names = [col.name.name for col in query.find_all(ast.Column)]
+    assert "i" in names and "h" not in names
+
+    # The index is not carried over into copies
+    assert "_node_index" not in query.copy().__dict__
+    assert query.select.where.depth == 2
+    assert query.select.where.get_nearest_parent_of_type(ast.Query) is query
+
+
+def preloaded_context(tables: dict[str, list[str]]) -> ast.CompileContext:
+    """
+    A compile context with transient integer-column nodes for the given tables
+    preloaded, so that queries on them compile without a database
+    """
+    nodes = {}
+    for name, columns in tables.items():
+        node = Node(name=name, type=NodeType.SOURCE, current_version="v1")
+        node.current = NodeRevision(
+            name=name,
+            type=NodeType.SOURCE,
+            version="v1",
+            node=node,
+            columns=[
+                Column(name=col, type=types.IntegerType(), order=idx)
+                for idx, col in enumerate(columns)
+            ],
+        )
+        nodes[name] = node
+    return ast.CompileContext(
+        session=None,  # type: ignore
+        exception=DJException(),
+        dependencies_cache=nodes,
+        preloaded=set(nodes),
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_compile_column_symbol_table():
+    """
+    Test resolving columns against preloaded table sources through the query's
+    column symbol table
+    """
+    ctx = preloaded_context(
+        {"orders": ["id", "customer_id", "amount"], "customers": ["id", "name"]},
+    )
+    query = parse(
+        "SELECT o.id, amount, c.name, id FROM orders o "
+        "JOIN customers c ON o.customer_id = c.id",
+    )
+    await query.compile(ctx)
+    orders, customers = query.select.from_.find_all(ast.Table)  # type: ignore
+    symbols = ast.ColumnSymbolTable([orders, customers])
+    assert symbols.candidates(ast.Column(ast.Name("id"))) == [orders, customers]
+    assert symbols.candidates(ast.Column(ast.Name("name"))) == [customers]
+    assert symbols.candidates(ast.Column(ast.Name("id", namespace=ast.Name("c")))) == [
+        customers,
+    ]
+    assert symbols.candidates(ast.Column(ast.Name("missing"))) == []
+
+    projection = cast(list[ast.Column], query.select.projection)
+    assert [col.table for col in projection[:3]] == [orders, orders, customers]
+    assert [str(error.message) for error in ctx.exception.errors] == [
+        "Column `id` found in multiple tables. Consider using fully qualified name.",
+    ]
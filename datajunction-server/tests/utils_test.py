@@ -2,7 +2,10 @@
 Tests for ``datajunction_server.utils``.
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from functools import partial
 from unittest.mock import AsyncMock, MagicMock, patch
 import json
 import pytest
@@ -12,9 +15,14 @@ from starlette.types import Scope
 
 import pytest
 from pytest_mock import MockerFixture
-from sqlalchemy import select
+from sqlalchemy import create_engine, select
 from sqlalchemy.exc import OperationalError
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 from starlette.background import BackgroundTasks
 from testcontainers.postgres import PostgresContainer
 from yarl import URL
@@ -30,6 +38,8 @@ from datajunction_server.utils import (
     DatabaseSessionManager,
     Version,
     execute_with_retry,
+    gather_in_sessions,
+    has_uncommitted_changes,
     get_and_update_current_user,
     get_issue_url,
     get_query_service_client,
@@ -269,6 +279,88 @@ async def test_execute_with_retry_success_after_flaky_connection():
     assert session.execute.call_count == 3
 
 
+@pytest.mark.asyncio
+async def test_gather_in_sessions(mocker):
+    """
+    Test running functions concurrently in their own reader sessions, with bounded
+    concurrency and the results in order.
+    """
+    session = AsyncSession(
+        bind=create_async_engine("postgresql+psycopg://dj@localhost/dj")
+    )
+    reader_engine = create_async_engine("postgresql+psycopg://readonly@localhost/dj")
+
+    @asynccontextmanager
+    async def reader_session_context():
+        async with AsyncSession(bind=reader_engine) as reader_session:
+            yield reader_session
+
+    mocker.patch(
+        "datajunction_server.utils.reader_session_context",
+        reader_session_context,
+    )
+    running, max_running, sessions = 0, 0, []
+
+    async def build(idx: int, task_session: AsyncSession) -> int:
+        nonlocal running, max_running
+        sessions.append(task_session)
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (5 - idx))
+        running -= 1
+        return idx
+
+    funcs = [partial(build, idx) for idx in range(5)]
+    assert await gather_in_sessions(session, funcs, concurrency=2) == list(range(5))
+    assert max_running == 2
+    assert len(set(sessions)) == 5 and session not in sessions
+    assert all(task_session.bind is reader_engine for task_session in sessions)
+
+    sessions.clear()
+    assert await gather_in_sessions(session, funcs[:1], concurrency=2) == [0]
+    assert sessions == [session]
+
+    # With uncommitted changes, all the functions run one at a time with the caller's
+    # session so that they see the changes
+    sessions.clear()
+    session.add(User(username="pending", oauth_provider=OAuthProvider.BASIC))
+    assert await gather_in_sessions(session, funcs, concurrency=2) == list(range(5))
+    assert sessions == [session] * 5
+
+
+def test_has_uncommitted_changes():
+    """
+    Test that flushed changes count as uncommitted until the transaction ends.
+    """
+
+    class Base(DeclarativeBase):
+        pass
+
+    class Item(Base):
+        __tablename__ = "item"
+        id: Mapped[int] = mapped_column(primary_key=True)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        assert not has_uncommitted_changes(session)  # type: ignore
+        session.add(Item(id=1))
+        assert has_uncommitted_changes(session)  # type: ignore
+        session.flush()
+        assert not session.new
+        assert has_uncommitted_changes(session)  # type: ignore
+        with session.begin_nested():
+            session.add(Item(id=2))
+        assert has_uncommitted_changes(session)  # type: ignore
+        session.commit()
+        assert not has_uncommitted_changes(session)  # type: ignore
+
+        session.add(Item(id=3))
+        session.flush()
+        session.rollback()
+        assert not has_uncommitted_changes(session)  # type: ignore
+
+
 @pytest.mark.asyncio
 async def test_execute_with_retry_exhausts_retries():
     """